@@ -0,0 +1,65 @@
+"""
+JSON codec throughput: decode search pages and encode output.
+
+    python benchmarks/bench_codec.py --pages 500
+
+Runs every installed backend (orjson, msgspec, stdlib json) on the same
+synthetic discovery pages and reports MB/s and pages or guilds per second.
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+
+for path in (SRC, Path(__file__).resolve().parent):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from bench_normalizer import synthetic_guild  # noqa: E402
+from processors.normalizer import normalize_guild  # noqa: E402
+from utils.codec import available_codecs, get_codec  # noqa: E402
+
+def best_of(rounds: int, func: Callable[[], Any]) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="JSON codec throughput.")
+    parser.add_argument("--pages", type=int, default=500, help="Synthetic pages of 100 guilds.")
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    pages: List[Dict[str, Any]] = [
+        {"guilds": [synthetic_guild(rng, p * 100 + i) for i in range(100)]} for p in range(args.pages)
+    ]
+    std = get_codec("json")
+    bodies = [std.dumps(page) for page in pages]
+    body_bytes = sum(len(b) for b in bodies)
+    sanitized = [normalize_guild(g).to_dict() for page in pages for g in page["guilds"]]
+
+    print(f"{'codec':<10} {'decode MB/s':>12} {'pages/s':>10} {'encode MB/s':>12} {'guilds/s':>12} {'indent=2 MB/s':>14}")
+    for name, codec in available_codecs().items():
+        decode = best_of(args.rounds, lambda: [codec.loads(b) for b in bodies])
+        encoded = codec.dumps(sanitized)
+        encode = best_of(args.rounds, lambda: codec.dumps(sanitized))
+        pretty = codec.dumps(sanitized, indent=2)
+        encode_pretty = best_of(args.rounds, lambda: codec.dumps(sanitized, indent=2))
+        print(
+            f"{name:<10} {body_bytes / decode / 2**20:12.1f} {len(bodies) / decode:10,.0f} "
+            f"{len(encoded) / encode / 2**20:12.1f} {len(sanitized) / encode:12,.0f} "
+            f"{len(pretty) / encode_pretty / 2**20:14.1f}"
+        )
+    print(f"indent=2 output is {len(pretty) / len(encoded):.2f}x the size of compact output")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Query benchmark: JSON array + Python loops vs. a columnar snapshot.
+
+    python benchmarks/bench_columnar.py --count 1000000
+"""
+import argparse
+import logging
+import random
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+from bench_normalizer import synthetic_guild  # noqa: E402
+from processors.normalizer import normalize_guild  # noqa: E402
+from storage.columnar import ColumnarSnapshot, write_snapshot  # noqa: E402
+from utils.codec import CODEC  # noqa: E402
+
+def timed(label: str, fn: Callable[[], Any]) -> Any:
+    start = time.perf_counter()
+    result = fn()
+    print(f"  {label:<28} {(time.perf_counter() - start) * 1000:10.1f} ms")
+    return result
+
+def json_queries(path: Path) -> None:
+    guilds: List[Dict[str, Any]] = timed("load JSON", lambda: CODEC.loads(path.read_bytes()))
+
+    def ratio(g: Dict[str, Any]) -> float:
+        members = g.get("approximate_member_count") or 0
+        return (g.get("approximate_presence_count") or 0) / members if members else -1.0
+
+    def filtered() -> List[Dict[str, Any]]:
+        return [
+            g for g in guilds
+            if (g.get("approximate_member_count") or 0) >= 10_000 and g.get("preferred_locale") == "en-US"
+        ]
+
+    def by_category() -> Dict[Any, List[int]]:
+        groups: Dict[Any, List[int]] = defaultdict(lambda: [0, 0])
+        for g in guilds:
+            if g.get("primary_category_id") is not None:
+                group = groups[g["primary_category_id"]]
+                group[0] += 1
+                group[1] += g.get("approximate_member_count") or 0
+        return groups
+
+    timed("filter members+locale", filtered)
+    timed("top 100 by presence ratio", lambda: sorted(guilds, key=ratio, reverse=True)[:100])
+    timed("group by category", by_category)
+
+def columnar_queries(path: Path) -> None:
+    snapshot: ColumnarSnapshot = timed("open snapshot", lambda: ColumnarSnapshot(path))
+    mask = timed(
+        "filter members+locale",
+        lambda: snapshot.where(approximate_member_count=(10_000, None), preferred_locale="en-US"),
+    )
+    timed("top 100 by presence ratio", lambda: snapshot.top_k("presence_ratio", k=100))
+    timed("top 100 within filter", lambda: snapshot.top_k("approximate_member_count", k=100, mask=mask))
+    timed("group by category", snapshot.group_by_category)
+    # Second run: the ratio column and mapped pages are now warm.
+    timed("top 100 by ratio (warm)", lambda: snapshot.top_k("presence_ratio", k=100))
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--count", type=int, default=200_000)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    rng = random.Random(42)
+    guilds = [normalize_guild(synthetic_guild(rng, i)).to_dict() for i in range(args.count)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = Path(tmp) / "sample.json"
+        json_path.write_bytes(CODEC.dumps(guilds))
+        snapshot_path = Path(tmp) / "columnar"
+        start = time.perf_counter()
+        write_snapshot(snapshot_path, guilds)
+        print(f"wrote snapshot of {args.count} guilds in {time.perf_counter() - start:.1f}s")
+        del guilds
+
+        print(f"JSON array ({json_path.stat().st_size / 2**20:.0f} MiB)")
+        json_queries(json_path)
+        print("columnar snapshot")
+        columnar_queries(snapshot_path)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Micro-benchmark: caller-side cost of hot-path DEBUG logging per mode.
+
+    python benchmarks/bench_logging.py --count 200000
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from utils import logger as log_config  # noqa: E402
+
+MODES: Dict[str, Dict[str, Any]] = {
+    "sync text": {},
+    "sync json": {"fmt": "json"},
+    "async text": {"use_async": True},
+    "async json": {"use_async": True, "fmt": "json"},
+    "async json 1/100": {"use_async": True, "fmt": "json", "sample_debug": 100},
+    "async rate 1000/s": {"use_async": True, "rate_limit": 1000},
+}
+
+def bench(label: str, options: Dict[str, Any], count: int) -> None:
+    log_config.configure_logging(level="DEBUG", **options)
+    log = logging.getLogger("bench")
+    params = {"query": "gaming", "limit": 100, "offset": 300}
+    start = time.perf_counter()
+    for i in range(count):
+        log.debug("Parsed guild with id=%s params=%s", i, params)
+    caller = time.perf_counter() - start
+    log_config._stop_listener()
+    total = time.perf_counter() - start
+    print(f"{label:<20} {caller / count * 1e6:7.2f} us/call on caller  {total:7.2f} s incl. drain")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--count", type=int, default=200_000)
+    args = parser.parse_args()
+
+    sys.stderr = open(os.devnull, "w")
+    try:
+        for label, options in MODES.items():
+            bench(label, options, args.count)
+    finally:
+        sys.stderr.close()
+        sys.stderr = sys.__stderr__
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Memory benchmark: dict-of-dicts vs. CompactGuildStore.
+
+    python benchmarks/bench_memory.py --count 100000
+"""
+import argparse
+import gc
+import logging
+import random
+import sys
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+from bench_normalizer import synthetic_guild  # noqa: E402
+from processors.normalizer import normalize_guild  # noqa: E402
+from storage.guild_store import CompactGuildStore  # noqa: E402
+from utils.codec import CODEC  # noqa: E402
+
+def decoded_pages(count: int, page_size: int = 100) -> Iterable[List[Dict[str, Any]]]:
+    """
+    Yield sanitized pages that went through the JSON decoder, so every
+    string is a fresh object just like in a real scrape.
+    """
+    rng = random.Random(42)
+    for start in range(0, count, page_size):
+        raw = [synthetic_guild(rng, i) for i in range(start, min(start + page_size, count))]
+        page = CODEC.loads(CODEC.dumps(raw))
+        yield [normalize_guild(g).to_dict() for g in page]
+
+def measure(label: str, factory: Callable[[], Any], count: int) -> Tuple[int, Any]:
+    gc.collect()
+    tracemalloc.start()
+    store = factory()
+    for page in decoded_pages(count):
+        for guild in page:
+            store[guild["id"]] = guild
+        del page
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<20} {current / 2**20:9.1f} MiB retained  {peak / 2**20:9.1f} MiB peak  "
+          f"{current / count:8.0f} B/guild")
+    return current, store
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--count", type=int, default=100_000)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+
+    baseline, plain = measure("dict of dicts", dict, args.count)
+    del plain
+    compact, store = measure("CompactGuildStore", CompactGuildStore, args.count)
+
+    sample = next(iter(store))
+    assert store[sample]["id"] == sample
+    print(f"reduction: {baseline / compact:.2f}x")
+
+if __name__ == "__main__":
+    main()
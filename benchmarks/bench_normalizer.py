@@ -0,0 +1,85 @@
+"""
+Micro-benchmark: fused normalizer vs. parse_guild + sanitize_guild.
+
+    python benchmarks/bench_normalizer.py --count 200000
+"""
+import argparse
+import logging
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from processors.normalizer import normalize_guild  # noqa: E402
+from processors.parser import parse_guild  # noqa: E402
+from processors.sanitizer import sanitize_guild  # noqa: E402
+
+FEATURES = ["COMMUNITY", "DISCOVERABLE", "PREVIEW_ENABLED", "VERIFIED", "WELCOME_SCREEN_ENABLED"]
+LOCALES = ["en-US", "de", "fr", "ja", "pt-BR"]
+
+def synthetic_guild(rng: random.Random, i: int) -> Dict[str, Any]:
+    category_id = rng.randint(1, 45)
+    category = {"id": category_id, "is_primary": True, "name": f"Category {category_id}", "name_localizations": {}}
+    return {
+        "id": str(10**17 + i),
+        "name": f"Guild {i}",
+        "description": "A synthetic guild used for benchmarking. " * 2,
+        "icon": "39128f6c9fc33f4c95a27d4c601ad7db",
+        "splash": None,
+        "banner": "63249e6867f276efc07d32793b7b3b5a",
+        "approximate_presence_count": rng.randint(0, 10**6),
+        "approximate_member_count": rng.randint(0, 10**7),
+        "premium_subscription_count": rng.randint(0, 500),
+        "preferred_locale": rng.choice(LOCALES),
+        "auto_removed": False,
+        "discovery_splash": None,
+        "primary_category_id": category_id,
+        "vanity_url_code": f"guild{i}",
+        "is_published": True,
+        "keywords": ["ai", "art", "community"],
+        "features": rng.sample(FEATURES, 3),
+        "categories": [category],
+        "primary_category": category,
+        "objectID": str(10**17 + i),
+        "_highlightResult": {},
+    }
+
+def bench(label: str, func: Callable[[Dict[str, Any]], Any], payloads: List[Dict[str, Any]], rounds: int) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for raw in payloads:
+            func(raw)
+        best = min(best, time.perf_counter() - start)
+    rate = len(payloads) / best
+    print(f"{label:<28} {best * 1000:9.1f} ms  {rate:12,.0f} records/sec")
+    return rate
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--count", type=int, default=200_000)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    # Measure the processing cost, not log formatting.
+    logging.disable(logging.INFO)
+
+    rng = random.Random(42)
+    payloads = [synthetic_guild(rng, i) for i in range(args.count)]
+
+    baseline = bench("parse + sanitize", lambda raw: sanitize_guild(parse_guild(raw)), payloads, args.rounds)
+    fused = bench("normalize_guild", normalize_guild, payloads, args.rounds)
+    fused_dict = bench("normalize_guild + to_dict", lambda raw: normalize_guild(raw).to_dict(), payloads, args.rounds)
+
+    print(f"speedup (record): {fused / baseline:.2f}x")
+    print(f"speedup (dict):   {fused_dict / baseline:.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Replay benchmark: rebuild output from a synthetic raw page archive.
+
+    python benchmarks/bench_replay.py --pages 5000 --processes 1 4
+"""
+import argparse
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+import main  # noqa: E402
+from bench_normalizer import synthetic_guild  # noqa: E402
+from storage.archive import PageArchive  # noqa: E402
+
+def build_archive(directory: Path, pages: int, page_size: int, chunk_pages: int) -> None:
+    rng = random.Random(42)
+    archive = PageArchive(directory, chunk_pages=chunk_pages)
+    for page in range(pages):
+        # Overlapping ids, as different keywords return some of the same guilds.
+        start = rng.randrange(pages * page_size // 2)
+        archive.write(f"kw{page // 3}", None, (page % 3) * page_size, [
+            synthetic_guild(rng, start + i) for i in range(page_size)
+        ])
+    archive.close()
+
+def main_() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pages", type=int, default=5000)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--chunk-pages", type=int, default=500)
+    parser.add_argument("--processes", type=int, nargs="+", default=[1, os.cpu_count() or 1])
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        start = time.perf_counter()
+        build_archive(root / "archive", args.pages, args.page_size, args.chunk_pages)
+        size = sum(p.stat().st_size for p in (root / "archive").iterdir())
+        print(f"archived {args.pages} pages ({size / 2**20:.1f} MiB gzip) in {time.perf_counter() - start:.1f}s")
+
+        settings = {
+            "output_format": "ndjson",
+            "ndjson": {"path": "replayed.ndjson"},
+            "archive": {"dir": "archive"},
+        }
+        for processes in args.processes:
+            start = time.perf_counter()
+            main.run_replay([], settings, root, processes=processes)
+            elapsed = time.perf_counter() - start
+            print(f"replay with {processes:>2} processes: {elapsed:6.2f}s "
+                  f"({args.pages * args.page_size / elapsed:,.0f} guilds/s)")
+
+if __name__ == "__main__":
+    main_()
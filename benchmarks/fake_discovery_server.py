@@ -0,0 +1,262 @@
+"""
+Local stand-in for Discord's discovery search endpoint.
+
+Serves ``GET /api/v9/discovery/search`` with synthetic guild payloads,
+configurable latency, injected 5xx errors and a real fixed-window rate
+limit that answers with Discord-style ``X-RateLimit-*`` headers and 429s.
+
+    python benchmarks/fake_discovery_server.py --port 8080 --latency lognormal:40,0.5
+"""
+import argparse
+import hashlib
+import json
+import math
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import parse_qs, urlsplit
+
+SEARCH_PATH = "/api/v9/discovery/search"
+FEATURES = ["COMMUNITY", "DISCOVERABLE", "PREVIEW_ENABLED", "VERIFIED", "WELCOME_SCREEN_ENABLED"]
+LOCALES = ["en-US", "de", "fr", "ja", "pt-BR", "es-ES"]
+
+def parse_latency(spec: str) -> Callable[[random.Random], float]:
+    """
+    Build a latency sampler (seconds) from ``fixed:MS``, ``uniform:LO,HI``
+    or ``lognormal:MEDIAN_MS,SIGMA``.
+    """
+    kind, _, args = spec.partition(":")
+    values = [float(v) for v in args.split(",") if v]
+    if kind == "fixed":
+        return lambda rng: values[0] / 1000.0
+    if kind == "uniform":
+        return lambda rng: rng.uniform(values[0], values[1]) / 1000.0
+    if kind == "lognormal":
+        mu = math.log(values[0])
+        return lambda rng: rng.lognormvariate(mu, values[1]) / 1000.0
+    raise ValueError(f"Unknown latency spec: {spec}")
+
+def _stable_int(text: str) -> int:
+    return int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "big")
+
+class ServerConfig:
+    def __init__(
+        self,
+        min_results: int = 50,
+        max_results: int = 3000,
+        guild_pool: int = 200_000,
+        latency: str = "fixed:0",
+        error_rate: float = 0.0,
+        throttle_rate: float = 0.0,
+        rate_limit: int = 0,
+        rate_window: float = 1.0,
+        seed: int = 0,
+    ) -> None:
+        self.min_results = min_results
+        self.max_results = max_results
+        self.guild_pool = guild_pool
+        self.latency = parse_latency(latency)
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.rate_limit = rate_limit
+        self.rate_window = rate_window
+        self.seed = seed
+
+class ServerStats:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.counts: Dict[str, int] = {"requests": 0, "pages": 0, "guilds": 0, "errors": 0, "throttled": 0}
+
+    def add(self, **deltas: int) -> None:
+        with self.lock:
+            for key, value in deltas.items():
+                self.counts[key] += value
+
+    def snapshot(self) -> Dict[str, int]:
+        with self.lock:
+            return dict(self.counts)
+
+class FixedWindowLimiter:
+    def __init__(self, limit: int, window: float) -> None:
+        self.limit = limit
+        self.window = window
+        self.lock = threading.Lock()
+        self.window_start = time.monotonic()
+        self.used = 0
+
+    def take(self) -> Dict[str, Any]:
+        with self.lock:
+            now = time.monotonic()
+            if now - self.window_start >= self.window:
+                self.window_start = now
+                self.used = 0
+            reset_after = max(0.0, self.window - (now - self.window_start))
+            allowed = self.used < self.limit
+            if allowed:
+                self.used += 1
+            return {
+                "allowed": allowed,
+                "remaining": max(0, self.limit - self.used),
+                "reset_after": reset_after,
+            }
+
+def synthetic_guild(guild_index: int) -> Dict[str, Any]:
+    rng = random.Random(guild_index)
+    category_id = rng.randint(1, 45)
+    category = {"id": category_id, "is_primary": True, "name": f"Category {category_id}", "name_localizations": {}}
+    gid = str(10**17 + guild_index)
+    return {
+        "id": gid,
+        "name": f"Guild {guild_index}",
+        "description": "Synthetic guild served by the local benchmark server.",
+        "icon": "39128f6c9fc33f4c95a27d4c601ad7db",
+        "splash": None,
+        "banner": None,
+        "approximate_presence_count": rng.randint(0, 10**6),
+        "approximate_member_count": rng.randint(0, 10**7),
+        "premium_subscription_count": rng.randint(0, 500),
+        "preferred_locale": rng.choice(LOCALES),
+        "auto_removed": False,
+        "discovery_splash": None,
+        "primary_category_id": category_id,
+        "vanity_url_code": f"guild{guild_index}",
+        "is_published": True,
+        "keywords": ["benchmark", f"k{guild_index % 97}"],
+        "features": rng.sample(FEATURES, 3),
+        "categories": [category],
+        "primary_category": category,
+        "objectID": gid,
+        "_highlightResult": {},
+    }
+
+def search_results(config: ServerConfig, term: str, category_id: Optional[str], offset: int, limit: int) -> List[Dict[str, Any]]:
+    key = _stable_int(f"{config.seed}:{term}:{category_id}")
+    span = max(0, config.max_results - config.min_results)
+    total = config.min_results + (key % (span + 1))
+    end = min(offset + limit, total)
+    start_index = key % config.guild_pool
+    return [synthetic_guild((start_index + i) % config.guild_pool) for i in range(offset, end)]
+
+def make_handler(config: ServerConfig, stats: ServerStats) -> type:
+    limiter = FixedWindowLimiter(config.rate_limit, config.rate_window) if config.rate_limit else None
+    rng_lock = threading.Lock()
+    rng = random.Random(config.seed)
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+            return
+
+        def _send(self, status: int, body: Dict[str, Any], headers: Optional[Dict[str, str]] = None) -> None:
+            payload = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_GET(self) -> None:  # noqa: N802
+            stats.add(requests=1)
+            url = urlsplit(self.path)
+            if url.path != SEARCH_PATH:
+                self._send(404, {"message": "404: Not Found"})
+                return
+
+            with rng_lock:
+                delay = config.latency(rng)
+                roll_error = rng.random()
+                roll_throttle = rng.random()
+            if delay > 0:
+                time.sleep(delay)
+
+            headers: Dict[str, str] = {}
+            if limiter is not None:
+                state = limiter.take()
+                headers = {
+                    "X-RateLimit-Bucket": "discovery-search",
+                    "X-RateLimit-Limit": str(config.rate_limit),
+                    "X-RateLimit-Remaining": str(state["remaining"]),
+                    "X-RateLimit-Reset-After": f"{state['reset_after']:.3f}",
+                }
+                if not state["allowed"]:
+                    stats.add(throttled=1)
+                    headers["Retry-After"] = f"{state['reset_after']:.3f}"
+                    self._send(429, {"message": "You are being rate limited.", "retry_after": state["reset_after"], "global": False}, headers)
+                    return
+
+            if roll_throttle < config.throttle_rate:
+                stats.add(throttled=1)
+                retry_after = "0.050"
+                self._send(429, {"message": "You are being rate limited.", "retry_after": 0.05, "global": False}, {**headers, "Retry-After": retry_after})
+                return
+            if roll_error < config.error_rate:
+                stats.add(errors=1)
+                self._send(503, {"message": "Service Unavailable"}, headers)
+                return
+
+            query = parse_qs(url.query)
+            term = query.get("term", [""])[0]
+            category_id = query.get("category_id", [None])[0]
+            offset = int(query.get("offset", ["0"])[0])
+            limit = max(1, min(int(query.get("limit", ["100"])[0]), 100))
+
+            guilds = search_results(config, term, category_id, offset, limit)
+            stats.add(pages=1, guilds=len(guilds))
+            self._send(200, {"guilds": guilds, "total": len(guilds)}, headers)
+
+    return Handler
+
+def make_server(config: ServerConfig, host: str = "127.0.0.1", port: int = 0):
+    stats = ServerStats()
+    server = ThreadingHTTPServer((host, port), make_handler(config, stats))
+    server.daemon_threads = True
+    server.stats = stats  # type: ignore[attr-defined]
+    return server
+
+def add_server_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--min-results", type=int, default=50, help="Fewest results a term can have.")
+    parser.add_argument("--max-results", type=int, default=3000, help="Most results a term can have.")
+    parser.add_argument("--guild-pool", type=int, default=200_000, help="Distinct guilds shared by all terms.")
+    parser.add_argument("--latency", default="fixed:0", help="fixed:MS, uniform:LO,HI or lognormal:MEDIAN_MS,SIGMA")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 503.")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Fraction of requests answered with 429.")
+    parser.add_argument("--rate-limit", type=int, default=0, help="Requests allowed per window (0 disables).")
+    parser.add_argument("--rate-window", type=float, default=1.0, help="Rate-limit window in seconds.")
+    parser.add_argument("--seed", type=int, default=0)
+
+def config_from_args(args: argparse.Namespace) -> ServerConfig:
+    return ServerConfig(
+        min_results=args.min_results,
+        max_results=args.max_results,
+        guild_pool=args.guild_pool,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        rate_limit=args.rate_limit,
+        rate_window=args.rate_window,
+        seed=args.seed,
+    )
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local Discord discovery search stand-in.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    add_server_arguments(parser)
+    args = parser.parse_args()
+
+    server = make_server(config_from_args(args), args.host, args.port)
+    print(f"Serving http://{args.host}:{server.server_address[1]}{SEARCH_PATH}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(json.dumps(server.stats.snapshot()))
+
+if __name__ == "__main__":
+    main()
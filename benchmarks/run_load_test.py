@@ -0,0 +1,167 @@
+"""
+Offline load test: drive ``run_scraper`` against the local discovery stand-in.
+
+    python benchmarks/run_load_test.py --keywords 200 --workers 8 --latency lognormal:40,0.5
+
+Reports pages/sec, guilds/sec, client-side request latency percentiles
+(from the built-in metrics registry), retries, bytes and peak RSS.
+``--json`` additionally writes the report to a file so runs can be
+compared to catch regressions.
+
+``--hedge compare`` runs the same workload without and with hedged
+requests and reports the change in p99 per-keyword time:
+
+    python benchmarks/run_load_test.py --keywords 100 --latency lognormal:40,1.0 --hedge compare
+"""
+import argparse
+import json
+import logging
+import multiprocessing
+import resource
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+
+for path in (SRC, Path(__file__).resolve().parent):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+import main as scraper_main  # noqa: E402
+from fake_discovery_server import add_server_arguments, config_from_args, make_server  # noqa: E402
+from utils.metrics import METRICS  # noqa: E402
+
+def _serve(args: argparse.Namespace, conn) -> None:
+    server = make_server(config_from_args(args))
+    conn.send(server.server_address[1])
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    conn.recv()
+    server.shutdown()
+    conn.send(server.stats.snapshot())
+
+def build_settings(args: argparse.Namespace, port: int, hedge: bool = False) -> Dict[str, Any]:
+    return {
+        "base_url": f"http://127.0.0.1:{port}/api/v9/discovery",
+        "max_results_per_keyword": args.max_results_per_keyword,
+        "results_per_page": 100,
+        "output_path": "results.json",
+        "output_format": args.output_format,
+        "ndjson": {"path": "results.ndjson"},
+        "category_id": None,
+        "concurrency": {
+            "workers": args.workers,
+            "prefetch_pages": args.prefetch,
+            "adaptive": {"enabled": args.adaptive},
+        },
+        "rate_limit": {"enabled": True},
+        "hedge": {"enabled": hedge, "max_ratio": args.hedge_ratio, "min_samples": 20},
+        "checkpoint": {"enabled": False},
+        "metrics": {"enabled": False},
+        "cache": {"enabled": False},
+        "request": {"timeout": 10, "retries": 3, "backoff_factor": 0.05},
+    }
+
+def run(args: argparse.Namespace, hedge: bool = False) -> Dict[str, Any]:
+    parent_conn, child_conn = multiprocessing.Pipe()
+    server = multiprocessing.Process(target=_serve, args=(args, child_conn), daemon=True)
+    server.start()
+    port = parent_conn.recv()
+
+    keywords = [f"benchmark keyword {i}" for i in range(args.keywords)]
+    try:
+        METRICS.reset()
+        with tempfile.TemporaryDirectory() as tmp:
+            settings = build_settings(args, port, hedge=hedge)
+            start = time.perf_counter()
+            results = scraper_main.run_scraper(keywords, settings, root_dir=Path(tmp))
+            elapsed = time.perf_counter() - start
+            unique = len(results)
+            if args.output_format == "ndjson":
+                with (Path(tmp) / "results.ndjson").open("rb") as f:
+                    unique = sum(1 for _ in f)
+    finally:
+        parent_conn.send("stop")
+        server_stats = parent_conn.recv()
+        server.join(timeout=5)
+
+    latency = METRICS.histogram("http_get_seconds")
+    keyword_time = METRICS.histogram("keyword_seconds")
+    peak_rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        peak_rss_kb //= 1024
+
+    return {
+        "keywords": args.keywords,
+        "workers": args.workers,
+        "prefetch": args.prefetch,
+        "hedge": hedge,
+        "elapsed_sec": round(elapsed, 3),
+        "pages": server_stats["pages"],
+        "guilds_served": server_stats["guilds"],
+        "unique_guilds": unique,
+        "requests": server_stats["requests"],
+        "errors_injected": server_stats["errors"],
+        "throttled": server_stats["throttled"],
+        "pages_per_sec": round(server_stats["pages"] / elapsed, 1) if elapsed else 0.0,
+        "guilds_per_sec": round(server_stats["guilds"] / elapsed, 1) if elapsed else 0.0,
+        "latency_p50_ms": round(latency.percentile(0.50) * 1000, 2),
+        "latency_p99_ms": round(latency.percentile(0.99) * 1000, 2),
+        "keyword_p50_ms": round(keyword_time.percentile(0.50) * 1000, 2),
+        "keyword_p99_ms": round(keyword_time.percentile(0.99) * 1000, 2),
+        "hedges_sent": int(METRICS.counter("http_hedges_sent_total").value),
+        "hedges_won": int(METRICS.counter("http_hedges_won_total").value),
+        "adaptive_limit": int(METRICS.gauge("adaptive_concurrency_limit").value) if args.adaptive else None,
+        "retries": int(METRICS.counter("http_retries_total").value),
+        "response_mb": round(METRICS.counter("http_response_bytes_total").value / 2**20, 1),
+        "peak_rss_mb": round(peak_rss_kb / 1024, 1),
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Offline scraper load test.")
+    parser.add_argument("--keywords", type=int, default=100, help="Number of synthetic keywords.")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--prefetch", type=int, default=0)
+    parser.add_argument("--max-results-per-keyword", type=int, default=300)
+    parser.add_argument("--output-format", choices=("json", "ndjson"), default="json")
+    parser.add_argument("--json", type=Path, help="Also write the report to this file.")
+    parser.add_argument(
+        "--hedge",
+        choices=("off", "on", "compare"),
+        default="off",
+        help="Hedge slow requests; 'compare' runs the workload both ways.",
+    )
+    parser.add_argument("--hedge-ratio", type=float, default=0.05, help="Most hedges per request.")
+    parser.add_argument(
+        "--adaptive",
+        action="store_true",
+        help="Let the AIMD controller pick the in-flight limit (workers become the ceiling).",
+    )
+    add_server_arguments(parser)
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    if args.hedge == "compare":
+        baseline = run(args, hedge=False)
+        hedged = run(args, hedge=True)
+        report: Dict[str, Any] = {"baseline": baseline, "hedged": hedged}
+        for key in ("latency_p99_ms", "keyword_p99_ms", "elapsed_sec"):
+            before, after = baseline[key], hedged[key]
+            change = (after - before) / before * 100 if before else 0.0
+            print(f"{key:<16} {before:10.2f} -> {after:10.2f}  ({change:+.1f}%)")
+        print(f"{'hedges':<16} {hedged['hedges_sent']} sent, {hedged['hedges_won']} won")
+    else:
+        report = run(args, hedge=args.hedge == "on")
+        width = max(len(k) for k in report)
+        for key, value in report.items():
+            print(f"{key:<{width}}  {value}")
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+if __name__ == "__main__":
+    main()
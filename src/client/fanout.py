@@ -0,0 +1,60 @@
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, List
+
+from utils.concurrency import run_bounded
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+class FanoutPlanner:
+    """
+    Splits a saturated keyword query into per-category subqueries.
+
+    Discovery search stops at a fixed result cap. When a keyword hits it,
+    the guilds seen so far tell us which categories the term spans; each
+    of those categories is queried separately (up to ``max_categories``,
+    most frequent first) so results beyond the cap become reachable.
+    Subqueries run on up to ``workers`` threads.
+    """
+
+    def __init__(self, max_categories: int = 20, workers: int = 4, min_support: int = 1) -> None:
+        self.max_categories = max(1, max_categories)
+        self.workers = max(1, workers)
+        self.min_support = max(1, min_support)
+
+    @staticmethod
+    def observe(observed: Counter, guilds: Iterable[Dict[str, Any]]) -> None:
+        """
+        Count the category ids present in sanitized guilds.
+        """
+        for guild in guilds:
+            ids = set()
+            primary = guild.get("primary_category_id")
+            if primary is not None:
+                ids.add(primary)
+            for category in guild.get("categories") or ():
+                if isinstance(category, dict) and category.get("id") is not None:
+                    ids.add(category["id"])
+            observed.update(ids)
+
+    def plan(self, keyword: str, observed: Counter) -> List[int]:
+        category_ids = [
+            cid for cid, count in observed.most_common() if count >= self.min_support
+        ][: self.max_categories]
+        logger.info(
+            "Keyword '%s' saturated the result cap; fanning out over %d categories",
+            keyword,
+            len(category_ids),
+        )
+        return category_ids
+
+    def run(self, func: Callable[[int], Any], category_ids: List[int]) -> List[Any]:
+        """
+        Run ``func(category_id)`` for every category and return the results.
+
+        Exceptions propagate after all subqueries have finished.
+        """
+        if self.workers == 1 or len(category_ids) <= 1:
+            return [func(cid) for cid in category_ids]
+        futures = list(run_bounded(func, category_ids, self.workers))
+        return [f.result() for f in futures]
@@ -0,0 +1,32 @@
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+class NoveltyTracker:
+    """
+    Decides when a keyword has stopped contributing new guilds.
+
+    After each page the consumer reports how many of its guilds were new
+    to the run. Once the share of new guilds stays below ``threshold``
+    for ``patience`` consecutive pages, :attr:`should_stop` turns true
+    and the paginator stops requesting further pages for the keyword.
+    """
+
+    def __init__(self, threshold: float = 0.05, patience: int = 2) -> None:
+        self.threshold = max(0.0, threshold)
+        self.patience = max(1, patience)
+        self.low_streak = 0
+        self.pages = 0
+        self.requests_saved = 0
+
+    def record(self, new_count: int, page_size: int) -> None:
+        self.pages += 1
+        ratio = new_count / page_size if page_size else 0.0
+        if ratio < self.threshold:
+            self.low_streak += 1
+        else:
+            self.low_streak = 0
+
+    @property
+    def should_stop(self) -> bool:
+        return self.low_streak >= self.patience
@@ -1,67 +1,222 @@
-from typing import Any, Dict, List, Optional
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
 
+from client.novelty import NoveltyTracker
 from utils.logger import get_logger
+from utils.metrics import METRICS
 
 logger = get_logger(__name__)
 
+_PAGES = METRICS.counter("pages_fetched_total", "Discovery search pages fetched.")
+_PAGE_GUILDS = METRICS.counter("page_guilds_total", "Raw guilds returned by search pages.")
+_REQUESTS_SAVED = METRICS.counter(
+    "early_stop_requests_saved_total", "Page requests skipped by novelty-based early stopping."
+)
+_PAGES_DISCARDED = METRICS.counter(
+    "pages_prefetch_discarded_total", "Prefetched pages cancelled or discarded past the end."
+)
+
 class DiscoveryPaginator:
     """
     Responsible for walking through paginated discovery search results.
+
+    With ``prefetch`` greater than zero, up to that many upcoming offsets
+    are requested in parallel while the current page is being consumed.
+    Pages are still returned strictly in offset order, and any in-flight
+    requests past the detected end of the results are cancelled or
+    discarded.
     """
 
-    def __init__(self, client: "DiscordDiscoveryClient") -> None:  # type: ignore[name-defined]
+    def __init__(
+        self,
+        client: "DiscordDiscoveryClient",  # type: ignore[name-defined]
+        prefetch: int = 0,
+        prefetch_workers: Optional[int] = None,
+    ) -> None:
         self.client = client
+        self.prefetch = max(0, prefetch)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        if self.prefetch:
+            self._executor = ThreadPoolExecutor(
+                max_workers=max(1, prefetch_workers or self.prefetch),
+                thread_name_prefix="prefetch",
+            )
 
-    def paginate_search(
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _fetch_page(
+        self,
+        keyword: str,
+        offset: int,
+        limit_per_page: int,
+        category_id: Optional[int],
+    ) -> List[Dict[str, Any]]:
+        logger.info(
+            "Fetching page (keyword=%s, offset=%d, limit=%d, category_id=%s)",
+            keyword,
+            offset,
+            limit_per_page,
+            category_id,
+        )
+        page = self.client.search_guilds(
+            keyword=keyword,
+            limit=limit_per_page,
+            offset=offset,
+            category_id=category_id,
+        )
+        _PAGES.inc()
+        _PAGE_GUILDS.inc(len(page))
+        return page
+
+    def _iter_pages_sequential(
+        self,
+        keyword: str,
+        offsets: range,
+        limit_per_page: int,
+        category_id: Optional[int],
+    ) -> Iterator[Tuple[int, List[Dict[str, Any]]]]:
+        for offset in offsets:
+            yield offset, self._fetch_page(keyword, offset, limit_per_page, category_id)
+
+    def _iter_pages_prefetch(
+        self,
+        keyword: str,
+        offsets: range,
+        limit_per_page: int,
+        category_id: Optional[int],
+    ) -> Iterator[Tuple[int, List[Dict[str, Any]]]]:
+        assert self._executor is not None
+        pending = iter(offsets)
+        window: Deque[Tuple[int, Future]] = deque()
+
+        def _fill() -> None:
+            # The page being waited on plus ``prefetch`` speculative ones.
+            while len(window) <= self.prefetch:
+                offset = next(pending, None)
+                if offset is None:
+                    return
+                future = self._executor.submit(
+                    self._fetch_page, keyword, offset, limit_per_page, category_id
+                )
+                window.append((offset, future))
+
+        try:
+            _fill()
+            while window:
+                offset, future = window.popleft()
+                page = future.result()
+                _fill()
+                yield offset, page
+        finally:
+            if window:
+                logger.debug(
+                    "Discarding %d prefetched page(s) for keyword=%s", len(window), keyword
+                )
+                _PAGES_DISCARDED.inc(len(window))
+            for _, future in window:
+                future.cancel()
+
+    def iter_pages(
         self,
         keyword: str,
         limit_per_page: int = 100,
         max_results: int = 3000,
         category_id: Optional[int] = None,
-    ) -> List[Dict[str, Any]]:
+        start_offset: int = 0,
+        novelty: Optional[NoveltyTracker] = None,
+    ) -> Iterator[Tuple[int, List[Dict[str, Any]]]]:
         """
-        Fetch multiple pages of search results.
+        Yield ``(offset, page)`` pairs of search results in offset order.
 
         Stops when:
         - Reaching max_results, or
         - The API returns fewer results than requested (last page), or
-        - A page returns no results.
+        - A page returns no results, or
+        - A ``novelty`` tracker, fed by the consumer after each page,
+          reports that the keyword stopped contributing new guilds.
+
+        ``start_offset`` resumes pagination part way through a keyword.
+        The final page is trimmed so no more than ``max_results`` guilds
+        are yielded in total.
         """
         limit_per_page = max(1, min(limit_per_page, 100))
         max_results = max(1, max_results)
+        offsets = range(max(0, start_offset), max_results, limit_per_page)
 
-        results: List[Dict[str, Any]] = []
-        offset = 0
+        if self._executor is not None:
+            pages = self._iter_pages_prefetch(keyword, offsets, limit_per_page, category_id)
+        else:
+            pages = self._iter_pages_sequential(keyword, offsets, limit_per_page, category_id)
 
-        while len(results) < max_results:
-            logger.info(
-                "Fetching page (keyword=%s, offset=%d, limit=%d, category_id=%s)",
-                keyword,
-                offset,
-                limit_per_page,
-                category_id,
-            )
-            page = self.client.search_guilds(
-                keyword=keyword,
-                limit=limit_per_page,
-                offset=offset,
-                category_id=category_id,
-            )
+        try:
+            for offset, page in pages:
+                if not page:
+                    logger.info("No more results returned; stopping pagination.")
+                    return
+
+                yield offset, page[: max_results - offset]
+
+                if len(page) < limit_per_page:
+                    logger.info("Last page detected (page_size=%d); stopping.", len(page))
+                    return
 
-            if not page:
-                logger.info("No more results returned; stopping pagination.")
-                break
+                if offset + limit_per_page >= max_results:
+                    logger.info("Reached max_results limit (%d); stopping.", max_results)
+                    return
 
-            results.extend(page)
-            logger.debug("Accumulated %d results so far", len(results))
+                if novelty is not None and novelty.should_stop:
+                    remaining = len(range(offset + limit_per_page, max_results, limit_per_page))
+                    # Prefetched pages are already on the wire; only count the rest.
+                    if self._executor is not None:
+                        remaining = max(0, remaining - self.prefetch)
+                    novelty.requests_saved = remaining
+                    _REQUESTS_SAVED.inc(remaining)
+                    logger.info(
+                        "Keyword '%s' stopped adding new guilds; stopping at offset %d "
+                        "(%d requests saved).",
+                        keyword,
+                        offset + limit_per_page,
+                        remaining,
+                    )
+                    return
+        finally:
+            pages.close()
+
+    def iter_guilds(
+        self,
+        keyword: str,
+        limit_per_page: int = 100,
+        max_results: int = 3000,
+        category_id: Optional[int] = None,
+        start_offset: int = 0,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily yield raw guilds across pages.
 
-            if len(page) < limit_per_page:
-                logger.info("Last page detected (page_size=%d); stopping.", len(page))
-                break
+        Only the current page (plus any prefetched ones) is held in memory;
+        the next page is not requested until the consumer reaches it.
+        """
+        for _, page in self.iter_pages(
+            keyword, limit_per_page, max_results, category_id, start_offset
+        ):
+            yield from page
 
-            offset += limit_per_page
-            if offset >= max_results:
-                logger.info("Reached max_results limit (%d); stopping.", max_results)
-                break
+    def paginate_search(
+        self,
+        keyword: str,
+        limit_per_page: int = 100,
+        max_results: int = 3000,
+        category_id: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch multiple pages of search results into a single list.
 
-        return results[:max_results]
\ No newline at end of file
+        See :meth:`iter_pages` for the stopping rules.
+        """
+        results = list(self.iter_guilds(keyword, limit_per_page, max_results, category_id))
+        logger.debug("Accumulated %d results", len(results))
+        return results
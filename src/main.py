@@ -1,14 +1,47 @@
+import argparse
 import json
+import math
+import multiprocessing
+import os
 import sys
+import time
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 from client.discord_api import DiscordDiscoveryClient
+from client.fanout import FanoutPlanner
+from client.novelty import NoveltyTracker
 from client.paginator import DiscoveryPaginator
-from processors.parser import parse_guilds
-from processors.sanitizer import sanitize_guilds
-from utils.logger import get_logger
-from utils.request_handler import RequestHandler, RequestError
+from processors.collector import GuildCollector
+from scheduler import ChurnScheduler
+from scraper import KeywordScraper
+from storage.archive import PageArchive, list_chunks, normalize_chunk, replay_order
+from storage.columnar import ColumnarWriter
+from storage.delta import DeltaSink
+from storage.guild_store import CompactGuildStore
+from storage.ndjson_sink import COMPRESSION_SUFFIXES, NDJSONSink, SinkError, read_ndjson
+from storage.shard import (
+    ShardError,
+    ShardWriter,
+    merge_partials,
+    parse_shard,
+    partial_name,
+    shard_for,
+    shard_path,
+)
+from storage.sqlite_store import SQLiteGuildStore
+from utils.adaptive import AdaptiveLimiter
+from utils.checkpoint import Checkpoint
+from utils.codec import CODEC
+from utils.concurrency import run_bounded
+from utils.hedging import HedgePolicy
+from utils.keyword_source import KeywordSource, KeywordYields, unique_keywords
+from utils.logger import configure_logging, get_logger
+from utils.metrics import METRICS, PeriodicExporter
+from utils.profiling import PROFILER
+from utils.rate_limiter import RateLimiter
+from utils.response_cache import ResponseCache
+from utils.request_handler import RequestHandler
 
 logger = get_logger(__name__)
 
@@ -16,10 +49,113 @@ def load_settings(config_path: Path) -> Dict[str, Any]:
     if not config_path.exists():
         logger.warning("Settings file %s not found. Using default settings.", config_path)
         return {
+            "base_url": "https://discord.com/api/v9/discovery",
             "max_results_per_keyword": 300,
             "results_per_page": 100,
             "output_path": "data/sample.json",
+            "output_format": "json",
+            "output_indent": None,
+            "compact_store": False,
+            "ndjson": {
+                "path": "data/results.ndjson",
+                "compression": None,
+                "fsync_interval": 5.0,
+            },
+            "sqlite": {
+                "enabled": False,
+                "path": "data/guilds.sqlite",
+                "batch_size": 500,
+            },
+            "delta": {
+                "enabled": False,
+                "index_path": "data/delta/index.json",
+                "changes_path": "data/delta/changes.ndjson",
+                "compression": None,
+                "partial": False,
+            },
+            "columnar": {
+                "enabled": False,
+                "path": "data/columnar",
+            },
+            "archive": {
+                "enabled": False,
+                "dir": "data/archive",
+                "chunk_pages": 500,
+                "processes": None,
+            },
+            "shard": {
+                "dir": "data/shards",
+                "run_size": 100000,
+            },
+            "keywords": {
+                "priority": "file",
+                "yield_path": "data/keyword_yield.json",
+            },
+            "daemon": {
+                "min_interval": 900,
+                "max_interval": 86400,
+                "requests_per_hour": 3600,
+                "batch_size": 50,
+                "state_path": "data/schedule.json",
+            },
+            "logging": {
+                "level": None,
+                "async": False,
+                "format": "text",
+                "sample_debug": 1,
+                "rate_limit": 0,
+            },
             "category_id": None,
+            "concurrency": {
+                "workers": 1,
+                "prefetch_pages": 0,
+                "adaptive": {
+                    "enabled": False,
+                    "initial": 4,
+                    "min": 1,
+                    "max": None,
+                    "latency_tolerance": 2.0,
+                },
+            },
+            "rate_limit": {
+                "enabled": True,
+                "max_retries": 5,
+            },
+            "hedge": {
+                "enabled": False,
+                "quantile": 0.95,
+                "max_ratio": 0.05,
+                "min_delay": 0.05,
+                "min_samples": 50,
+            },
+            "early_stop": {
+                "enabled": False,
+                "novelty_threshold": 0.05,
+                "patience": 2,
+            },
+            "fanout": {
+                "enabled": False,
+                "max_categories": 20,
+                "workers": 4,
+                "min_support": 1,
+            },
+            "metrics": {
+                "enabled": True,
+                "path": "data/metrics.prom",
+                "format": "prometheus",
+                "interval": 60.0,
+            },
+            "checkpoint": {
+                "enabled": True,
+                "path": "data/checkpoint.json",
+                "interval": 30.0,
+            },
+            "cache": {
+                "enabled": False,
+                "path": "data/cache/responses.sqlite",
+                "ttl_seconds": 3600,
+                "max_bytes": 268435456,
+            },
             "request": {
                 "timeout": 10,
                 "retries": 3,
@@ -39,102 +175,710 @@ def load_settings(config_path: Path) -> Dict[str, Any]:
         logger.error("Failed to read settings file: %s", exc)
         raise SystemExit("Unable to read settings file") from exc
 
-def load_keywords(keywords_path: Path) -> List[str]:
+def load_keywords(keywords_path: Path, yields: Optional[KeywordYields] = None) -> Iterator[str]:
+    """
+    Stream normalized, deduplicated keywords from ``keywords_path``.
+
+    The file is read lazily; see :class:`KeywordSource` for the
+    normalization and the ``yields``-based ordering.
+    """
     if not keywords_path.exists():
         logger.warning("Keywords file %s not found. Using default keyword 'discord'.", keywords_path)
-        return ["discord"]
+        yield "discord"
+        return
 
+    source = KeywordSource(keywords_path, yields=yields)
     try:
-        with keywords_path.open("r", encoding="utf-8") as f:
-            keywords = [line.strip() for line in f if line.strip()]
-        if not keywords:
-            logger.warning("Keywords file is empty. Using default keyword 'discord'.")
-            return ["discord"]
-        logger.info("Loaded %d keywords from %s", len(keywords), keywords_path)
-        return keywords
+        yield from source
     except OSError as exc:
         logger.error("Failed to read keywords file: %s", exc)
-        return ["discord"]
+    if not source.emitted:
+        logger.warning("Keywords file is empty. Using default keyword 'discord'.")
+        yield "discord"
 
-def save_results(output_path: Path, results: List[Dict[str, Any]]) -> None:
+def save_results(
+    output_path: Path,
+    results: List[Dict[str, Any]],
+    indent: Optional[int] = None,
+) -> None:
     output_path.parent.mkdir(parents=True, exist_ok=True)
     try:
-        with output_path.open("w", encoding="utf-8") as f:
-            json.dump(results, f, ensure_ascii=False, indent=2)
+        with output_path.open("wb") as f:
+            f.write(CODEC.dumps(results, indent=indent))
         logger.info("Saved %d servers to %s", len(results), output_path)
     except OSError as exc:
         logger.error("Failed to write output file %s: %s", output_path, exc)
         raise SystemExit("Unable to write output file") from exc
 
+def open_sink(
+    settings: Dict[str, Any],
+    root_dir: Path,
+    append: bool = False,
+    truncate: Optional[int] = None,
+) -> Optional[NDJSONSink]:
+    """
+    Open the streaming NDJSON sink when ``output_format`` is ``"ndjson"``.
+
+    With ``append`` the partial file of an interrupted run is extended
+    instead of truncated, after cutting it back to ``truncate`` bytes.
+    """
+    if settings.get("output_format", "json") != "ndjson":
+        return None
+
+    ndjson_cfg = settings.get("ndjson", {})
+    compression = ndjson_cfg.get("compression")
+    ndjson_path = root_dir / ndjson_cfg.get("path", "data/results.ndjson")
+    suffix = COMPRESSION_SUFFIXES.get(compression, "")
+    if suffix and not ndjson_path.name.endswith(suffix):
+        ndjson_path = ndjson_path.with_name(ndjson_path.name + suffix)
+    try:
+        return NDJSONSink(
+            ndjson_path,
+            compression=compression,
+            fsync_interval=float(ndjson_cfg.get("fsync_interval", 5.0)),
+            append=append,
+            truncate=truncate,
+        )
+    except (OSError, SinkError) as exc:
+        logger.error("Failed to open output file %s: %s", ndjson_path, exc)
+        raise SystemExit("Unable to write output file") from exc
+
+def build_snapshot(
+    settings: Dict[str, Any],
+    root_dir: Path,
+    guilds: Iterable[Dict[str, Any]],
+) -> None:
+    """
+    Write the columnar snapshot of ``guilds`` when it is enabled.
+    """
+    columnar_cfg = settings.get("columnar", {})
+    if not columnar_cfg.get("enabled", False):
+        return
+    path = root_dir / columnar_cfg.get("path", "data/columnar")
+    writer = ColumnarWriter(path)
+    try:
+        with PROFILER.stage("snapshot"):
+            writer.extend(guilds)
+            writer.close()
+    except (OSError, SinkError) as exc:
+        logger.error("Failed to write columnar snapshot %s: %s", path, exc)
+        raise SystemExit("Unable to write columnar snapshot") from exc
+
+def open_yields(
+    settings: Dict[str, Any],
+    root_dir: Path,
+    shard: Optional[Tuple[int, int]] = None,
+) -> Optional[KeywordYields]:
+    """
+    Per-keyword yield history, when keywords are prioritized by yield.
+    """
+    keywords_cfg = settings.get("keywords", {})
+    if keywords_cfg.get("priority", "file") != "yield":
+        return None
+    path = root_dir / keywords_cfg.get("yield_path", "data/keyword_yield.json")
+    return KeywordYields(shard_path(path, shard) if shard is not None else path)
+
 def run_scraper(
-    keywords: List[str],
+    keywords: Iterable[str],
     settings: Dict[str, Any],
     root_dir: Optional[Path] = None,
+    resume: bool = False,
+    shard: Optional[Tuple[int, int]] = None,
+    on_page: Optional[Callable[[str, List[Dict[str, Any]]], None]] = None,
 ) -> List[Dict[str, Any]]:
+    """
+    Scrape every keyword and write the deduplicated guilds to the output.
+
+    With ``resume``, completed keywords recorded in the checkpoint are
+    skipped and in-progress ones continue from their saved offset; the
+    partial output files are cut back to their checkpointed size first.
+    Resuming needs streaming NDJSON (or shard) output, since JSON output
+    only exists once a run completes.
+
+    With ``shard=(i, N)`` only the keywords hashing to shard ``i`` are
+    scraped and the guilds go to that shard's partial file instead of
+    the regular output; combine the partials with ``main.py merge``.
+
+    ``on_page`` is called with the keyword and each sanitized page.
+
+    Returns the collected guilds for JSON output. With streaming NDJSON
+    output the records are not kept in memory and an empty list is
+    returned.
+    """
     root_dir = root_dir or Path(__file__).resolve().parents[1]
+    if resume and shard is None and settings.get("output_format", "json") != "ndjson":
+        logger.error("Cannot resume with JSON output: earlier guilds were never written to disk.")
+        raise SystemExit("--resume requires output_format 'ndjson'")
+
+    def _state_path(key: str, default: str) -> Path:
+        path = root_dir / settings.get(key, {}).get("path", default)
+        return shard_path(path, shard) if shard is not None else path
+
+    # Normalizing and deduplicating is idempotent, so keyword streams from
+    # load_keywords pass through unchanged.
+    keywords = unique_keywords(keywords)
+    if shard is not None:
+        index, count = shard
+        keywords = (k for k in keywords if shard_for(k, count) == index)
+        logger.info("Running shard %d of %d", index, count)
+
+    concurrency_cfg = settings.get("concurrency", {})
+    workers = max(1, int(concurrency_cfg.get("workers", 1)))
+    prefetch_pages = max(0, int(concurrency_cfg.get("prefetch_pages", 0)))
 
     request_cfg = settings.get("request", {})
+    rate_limit_cfg = settings.get("rate_limit", {})
+    rate_limiter = RateLimiter() if rate_limit_cfg.get("enabled", True) else None
+    cache_cfg = settings.get("cache", {})
+    cache: Optional[ResponseCache] = None
+    if cache_cfg.get("enabled", False):
+        cache = ResponseCache(
+            root_dir / cache_cfg.get("path", "data/cache/responses.sqlite"),
+            ttl_seconds=float(cache_cfg.get("ttl_seconds", 3600)),
+            max_bytes=int(cache_cfg.get("max_bytes", 256 * 1024 * 1024)),
+        )
+    hedge_cfg = settings.get("hedge", {})
+    hedge: Optional[HedgePolicy] = None
+    if hedge_cfg.get("enabled", False):
+        hedge = HedgePolicy(
+            quantile=float(hedge_cfg.get("quantile", 0.95)),
+            max_ratio=float(hedge_cfg.get("max_ratio", 0.05)),
+            min_delay=float(hedge_cfg.get("min_delay", 0.05)),
+            min_samples=int(hedge_cfg.get("min_samples", 50)),
+        )
+    adaptive_cfg = concurrency_cfg.get("adaptive", {})
+    limiter: Optional[AdaptiveLimiter] = None
+    if adaptive_cfg.get("enabled", False):
+        # Workers and prefetch set how many requests *can* be in flight;
+        # the controller decides how many actually are.
+        limiter = AdaptiveLimiter(
+            initial=int(adaptive_cfg.get("initial", 4)),
+            min_limit=int(adaptive_cfg.get("min", 1)),
+            max_limit=int(adaptive_cfg.get("max") or workers * (prefetch_pages + 1)),
+            latency_tolerance=float(adaptive_cfg.get("latency_tolerance", 2.0)),
+        )
     handler = RequestHandler(
         timeout=request_cfg.get("timeout", 10),
         retries=request_cfg.get("retries", 3),
         backoff_factor=request_cfg.get("backoff_factor", 0.5),
+        pool_size=workers * (prefetch_pages + 1),
+        rate_limiter=rate_limiter,
+        rate_limit_retries=rate_limit_cfg.get("max_retries", 5),
+        cache=cache,
+        hedge=hedge,
+        concurrency=limiter,
+    )
+    client = DiscordDiscoveryClient(
+        handler,
+        base_url=settings.get("base_url", "https://discord.com/api/v9/discovery"),
+    )
+    paginator = DiscoveryPaginator(
+        client,
+        prefetch=prefetch_pages,
+        prefetch_workers=workers * prefetch_pages,
     )
-    client = DiscordDiscoveryClient(handler)
-    paginator = DiscoveryPaginator(client)
 
     max_results_per_keyword = int(settings.get("max_results_per_keyword", 300))
     results_per_page = int(settings.get("results_per_page", 100))
     category_id = settings.get("category_id")
 
-    all_parsed: Dict[str, Dict[str, Any]] = {}
+    checkpoint_cfg = settings.get("checkpoint", {})
+    checkpoint: Optional[Checkpoint] = None
+    # Only streamed output can be resumed, so JSON runs skip checkpointing.
+    resumable = shard is not None or settings.get("output_format", "json") == "ndjson"
+    if resume or (resumable and checkpoint_cfg.get("enabled", True)):
+        checkpoint_path = _state_path("checkpoint", "data/checkpoint.json")
+        interval = float(checkpoint_cfg.get("interval", 30.0))
+        if resume:
+            checkpoint = Checkpoint.load(checkpoint_path, interval=interval)
+        else:
+            checkpoint = Checkpoint(checkpoint_path, interval=interval)
+    # Anything written after the last checkpoint is re-scraped, so drop it.
+    resume_sizes = checkpoint.sizes if checkpoint is not None and resume else {}
+
+    sink: Optional[Union[NDJSONSink, ShardWriter]]
+    if shard is not None:
+        shard_cfg = settings.get("shard", {})
+        sink = ShardWriter(
+            root_dir / shard_cfg.get("dir", "data/shards") / partial_name(shard),
+            run_size=int(shard_cfg.get("run_size", 100_000)),
+            append=resume,
+        )
+    else:
+        sink = open_sink(settings, root_dir, append=resume, truncate=resume_sizes.get("output", 0))
+    sqlite_cfg = settings.get("sqlite", {})
+    store: Optional[SQLiteGuildStore] = None
+    if sqlite_cfg.get("enabled", False):
+        store = SQLiteGuildStore(
+            root_dir / sqlite_cfg.get("path", "data/guilds.sqlite"),
+            batch_size=int(sqlite_cfg.get("batch_size", 500)),
+        )
+    delta_cfg = settings.get("delta", {})
+    delta: Optional[DeltaSink] = None
+    if delta_cfg.get("enabled", False):
+        index_path = root_dir / delta_cfg.get("index_path", "data/delta/index.json")
+        changes_path = root_dir / delta_cfg.get("changes_path", "data/delta/changes.ndjson")
+        if shard is not None:
+            index_path, changes_path = shard_path(index_path, shard), shard_path(changes_path, shard)
+        delta = DeltaSink(
+            index_path,
+            changes_path,
+            compression=delta_cfg.get("compression"),
+            append=resume,
+            partial=bool(delta_cfg.get("partial", False)),
+            truncate=resume_sizes.get("delta", 0),
+        )
+    sinks = [s for s in (sink, store, delta) if s is not None]
+    archive_cfg = settings.get("archive", {})
+    archive: Optional[PageArchive] = None
+    if archive_cfg.get("enabled", False):
+        archive = PageArchive(
+            root_dir / archive_cfg.get("dir", "data/archive"),
+            chunk_pages=int(archive_cfg.get("chunk_pages", 500)),
+            prefix="chunk" if shard is None else "shard-%03d-of-%03d" % shard,
+        )
+    records = CompactGuildStore() if settings.get("compact_store", False) else None
+    collector = GuildCollector(sinks=sinks, keep_records=sink is None, records=records)
+
+    if checkpoint is not None and resume:
+        if sink is not None:
+            collector.prime(checkpoint.seen_ids)
+        if delta is not None:
+            delta.prime(checkpoint.seen_ids)
+        checkpoint.seen_ids = []
+        keywords = (k for k in keywords if not checkpoint.is_completed(k))
+
+    # METRICS keeps counting across daemon cycles; the end-of-run
+    # summaries report what this run added.
+    counted_before = {
+        name: METRICS.counter(name).value
+        for name in ("early_stop_requests_saved_total", "http_hedges_won_total")
+    }
+
+    def _counted(name: str) -> int:
+        return int(METRICS.counter(name).value - counted_before[name])
+
+    metrics_cfg = settings.get("metrics", {})
+    exporter: Optional[PeriodicExporter] = None
+    if metrics_cfg.get("enabled", True):
+        exporter = PeriodicExporter(
+            METRICS,
+            _state_path("metrics", "data/metrics.prom"),
+            fmt=metrics_cfg.get("format", "prometheus"),
+            interval=float(metrics_cfg.get("interval", 60.0)),
+        ).start()
+
+    # The archive is flushed with the sinks so a checkpoint never skips
+    # pages that were not archived.
+    flushables = {
+        name: s
+        for name, s in (("output", sink), ("sqlite", store), ("delta", delta), ("archive", archive))
+        if s is not None
+    }
+
+    def _flush_sinks() -> Dict[str, int]:
+        sizes: Dict[str, int] = {}
+        for name, s in flushables.items():
+            size = s.flush()
+            if size is not None:
+                sizes[name] = size
+        return sizes
 
-    for keyword in keywords:
-        logger.info("Starting scrape for keyword '%s'", keyword)
+    early_stop_cfg = settings.get("early_stop", {})
+    early_stop = bool(early_stop_cfg.get("enabled", False))
+    novelty_threshold = float(early_stop_cfg.get("novelty_threshold", 0.05))
+    novelty_patience = int(early_stop_cfg.get("patience", 2))
+
+    fanout_cfg = settings.get("fanout", {})
+    fanout: Optional[FanoutPlanner] = None
+    if fanout_cfg.get("enabled", False):
+        fanout = FanoutPlanner(
+            max_categories=int(fanout_cfg.get("max_categories", 20)),
+            workers=int(fanout_cfg.get("workers", 4)),
+            min_support=int(fanout_cfg.get("min_support", 1)),
+        )
+
+    yields = open_yields(settings, root_dir, shard)
+
+    scraper = KeywordScraper(
+        paginator,
+        collector,
+        results_per_page=results_per_page,
+        max_results=max_results_per_keyword,
+        category_id=category_id,
+        checkpoint=checkpoint,
+        novelty_factory=(
+            (lambda: NoveltyTracker(novelty_threshold, novelty_patience)) if early_stop else None
+        ),
+        fanout=fanout,
+        yields=yields,
+        on_page=on_page,
+        archive=archive,
+        flush=_flush_sinks,
+    )
+
+    def _scrape(keyword: str) -> None:
+        scraper.scrape(keyword)
+        scraper.save_checkpoint()
+
+    try:
+        if workers == 1:
+            for keyword in keywords:
+                _scrape(keyword)
+        else:
+            logger.info("Scraping keywords with %d concurrent workers", workers)
+            for future in run_bounded(_scrape, keywords, workers):
+                future.result()
+    except BaseException:
+        scraper.save_checkpoint(force=True)
+        if sink is not None:
+            # Leave the partial file in place so the work done so far survives.
+            sink.close(finalize=False)
+        if store is not None:
+            store.close()
+        if delta is not None:
+            delta.close(finalize=False)
+        raise
+    finally:
+        paginator.close()
+        handler.close()
+        if yields is not None:
+            yields.save()
+        if archive is not None:
+            # Append-only: even an interrupted run's pages are kept.
+            archive.close()
+        if cache is not None:
+            cache.close()
+        if exporter is not None:
+            exporter.stop()
+
+    logger.info("Total unique servers collected: %d", len(collector))
+    if early_stop:
+        logger.info(
+            "Early stopping saved %d page requests",
+            _counted("early_stop_requests_saved_total"),
+        )
+    if limiter is not None:
+        logger.info("Adaptive concurrency settled at %d in-flight requests", int(limiter.limit))
+    if hedge is not None:
+        logger.info(
+            "Hedged %d of %d requests; %d hedges answered first",
+            hedge.hedges,
+            hedge.requests,
+            _counted("http_hedges_won_total"),
+        )
+
+    if store is not None:
+        store.close()
+    if delta is not None:
+        delta.close()
+
+    if sink is not None:
         try:
-            raw_guilds = paginator.paginate_search(
-                keyword=keyword,
-                limit_per_page=results_per_page,
-                max_results=max_results_per_keyword,
-                category_id=category_id,
-            )
-        except RequestError as exc:
-            logger.error("Network error while scraping keyword '%s': %s", keyword, exc)
-            continue
-        except Exception as exc:  # noqa: BLE001
-            logger.exception("Unexpected error while scraping keyword '%s': %s", keyword, exc)
+            with PROFILER.stage("save"):
+                sink.close()
+        except (OSError, SinkError, ShardError) as exc:
+            logger.error("Failed to finalize output file %s: %s", sink.path, exc)
+            raise SystemExit("Unable to write output file") from exc
+        all_parsed: List[Dict[str, Any]] = []
+        if shard is None:
+            build_snapshot(settings, root_dir, read_ndjson(sink.path))
+    else:
+        all_parsed = collector.values()
+        output_path = root_dir / settings.get("output_path", "data/sample.json")
+        with PROFILER.stage("save"):
+            save_results(output_path, all_parsed, indent=settings.get("output_indent"))
+        build_snapshot(settings, root_dir, all_parsed)
+
+    if checkpoint is not None:
+        checkpoint.remove()
+    return all_parsed
+
+def run_daemon(
+    keywords: Iterable[str],
+    settings: Dict[str, Any],
+    root_dir: Path,
+    max_cycles: Optional[int] = None,
+    sleep: Callable[[float], None] = time.sleep,
+    clock: Callable[[], float] = time.time,
+) -> None:
+    """
+    Keep refreshing keywords, each on an interval driven by its churn.
+
+    Every cycle runs :func:`run_scraper` over the due keywords the
+    hourly request budget allows (see :class:`ChurnScheduler`), then
+    sleeps until the next keyword is due and affordable. Each cycle
+    writes only its own batch, so JSON and NDJSON files would be
+    replaced by every cycle; the daemon refuses to start unless SQLite
+    or delta output, which accumulate across cycles, is enabled. A delta
+    index is updated in partial mode, since a cycle covers only some
+    keywords.
+    """
+    if not (
+        settings.get("sqlite", {}).get("enabled", False)
+        or settings.get("delta", {}).get("enabled", False)
+    ):
+        logger.error("Daemon mode would overwrite the output file with every cycle's batch.")
+        raise SystemExit("Daemon mode requires SQLite or delta output")
+    daemon_cfg = settings.get("daemon", {})
+    per_page = max(1, min(int(settings.get("results_per_page", 100)), 100))
+    max_results = int(settings.get("max_results_per_keyword", 300))
+    scheduler = ChurnScheduler(
+        unique_keywords(keywords),
+        min_interval=float(daemon_cfg.get("min_interval", 900)),
+        max_interval=float(daemon_cfg.get("max_interval", 86400)),
+        requests_per_hour=float(daemon_cfg.get("requests_per_hour", 3600)),
+        default_cost=math.ceil(max_results / per_page),
+        clock=clock,
+    )
+    state_path = root_dir / daemon_cfg.get("state_path", "data/schedule.json")
+    scheduler.load(state_path)
+    batch_size = max(1, int(daemon_cfg.get("batch_size", 50)))
+    cycle_settings = {
+        **settings,
+        "delta": {**settings.get("delta", {}), "partial": True},
+        # A cycle's results are a slice of the keywords, not a full snapshot.
+        "columnar": {"enabled": False},
+    }
+
+    logger.info(
+        "Daemon tracking %d keywords with a budget of %d requests/hour",
+        len(scheduler.states),
+        int(scheduler.capacity),
+    )
+    cycles = 0
+    while max_cycles is None or cycles < max_cycles:
+        cycles += 1
+        batch = scheduler.plan(limit=batch_size)
+        if not batch:
+            wait = scheduler.seconds_until_next()
+            logger.info("Nothing due; sleeping %.0fs", wait)
+            sleep(max(1.0, wait))
             continue
+        logger.info("Refreshing %d keywords (%d requests left this hour)", len(batch), int(scheduler.tokens))
+        run_scraper(batch, cycle_settings, root_dir=root_dir, on_page=scheduler.observe)
+        scheduler.finish(batch)
+        scheduler.save(state_path)
 
-        parsed = parse_guilds(raw_guilds)
-        sanitized = sanitize_guilds(parsed)
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    root_dir = Path(__file__).resolve().parents[1]
+    parser = argparse.ArgumentParser(description="Discord Server Scraper")
+    parser.add_argument(
+        "--config",
+        type=Path,
+        default=root_dir / "src" / "config" / "settings.example.json",
+        help="Path to the settings JSON file.",
+    )
+    parser.add_argument(
+        "--keywords",
+        type=Path,
+        default=root_dir / "data" / "keywords.txt",
+        help="Path to the keywords file (one keyword per line).",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue an interrupted run from its checkpoint.",
+    )
+    parser.add_argument(
+        "--shard",
+        type=_shard_arg,
+        default=None,
+        metavar="INDEX/COUNT",
+        help="Only scrape keywords hashing to this shard (0-based) and write a partial file.",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Profile CPU time and allocations per stage and write a report.",
+    )
+    parser.add_argument(
+        "--profile-dir",
+        type=Path,
+        default=root_dir / "data" / "profile",
+        help="Directory for the profile report, .prof files and collapsed stacks.",
+    )
+    subparsers = parser.add_subparsers(dest="command")
+    merge = subparsers.add_parser("merge", help="Merge partial shard files into one NDJSON output.")
+    merge.add_argument(
+        "partials",
+        nargs="*",
+        type=Path,
+        help="Partial files to merge (default: every part-*.ndjson in the shard directory).",
+    )
+    merge.add_argument(
+        "--output",
+        type=Path,
+        default=None,
+        help="Merged NDJSON path (default: the ndjson output path from the settings).",
+    )
+    subparsers.add_parser(
+        "daemon", help="Keep refreshing keywords on churn-driven intervals within an hourly budget."
+    )
+    replay = subparsers.add_parser(
+        "replay", help="Rebuild the outputs from the raw page archive without the network."
+    )
+    replay.add_argument(
+        "chunks",
+        nargs="*",
+        type=Path,
+        help="Archive chunks to replay (default: every chunk in the archive directory).",
+    )
+    replay.add_argument(
+        "--processes",
+        type=int,
+        default=None,
+        help="Worker processes normalizing chunks (default: archive.processes or one per CPU).",
+    )
+    return parser.parse_args(argv)
 
-        for guild in sanitized:
-            gid = guild.get("id")
-            if gid is not None:
-                all_parsed[gid] = guild
+def _shard_arg(value: str) -> Tuple[int, int]:
+    try:
+        return parse_shard(value)
+    except ShardError as exc:
+        raise argparse.ArgumentTypeError(str(exc)) from exc
 
-        logger.info(
-            "Finished keyword '%s': %d raw, %d parsed, %d unique total",
-            keyword,
-            len(raw_guilds),
-            len(sanitized),
-            len(all_parsed),
+def run_merge(
+    partials: List[Path],
+    settings: Dict[str, Any],
+    root_dir: Path,
+    output_path: Optional[Path] = None,
+) -> int:
+    """
+    Merge shard partial files; the newest observation of each guild wins.
+    """
+    if not partials:
+        shard_dir = root_dir / settings.get("shard", {}).get("dir", "data/shards")
+        partials = sorted(shard_dir.glob("part-*.ndjson"))
+    if not partials:
+        raise SystemExit("No partial shard files to merge")
+    ndjson_cfg = settings.get("ndjson", {})
+    output_path = output_path or root_dir / ndjson_cfg.get("path", "data/results.ndjson")
+    try:
+        merged = merge_partials(partials, output_path, compression=ndjson_cfg.get("compression"))
+    except (OSError, SinkError, ShardError) as exc:
+        logger.error("Failed to merge partial files: %s", exc)
+        raise SystemExit("Unable to merge partial files") from exc
+    build_snapshot(settings, root_dir, read_ndjson(output_path))
+    return merged
+
+def run_replay(
+    chunks: List[Path],
+    settings: Dict[str, Any],
+    root_dir: Path,
+    processes: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Rebuild the outputs from archived raw pages, without the network.
+
+    Chunks are normalized by ``processes`` worker processes (default:
+    one per CPU) and merged newest run first, keeping the first sighting
+    of each guild like a live run does, so every output format reflects
+    the latest run with the current schema. Output goes wherever
+    :func:`run_scraper` would write it.
+    """
+    archive_cfg = settings.get("archive", {})
+    if not chunks:
+        chunks = list_chunks(root_dir / archive_cfg.get("dir", "data/archive"))
+    if not chunks:
+        raise SystemExit("No archive chunks to replay")
+    chunks = replay_order(chunks)
+    processes = int(processes or archive_cfg.get("processes") or os.cpu_count() or 1)
+    processes = max(1, min(processes, len(chunks)))
+
+    sink = open_sink(settings, root_dir)
+    sqlite_cfg = settings.get("sqlite", {})
+    store: Optional[SQLiteGuildStore] = None
+    if sqlite_cfg.get("enabled", False):
+        store = SQLiteGuildStore(
+            root_dir / sqlite_cfg.get("path", "data/guilds.sqlite"),
+            batch_size=int(sqlite_cfg.get("batch_size", 500)),
         )
+    records = CompactGuildStore() if settings.get("compact_store", False) else None
+    collector = GuildCollector(
+        sinks=[s for s in (sink, store) if s is not None],
+        keep_records=sink is None,
+        records=records,
+    )
 
+    logger.info("Replaying %d archive chunks with %d processes", len(chunks), processes)
+    # Sink writer and logging threads are already running, so never fork.
+    pool = multiprocessing.get_context("spawn").Pool(processes) if processes > 1 else None
+    try:
+        results = pool.imap(normalize_chunk, chunks) if pool is not None else map(normalize_chunk, chunks)
+        for guilds in results:
+            collector.add(guilds)
+    except BaseException as exc:
+        if sink is not None:
+            sink.close(finalize=False)
+        if store is not None:
+            store.close()
+        if isinstance(exc, (OSError, SinkError)):
+            logger.error("Failed to replay archive: %s", exc)
+            raise SystemExit("Unable to replay archive") from exc
+        raise
+    finally:
+        if pool is not None:
+            pool.terminate()
+    logger.info("Replayed %d unique servers", len(collector))
+
+    if store is not None:
+        store.close()
+    if sink is not None:
+        try:
+            sink.close()
+        except (OSError, SinkError) as exc:
+            logger.error("Failed to finalize output file %s: %s", sink.path, exc)
+            raise SystemExit("Unable to write output file") from exc
+        build_snapshot(settings, root_dir, read_ndjson(sink.path))
+        return []
+    all_parsed = collector.values()
     output_path = root_dir / settings.get("output_path", "data/sample.json")
-    save_results(output_path, list(all_parsed.values()))
-    return list(all_parsed.values())
+    save_results(output_path, all_parsed, indent=settings.get("output_indent"))
+    build_snapshot(settings, root_dir, all_parsed)
+    return all_parsed
 
-def main() -> None:
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
     root_dir = Path(__file__).resolve().parents[1]
-    config_path = root_dir / "src" / "config" / "settings.example.json"
-    keywords_path = root_dir / "data" / "keywords.txt"
 
-    settings = load_settings(config_path)
-    keywords = load_keywords(keywords_path)
+    settings = load_settings(args.config)
+    logging_cfg = settings.get("logging")
+    if logging_cfg:
+        configure_logging(
+            level=logging_cfg.get("level"),
+            use_async=bool(logging_cfg.get("async", False)),
+            fmt=logging_cfg.get("format", "text"),
+            sample_debug=int(logging_cfg.get("sample_debug", 1)),
+            rate_limit=float(logging_cfg.get("rate_limit", 0)),
+        )
+    if args.profile:
+        PROFILER.start()
+    try:
+        run_command(args, settings, root_dir)
+    finally:
+        if args.profile:
+            PROFILER.stop()
+            report = PROFILER.write_report(args.profile_dir)
+            logger.info("Wrote profile report to %s", report)
+
+def run_command(args: argparse.Namespace, settings: Dict[str, Any], root_dir: Path) -> None:
+    if args.command == "merge":
+        run_merge(args.partials, settings, root_dir, output_path=args.output)
+        return
+    if args.command == "replay":
+        run_replay(args.chunks, settings, root_dir, processes=args.processes)
+        return
+
+    keywords = load_keywords(args.keywords, yields=open_yields(settings, root_dir, args.shard))
+    if args.command == "daemon":
+        logger.info("Discord Server Scraper starting in daemon mode.")
+        run_daemon(keywords, settings, root_dir)
+        return
 
     logger.info("Discord Server Scraper starting up.")
-    results = run_scraper(keywords, settings, root_dir=root_dir)
-    logger.info("Scraper finished. Total unique servers collected: %d", len(results))
+    run_scraper(keywords, settings, root_dir=root_dir, resume=args.resume, shard=args.shard)
+    logger.info("Scraper finished.")
 
 if __name__ == "__main__":
     try:
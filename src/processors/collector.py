@@ -0,0 +1,135 @@
+import threading
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    MutableMapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+class GuildCollector:
+    """
+    Thread-safe, id-deduplicated accumulator for sanitized guilds.
+
+    Several keyword workers may merge into the same collector at once.
+    Deciding which ids are new happens under a single lock so the
+    underlying mapping never sees interleaved updates; the new guilds
+    are then written to the sinks outside it, so workers do not queue
+    behind each other's output I/O. Sinks must therefore be thread-safe.
+
+    Each guild is written to every sink in ``sinks`` (objects with a
+    ``write(guild)`` method) the first time its id is seen, and the
+    kept record is never overwritten either, so the records agree with
+    what the sinks received. With ``keep_records=False`` only the ids
+    are retained, so memory stays proportional to the number of unique
+    guilds rather than to the size of their records. ``records``
+    replaces the default ``dict`` used to hold them, e.g. with a
+    :class:`storage.guild_store.CompactGuildStore`.
+    """
+
+    def __init__(
+        self,
+        sinks: Sequence[Any] = (),
+        keep_records: bool = True,
+        records: Optional[MutableMapping[str, Any]] = None,
+    ) -> None:
+        self.sinks = list(sinks)
+        self.keep_records = keep_records
+        self.guilds: MutableMapping[str, Any] = records if records is not None else {}
+        self._seen: Set[str] = set()
+        self._lock = threading.Lock()
+        # Signalled when sink writes drain or a sync finishes.
+        self._idle = threading.Condition(self._lock)
+        self._writing = 0
+        self._syncing = False
+
+    def add(self, guilds: Iterable[Dict[str, Any]]) -> int:
+        """
+        Merge sanitized guilds and return how many ids were not seen before.
+
+        Guilds without an id are skipped; a guild seen again keeps its
+        first record, as the streaming sinks do.
+        """
+        new: List[Dict[str, Any]] = []
+        with self._lock:
+            while self._syncing:
+                self._idle.wait()
+            for guild in guilds:
+                gid = guild.get("id")
+                if gid is None:
+                    continue
+                if self.keep_records:
+                    is_new = gid not in self.guilds
+                    if is_new:
+                        self.guilds[gid] = guild
+                else:
+                    is_new = gid not in self._seen
+                    self._seen.add(gid)
+                if is_new:
+                    new.append(guild)
+            if not new or not self.sinks:
+                return len(new)
+            self._writing += 1
+
+        try:
+            for guild in new:
+                for sink in self.sinks:
+                    sink.write(guild)
+        finally:
+            with self._lock:
+                self._writing -= 1
+                if not self._writing:
+                    self._idle.notify_all()
+        return len(new)
+
+    def prime(self, ids: Iterable[str]) -> None:
+        """
+        Mark ids as already emitted, e.g. when resuming a streamed run.
+
+        Only meaningful with ``keep_records=False``; a record-keeping
+        collector has no way to restore the records themselves.
+        """
+        with self._lock:
+            self._seen.update(ids)
+
+    def ids(self) -> List[str]:
+        with self._lock:
+            return list(self.guilds) if self.keep_records else list(self._seen)
+
+    def sync(
+        self, flush: Optional[Callable[[], Dict[str, int]]] = None
+    ) -> Tuple[List[str], Dict[str, int]]:
+        """
+        Return the ids seen so far together with the result of ``flush``.
+
+        Waits for in-flight sink writes, then holds off merges until
+        ``flush`` returns, so the sinks hold exactly the returned ids;
+        used for checkpoints.
+        """
+        with self._lock:
+            self._syncing = True
+            try:
+                while self._writing:
+                    self._idle.wait()
+                ids = list(self.guilds) if self.keep_records else list(self._seen)
+                sizes = flush() if flush is not None else {}
+            finally:
+                self._syncing = False
+                self._idle.notify_all()
+        return ids, sizes
+
+    def __len__(self) -> int:
+        return len(self.guilds) if self.keep_records else len(self._seen)
+
+    def values(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return list(self.guilds.values())
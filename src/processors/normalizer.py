@@ -0,0 +1,138 @@
+"""
+Single-pass guild normalization.
+
+``normalize_guild(raw)`` is equivalent to
+``sanitize_guild(parse_guild(raw))`` but does the work in one pass over
+a declarative field schema and produces a compact :class:`Guild`
+record instead of two intermediate dicts. The per-field code is
+generated once at import time, so the hot loop has no schema lookups,
+membership tests or per-guild logging.
+"""
+from typing import Any, Callable, Dict, Iterable, Iterator, NamedTuple, Optional, Tuple
+
+from processors.sanitizer import _coerce_bool, _coerce_int, _coerce_list, _coerce_str
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+class FieldSpec(NamedTuple):
+    name: str
+    coerce: Optional[Callable[[Any], Any]]
+    # Looked up in order when ``name`` itself is absent from the payload.
+    aliases: Tuple[str, ...] = ()
+
+SCHEMA: Tuple[FieldSpec, ...] = (
+    FieldSpec("id", _coerce_str, ("guild_id", "objectID")),
+    FieldSpec("name", _coerce_str),
+    FieldSpec("description", _coerce_str),
+    FieldSpec("icon", _coerce_str),
+    FieldSpec("splash", _coerce_str),
+    FieldSpec("banner", _coerce_str),
+    FieldSpec("approximate_presence_count", _coerce_int),
+    FieldSpec("approximate_member_count", _coerce_int),
+    FieldSpec("premium_subscription_count", _coerce_int),
+    FieldSpec("preferred_locale", _coerce_str),
+    FieldSpec("auto_removed", _coerce_bool),
+    FieldSpec("discovery_splash", _coerce_str),
+    FieldSpec("primary_category_id", _coerce_int),
+    FieldSpec("vanity_url_code", _coerce_str),
+    FieldSpec("is_published", _coerce_bool),
+    FieldSpec("keywords", _coerce_list, ("discovery_keywords",)),
+    FieldSpec("features", _coerce_list),
+    FieldSpec("categories", _coerce_list),
+    FieldSpec("primary_category", None),
+    # objectID falls back to whatever the id resolved to.
+    FieldSpec("objectID", _coerce_str, ("id", "guild_id")),
+)
+
+FIELD_NAMES: Tuple[str, ...] = tuple(spec.name for spec in SCHEMA)
+
+def _compile_to_dict() -> Callable[[Any], Dict[str, Any]]:
+    lines = ["def to_dict(self):", "    d = {}"]
+    for name in FIELD_NAMES:
+        lines.append(f"    v = self.{name}")
+        lines.append("    if v is not None:")
+        lines.append(f"        d[{name!r}] = v")
+    lines.append("    return d")
+    namespace: Dict[str, Any] = {}
+    exec("\n".join(lines), namespace)  # noqa: S102 - source is built from SCHEMA only
+    to_dict = namespace["to_dict"]
+    to_dict.__doc__ = "Plain dict of the fields that are set."
+    return to_dict
+
+class Guild:
+    """
+    Normalized guild record. Absent or invalid fields are ``None``.
+    """
+
+    __slots__ = FIELD_NAMES
+
+    def __init__(self, **fields: Any) -> None:
+        for name in FIELD_NAMES:
+            setattr(self, name, fields.pop(name, None))
+        if fields:
+            raise TypeError(f"Unknown guild fields: {', '.join(sorted(fields))}")
+
+    # Generated over the slots, like normalize_guild below.
+    to_dict = _compile_to_dict()
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Guild):
+            return NotImplemented
+        return all(getattr(self, n) == getattr(other, n) for n in FIELD_NAMES)
+
+    def __repr__(self) -> str:
+        return f"Guild(id={self.id!r}, name={self.name!r})"  # type: ignore[attr-defined]
+
+_MISSING = object()
+
+# Fast paths skip the coercer when the value already has the target type.
+_FAST_PATHS = {
+    _coerce_str: "v = v.strip() if v.__class__ is str else _coerce_str(v)",
+    _coerce_int: "if v.__class__ is not int: v = _coerce_int(v)",
+    _coerce_bool: "if v.__class__ is not bool: v = _coerce_bool(v)",
+    _coerce_list: "if v.__class__ is not list: v = _coerce_list(v)",
+}
+
+def _compile() -> Callable[[Dict[str, Any]], Guild]:
+    lines = ["def normalize_guild(raw):", "    g = _new(Guild)"]
+    for spec in SCHEMA:
+        if spec.aliases:
+            lines.append(f"    v = raw.get({spec.name!r}, _MISSING)")
+            indent = "    "
+            for alias in spec.aliases:
+                lines.append(f"{indent}if v is _MISSING:")
+                indent += "    "
+                lines.append(f"{indent}v = raw.get({alias!r}, _MISSING)")
+            lines.append("    if v is _MISSING:")
+            lines.append("        v = None")
+        else:
+            lines.append(f"    v = raw.get({spec.name!r})")
+        if spec.coerce is not None:
+            lines.append("    if v is not None:")
+            lines.append(f"        {_FAST_PATHS[spec.coerce]}")
+        lines.append(f"    g.{spec.name} = v")
+    lines.append("    return g")
+
+    namespace: Dict[str, Any] = {
+        "Guild": Guild,
+        "_new": object.__new__,
+        "_MISSING": _MISSING,
+        "_coerce_str": _coerce_str,
+        "_coerce_int": _coerce_int,
+        "_coerce_bool": _coerce_bool,
+        "_coerce_list": _coerce_list,
+    }
+    exec("\n".join(lines), namespace)  # noqa: S102 - source is built from SCHEMA only
+    return namespace["normalize_guild"]
+
+normalize_guild = _compile()
+normalize_guild.__doc__ = "Normalize one raw guild payload into a :class:`Guild`."
+
+def iter_normalize_guilds(raw_guilds: Iterable[Any]) -> Iterator[Guild]:
+    """
+    Lazily normalize raw guild objects, skipping anything that is not a dict.
+    """
+    for g in raw_guilds:
+        if isinstance(g, dict):
+            yield normalize_guild(g)
@@ -1,4 +1,4 @@
-from typing import Any, Dict, Iterable, List
+from typing import Any, Dict, Iterable, Iterator, List
 
 from utils.logger import get_logger
 
@@ -59,11 +59,19 @@ def parse_guild(raw: Dict[str, Any]) -> Dict[str, Any]:
     logger.debug("Parsed guild with id=%s", parsed.get("id"))
     return parsed
 
+def iter_parse_guilds(raw_guilds: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """
+    Lazily parse raw guild objects, skipping anything that is not a dict.
+    """
+    for g in raw_guilds:
+        if isinstance(g, dict):
+            yield parse_guild(g)
+
 def parse_guilds(raw_guilds: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """
     Parse a collection of raw guild objects.
     """
-    parsed_list = [parse_guild(g) for g in raw_guilds if isinstance(g, dict)]
+    parsed_list = list(iter_parse_guilds(raw_guilds))
     logger.info("Parsed %d guilds from raw data", len(parsed_list))
     return parsed_list
 
@@ -1,4 +1,4 @@
-from typing import Any, Dict, Iterable, List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional
 
 from utils.logger import get_logger
 
@@ -84,7 +84,14 @@ def sanitize_guild(guild: Dict[str, Any]) -> Dict[str, Any]:
     logger.debug("Sanitized guild id=%s", cleaned.get("id"))
     return cleaned
 
+def iter_sanitize_guilds(guilds: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """
+    Lazily sanitize guilds one at a time.
+    """
+    for g in guilds:
+        yield sanitize_guild(g)
+
 def sanitize_guilds(guilds: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    sanitized_list = [sanitize_guild(g) for g in guilds]
+    sanitized_list = list(iter_sanitize_guilds(guilds))
     logger.info("Sanitized %d guilds", len(sanitized_list))
     return sanitized_list
\ No newline at end of file
@@ -0,0 +1,230 @@
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from utils.codec import CODEC, DecodeError
+from utils.logger import get_logger
+from utils.metrics import METRICS
+
+logger = get_logger(__name__)
+
+_BUDGET_TOKENS = METRICS.gauge("scheduler_budget_requests", "Discovery requests left in the hourly budget.")
+_DUE_KEYWORDS = METRICS.gauge("scheduler_due_keywords", "Keywords due for a refresh.")
+_REFRESHES = METRICS.counter("scheduler_refreshes_total", "Keyword refreshes run by the daemon.")
+
+class KeywordState:
+    """
+    Refresh bookkeeping for one keyword.
+    """
+
+    __slots__ = ("next_due", "interval", "churn", "pages", "snapshot", "pending", "pending_pages")
+
+    def __init__(self, interval: float, next_due: float = 0.0) -> None:
+        self.next_due = next_due
+        self.interval = interval
+        self.churn: Optional[float] = None
+        self.pages = 0
+        # guild id -> member count from the last completed pass.
+        self.snapshot: Optional[Dict[str, Optional[int]]] = None
+        # Results of the pass in progress.
+        self.pending: Dict[str, Optional[int]] = {}
+        self.pending_pages = 0
+
+def measure_churn(
+    before: Dict[str, Optional[int]],
+    after: Dict[str, Optional[int]],
+    drift_scale: float = 10.0,
+) -> float:
+    """
+    Churn between two passes over a keyword, in ``[0, 1]``.
+
+    The share of result ids that are new, plus the mean relative
+    member-count drift of the ids present in both passes weighted by the
+    remaining share. A ``1 / drift_scale`` average drift counts as full
+    churn.
+    """
+    if not after:
+        return 0.0 if not before else 1.0
+    new_share = sum(1 for gid in after if gid not in before) / len(after)
+    drifts = []
+    for gid, members in after.items():
+        previous = before.get(gid)
+        if members is not None and previous:
+            drifts.append(abs(members - previous) / previous)
+    drift = min(1.0, drift_scale * sum(drifts) / len(drifts)) if drifts else 0.0
+    return new_share + (1 - new_share) * drift
+
+class ChurnScheduler:
+    """
+    Decides which keywords to refresh, and when, from observed churn.
+
+    A keyword's refresh interval slides between ``min_interval`` and
+    ``max_interval`` with a smoothed churn score: keywords whose results
+    change every pass are revisited quickly, stable ones rarely.
+    Refreshes draw on a token bucket of ``requests_per_hour`` page
+    requests, each keyword costing as many pages as its previous pass;
+    when the budget is short, the due keywords with the highest churn go
+    first. State persists across restarts; result snapshots do not, so
+    the first pass after a restart only re-establishes the baseline.
+    """
+
+    def __init__(
+        self,
+        keywords: Iterable[str],
+        min_interval: float = 900.0,
+        max_interval: float = 86400.0,
+        requests_per_hour: float = 3600.0,
+        default_cost: int = 3,
+        smoothing: float = 0.5,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.min_interval = max(1.0, min_interval)
+        self.max_interval = max(self.min_interval, max_interval)
+        self.capacity = max(1.0, requests_per_hour)
+        self.default_cost = max(1, default_cost)
+        self.smoothing = min(max(smoothing, 0.0), 1.0)
+        self._clock = clock
+        self.tokens = self.capacity
+        self._refilled_at = clock()
+        self.states: Dict[str, KeywordState] = {
+            k: KeywordState(self.min_interval) for k in keywords
+        }
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        elapsed = max(0.0, now - self._refilled_at)
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.capacity / 3600.0)
+        self._refilled_at = now
+        _BUDGET_TOKENS.set(self.tokens)
+
+    def cost(self, keyword: str) -> int:
+        pages = self.states[keyword].pages or self.default_cost
+        return int(min(pages, self.capacity))
+
+    def _priority(self, keyword: str) -> Any:
+        state = self.states[keyword]
+        # Unknown churn ranks first so every keyword gets a baseline.
+        churn = state.churn if state.churn is not None else 2.0
+        return -churn, state.next_due
+
+    def plan(self, limit: Optional[int] = None) -> List[str]:
+        """
+        Reserve budget for the keywords to refresh now, most churn first.
+        """
+        now = self._clock()
+        with self._lock:
+            self._refill(now)
+            due = [k for k, s in self.states.items() if s.next_due <= now]
+            _DUE_KEYWORDS.set(len(due))
+            due.sort(key=self._priority)
+            batch: List[str] = []
+            for keyword in due:
+                if limit is not None and len(batch) >= limit:
+                    break
+                cost = self.cost(keyword)
+                if cost > self.tokens:
+                    break
+                self.tokens -= cost
+                batch.append(keyword)
+            _BUDGET_TOKENS.set(self.tokens)
+        return batch
+
+    def observe(self, keyword: str, guilds: List[Dict[str, Any]]) -> None:
+        """
+        Record one fetched page of ``keyword``'s results for the current pass.
+        """
+        with self._lock:
+            state = self.states.get(keyword)
+            if state is None:
+                return
+            state.pending_pages += 1
+            for guild in guilds:
+                gid = guild.get("id")
+                if gid is not None:
+                    state.pending[gid] = guild.get("approximate_member_count")
+
+    def finish(self, keywords: Iterable[str]) -> None:
+        """
+        Close the current pass of ``keywords`` and reschedule them.
+        """
+        now = self._clock()
+        with self._lock:
+            for keyword in keywords:
+                state = self.states[keyword]
+                # Settle the reservation against the pages actually fetched.
+                self.tokens += self.cost(keyword) - state.pending_pages
+                _REFRESHES.inc()
+                if not state.pending_pages:
+                    # A failed or empty pass says nothing about churn; keep
+                    # the last snapshot and interval as the baseline.
+                    state.next_due = now + state.interval
+                    state.pending = {}
+                    continue
+                if state.snapshot is not None:
+                    churn = measure_churn(state.snapshot, state.pending)
+                    state.churn = churn if state.churn is None else (
+                        self.smoothing * churn + (1 - self.smoothing) * state.churn
+                    )
+                churn = state.churn if state.churn is not None else 1.0
+                state.interval = self.max_interval - (self.max_interval - self.min_interval) * churn
+                state.next_due = now + state.interval
+                state.pages = state.pending_pages
+                state.snapshot, state.pending, state.pending_pages = state.pending, {}, 0
+            self.tokens = min(self.capacity, max(-self.capacity, self.tokens))
+            _BUDGET_TOKENS.set(self.tokens)
+
+    def seconds_until_next(self) -> float:
+        """
+        Time until a keyword is due and affordable.
+        """
+        now = self._clock()
+        with self._lock:
+            self._refill(now)
+            if not self.states:
+                return self.max_interval
+            keyword, state = min(self.states.items(), key=lambda item: item[1].next_due)
+            wait = max(0.0, state.next_due - now)
+            shortfall = self.cost(keyword) - self.tokens
+            if shortfall > 0:
+                wait = max(wait, shortfall * 3600.0 / self.capacity)
+            return wait
+
+    def save(self, path: Path) -> None:
+        path = Path(path)
+        with self._lock:
+            state = {
+                k: {"next_due": s.next_due, "interval": s.interval, "churn": s.churn, "pages": s.pages}
+                for k, s in self.states.items()
+            }
+        tmp_path = path.with_name(path.name + ".tmp")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with tmp_path.open("wb") as f:
+            f.write(CODEC.dumps(state))
+        os.replace(tmp_path, path)
+
+    def load(self, path: Path) -> None:
+        """
+        Restore intervals and churn for keywords still in the list.
+        """
+        path = Path(path)
+        if not path.exists():
+            return
+        try:
+            with path.open("rb") as f:
+                saved = CODEC.loads(f.read())
+        except (OSError, DecodeError) as exc:
+            logger.warning("Ignoring unreadable schedule %s: %s", path, exc)
+            return
+        restored = 0
+        for keyword, entry in saved.items():
+            state = self.states.get(keyword)
+            if state is None:
+                continue
+            state.next_due = float(entry.get("next_due", 0.0))
+            state.interval = float(entry.get("interval", self.min_interval))
+            state.churn = entry.get("churn")
+            state.pages = int(entry.get("pages", 0))
+            restored += 1
+        logger.info("Restored schedule for %d keywords from %s", restored, path)
@@ -0,0 +1,237 @@
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from client.fanout import FanoutPlanner
+from client.novelty import NoveltyTracker
+from client.paginator import DiscoveryPaginator
+from processors.collector import GuildCollector
+from processors.normalizer import iter_normalize_guilds
+from storage.archive import PageArchive
+from utils.checkpoint import Checkpoint
+from utils.keyword_source import KeywordYields
+from utils.logger import get_logger
+from utils.metrics import METRICS
+from utils.profiling import PROFILER
+from utils.request_handler import RequestError
+
+logger = get_logger(__name__)
+
+_FETCH_SECONDS = METRICS.histogram(
+    "stage_seconds", "Per-page time spent in each scrape stage.", stage="fetch"
+)
+_NORMALIZE_SECONDS = METRICS.histogram("stage_seconds", stage="normalize")
+_MERGE_SECONDS = METRICS.histogram("stage_seconds", stage="merge")
+_KEYWORD_SECONDS = METRICS.histogram("keyword_seconds", "Wall time per completed keyword.")
+_KEYWORDS_COMPLETED = METRICS.counter("keywords_total", "Keywords processed.", outcome="completed")
+_KEYWORDS_FAILED = METRICS.counter("keywords_total", outcome="failed")
+_FANOUT_SUBQUERIES = METRICS.counter(
+    "fanout_subqueries_total", "Per-category subqueries issued for saturated keywords."
+)
+
+class QueryStats:
+    """
+    Outcome of paginating one (keyword, category) query.
+    """
+
+    __slots__ = ("raw", "parsed", "new", "saturated", "categories", "fetch_seconds", "process_seconds")
+
+    def __init__(self) -> None:
+        self.raw = 0
+        self.parsed = 0
+        self.new = 0
+        self.saturated = False
+        self.categories: Counter = Counter()
+        self.fetch_seconds = 0.0
+        self.process_seconds = 0.0
+
+    def add(self, other: "QueryStats") -> None:
+        self.raw += other.raw
+        self.parsed += other.parsed
+        self.new += other.new
+        self.fetch_seconds += other.fetch_seconds
+        self.process_seconds += other.process_seconds
+
+class KeywordScraper:
+    """
+    Scrapes keywords page by page into a shared :class:`GuildCollector`.
+
+    Each page is normalized outside the collector lock and merged as soon
+    as it arrives. Optional collaborators extend the basic loop:
+
+    - ``checkpoint`` records the next offset after every page so an
+      interrupted keyword can be resumed, and is saved (at most every
+      checkpoint interval) with the sizes returned by ``flush``, which
+      makes the outputs durable;
+    - ``novelty_factory`` builds a per-query :class:`NoveltyTracker` that
+      stops pagination once pages stop contributing new guilds;
+    - ``fanout`` splits keywords that saturate ``max_results`` into
+      per-category subqueries run concurrently;
+    - ``yields`` records how many new guilds each keyword contributed,
+      for prioritizing the next run;
+    - ``on_page`` is called with the keyword and every sanitized page,
+      including the pages of its category subqueries;
+    - ``archive`` keeps every raw page for offline replay.
+
+    A single instance is shared by all keyword workers.
+    """
+
+    def __init__(
+        self,
+        paginator: DiscoveryPaginator,
+        collector: GuildCollector,
+        results_per_page: int = 100,
+        max_results: int = 300,
+        category_id: Optional[int] = None,
+        checkpoint: Optional[Checkpoint] = None,
+        novelty_factory: Optional[Callable[[], NoveltyTracker]] = None,
+        fanout: Optional[FanoutPlanner] = None,
+        yields: Optional[KeywordYields] = None,
+        on_page: Optional[Callable[[str, List[Dict[str, Any]]], None]] = None,
+        archive: Optional[PageArchive] = None,
+        flush: Optional[Callable[[], Dict[str, int]]] = None,
+    ) -> None:
+        self.paginator = paginator
+        self.collector = collector
+        self.results_per_page = max(1, min(results_per_page, 100))
+        self.max_results = max(1, max_results)
+        self.category_id = category_id
+        self.checkpoint = checkpoint
+        self.novelty_factory = novelty_factory
+        self.fanout = fanout
+        self.yields = yields
+        self.on_page = on_page
+        self.archive = archive
+        self.flush = flush
+
+    def _snapshot(self) -> Tuple[List[str], Dict[str, int]]:
+        return self.collector.sync(self.flush)
+
+    def save_checkpoint(self, force: bool = False) -> None:
+        """
+        Save the checkpoint now, or only if its interval has elapsed.
+        """
+        if self.checkpoint is None:
+            return
+        if force:
+            self.checkpoint.save(self._snapshot)
+        else:
+            self.checkpoint.maybe_save(self._snapshot)
+
+    def _run_query(self, keyword: str, category_id: Optional[int], key: str) -> QueryStats:
+        stats = QueryStats()
+        novelty = self.novelty_factory() if self.novelty_factory else None
+        start_offset = self.checkpoint.resume_offset(key) if self.checkpoint else 0
+        if start_offset:
+            logger.info("Resuming '%s' from offset %d", key, start_offset)
+
+        mark = time.perf_counter()
+        for offset, page in self.paginator.iter_pages(
+            keyword=keyword,
+            limit_per_page=self.results_per_page,
+            max_results=self.max_results,
+            category_id=category_id,
+            start_offset=start_offset,
+            novelty=novelty,
+        ):
+            fetched = time.perf_counter()
+            _FETCH_SECONDS.record(fetched - mark)
+            stats.fetch_seconds += fetched - mark
+            if self.archive is not None:
+                self.archive.write(keyword, category_id, offset, page)
+
+            # Normalize a single page outside the collector lock so workers
+            # never wait on each other's CPU work.
+            with PROFILER.stage("normalize"):
+                sanitized = [g.to_dict() for g in iter_normalize_guilds(page)]
+            normalized = time.perf_counter()
+            _NORMALIZE_SECONDS.record(normalized - fetched)
+
+            with PROFILER.stage("merge"):
+                new_count = self.collector.add(sanitized)
+            if novelty is not None:
+                novelty.record(new_count, len(sanitized))
+            if self.fanout is not None:
+                self.fanout.observe(stats.categories, sanitized)
+            if self.on_page is not None:
+                self.on_page(keyword, sanitized)
+            stats.raw += len(page)
+            stats.parsed += len(sanitized)
+            stats.new += new_count
+            if self.checkpoint is not None:
+                self.checkpoint.record_page(key, offset + len(page))
+                self.save_checkpoint()
+
+            mark = time.perf_counter()
+            _MERGE_SECONDS.record(mark - normalized)
+            stats.process_seconds += mark - fetched
+
+        stats.saturated = start_offset + stats.raw >= self.max_results
+        return stats
+
+    def _run_subquery(self, keyword: str, category_id: int) -> Optional[QueryStats]:
+        key = f"{keyword} [category {category_id}]"
+        if self.checkpoint is not None and self.checkpoint.is_completed(key):
+            return None
+        _FANOUT_SUBQUERIES.inc()
+        try:
+            stats = self._run_query(keyword, category_id, key)
+        except RequestError as exc:
+            logger.error("Network error while scraping '%s': %s", key, exc)
+            return None
+        except Exception as exc:  # noqa: BLE001
+            logger.exception("Unexpected error while scraping '%s': %s", key, exc)
+            return None
+        if self.checkpoint is not None:
+            self.checkpoint.mark_completed(key)
+        return stats
+
+    def scrape(self, keyword: str) -> None:
+        """
+        Scrape a single keyword and merge its sanitized guilds.
+
+        Errors are logged and swallowed so that one failing keyword never
+        aborts the rest of the run. Pages are merged as they arrive, so a
+        keyword that fails part way keeps the guilds of the pages fetched
+        before the error, although it is counted as failed, is not marked
+        completed and records no yield.
+        """
+        logger.info("Starting scrape for keyword '%s'", keyword)
+        started = time.perf_counter()
+        try:
+            stats = self._run_query(keyword, self.category_id, keyword)
+        except RequestError as exc:
+            logger.error("Network error while scraping keyword '%s': %s", keyword, exc)
+            _KEYWORDS_FAILED.inc()
+            return
+        except Exception as exc:  # noqa: BLE001
+            logger.exception("Unexpected error while scraping keyword '%s': %s", keyword, exc)
+            _KEYWORDS_FAILED.inc()
+            return
+
+        if self.fanout is not None and self.category_id is None and stats.saturated:
+            category_ids = self.fanout.plan(keyword, stats.categories)
+            for sub in self.fanout.run(lambda cid: self._run_subquery(keyword, cid), category_ids):
+                if sub is not None:
+                    stats.add(sub)
+
+        if self.checkpoint is not None:
+            self.checkpoint.mark_completed(keyword)
+        if self.yields is not None:
+            self.yields.record(keyword, stats.new)
+
+        elapsed = time.perf_counter() - started
+        _KEYWORD_SECONDS.record(elapsed)
+        _KEYWORDS_COMPLETED.inc()
+        logger.info(
+            "Finished keyword '%s': %d raw, %d parsed, %d new, %d unique total "
+            "(%.2fs: %.2fs network, %.2fs processing)",
+            keyword,
+            stats.raw,
+            stats.parsed,
+            stats.new,
+            len(self.collector),
+            elapsed,
+            stats.fetch_seconds,
+            stats.process_seconds,
+        )
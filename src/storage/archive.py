@@ -0,0 +1,150 @@
+"""
+Append-only archive of raw discovery pages.
+
+Every fetched page is kept as one NDJSON record::
+
+    {"keyword": ..., "category_id": ..., "offset": ..., "fetched_at": ...,
+     "run": ..., "body": [...]}
+
+where ``body`` is the list of raw, not yet normalized guild objects the
+search endpoint returned for that page. It is the ``guilds`` list taken
+from the response (the rest of the envelope is not kept), cut to
+``max_results`` like the live run, so a replay sees exactly the guilds
+the live run saw. ``run`` is the time the archiving run started; a
+chunk only ever holds pages of one run. Records go to gzip-compressed
+chunk files of at most ``chunk_pages`` pages, named ``<prefix>-<n>.ndjson.gz`` with ``n``
+continuing after the highest chunk already in the directory, so runs
+only ever add files. Replaying the chunks through the normalizer
+rebuilds the output after a schema change without touching the network.
+"""
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from processors.normalizer import iter_normalize_guilds
+from storage.ndjson_sink import NDJSONSink, read_ndjson
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_CHUNK_SUFFIX = ".ndjson.gz"
+
+def list_chunks(directory: Path) -> List[Path]:
+    """
+    Finished chunk files in ``directory``, oldest first within each prefix.
+    """
+    directory = Path(directory)
+    if not directory.is_dir():
+        return []
+    leftovers = sorted(directory.glob(f"*{_CHUNK_SUFFIX}.part"))
+    if leftovers:
+        logger.warning("Skipping %d unfinished archive chunks in %s", len(leftovers), directory)
+    return sorted(directory.glob(f"*{_CHUNK_SUFFIX}"))
+
+def iter_records(path: Path) -> Iterator[Dict[str, Any]]:
+    """
+    Stream the page records of one chunk.
+    """
+    return read_ndjson(path)
+
+def _chunk_key(path: Path) -> Tuple[float, float]:
+    # Chunks written before records carried a run count as runs of their own.
+    for record in iter_records(path):
+        fetched_at = float(record.get("fetched_at") or 0.0)
+        return -float(record.get("run") or fetched_at), fetched_at
+    return 0.0, 0.0
+
+def replay_order(chunks: List[Path]) -> List[Path]:
+    """
+    Order chunks newest run first, and oldest page first within a run.
+
+    Replay keeps the first sighting of each guild, like a live run, so
+    this makes a single run replay exactly as it ran while a later run
+    still wins over earlier ones. Concurrent shard runs keep no
+    particular order among themselves.
+    """
+    return sorted(chunks, key=lambda p: (_chunk_key(p), p.name))
+
+def normalize_chunk(path: Path) -> List[Dict[str, Any]]:
+    """
+    Sanitized guilds of every page in a chunk, in archive order.
+
+    Runs in replay worker processes, so it only takes and returns
+    picklable values.
+    """
+    guilds: List[Dict[str, Any]] = []
+    for record in iter_records(path):
+        guilds.extend(g.to_dict() for g in iter_normalize_guilds(record.get("body") or []))
+    return guilds
+
+class PageArchive:
+    """
+    Thread-safe writer rotating through chunk files of ``chunk_pages`` pages.
+
+    Each chunk is written by an :class:`NDJSONSink`, so the scrape loop
+    only pays for a queue put; a chunk becomes visible under its final
+    name once it is full or the archive is closed.
+    """
+
+    def __init__(self, directory: Path, chunk_pages: int = 500, prefix: str = "chunk") -> None:
+        self.directory = Path(directory)
+        self.chunk_pages = max(1, chunk_pages)
+        self.prefix = prefix
+        self.pages = 0
+        self.run = time.time()
+        # Unfinished chunks of a crashed run count too, so they are never overwritten.
+        self._pattern = re.compile(rf"^{re.escape(prefix)}-(\d+){re.escape(_CHUNK_SUFFIX)}(\.part)?$")
+        self._lock = threading.Lock()
+        self._sink: Optional[NDJSONSink] = None
+        self._in_chunk = 0
+        self.directory.mkdir(parents=True, exist_ok=True)
+        matches = (self._pattern.match(p.name) for p in self.directory.iterdir())
+        self._next_index = 1 + max((int(m.group(1)) for m in matches if m), default=0)
+
+    def _open_chunk(self) -> NDJSONSink:
+        path = self.directory / f"{self.prefix}-{self._next_index:06d}{_CHUNK_SUFFIX}"
+        self._next_index += 1
+        self._in_chunk = 0
+        return NDJSONSink(path, compression="gzip")
+
+    def write(
+        self,
+        keyword: str,
+        category_id: Optional[int],
+        offset: int,
+        body: List[Dict[str, Any]],
+    ) -> None:
+        record = {
+            "keyword": keyword,
+            "category_id": category_id,
+            "offset": offset,
+            "fetched_at": time.time(),
+            "run": self.run,
+            "body": body,
+        }
+        with self._lock:
+            if self._sink is None:
+                self._sink = self._open_chunk()
+            self._sink.write(record)
+            self._in_chunk += 1
+            self.pages += 1
+            if self._in_chunk >= self.chunk_pages:
+                sink, self._sink = self._sink, None
+                sink.close()
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._sink is not None:
+                self._sink.flush()
+
+    def close(self) -> None:
+        """
+        Finish the current chunk; a partly filled chunk is kept as is.
+        """
+        with self._lock:
+            if self._sink is not None:
+                sink, self._sink = self._sink, None
+                sink.close()
+        logger.info("Archived %d raw pages in %s", self.pages, self.directory)
@@ -0,0 +1,197 @@
+import hashlib
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from processors.normalizer import FIELD_NAMES
+from storage.ndjson_sink import NDJSONSink, read_ndjson
+from utils.codec import CODEC, DecodeError
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Hashes are 48-bit so they survive any JSON decoder as plain integers.
+_DIGEST_SIZE = 6
+_MISSING = 0
+
+def _value_hash(value: Any) -> int:
+    if value is None:
+        return _MISSING
+    data = value.encode("utf-8") if isinstance(value, str) else CODEC.dumps(value)
+    digest = hashlib.blake2b(data, digest_size=_DIGEST_SIZE).digest()
+    return int.from_bytes(digest, "big") or 1
+
+def field_hashes(guild: Dict[str, Any]) -> List[int]:
+    """
+    Return one content hash per schema field, ``0`` for absent fields.
+    """
+    return [_value_hash(guild.get(name)) for name in FIELD_NAMES]
+
+def load_index(path: Path) -> Dict[str, List[int]]:
+    """
+    Read a delta index written by :class:`DeltaSink`; missing means empty.
+    """
+    path = Path(path)
+    if not path.exists():
+        logger.info("No delta index at %s; every guild will be reported as added.", path)
+        return {}
+    try:
+        with path.open("rb") as f:
+            state = CODEC.loads(f.read())
+    except (OSError, DecodeError) as exc:
+        logger.error("Failed to read delta index %s: %s", path, exc)
+        raise SystemExit("Unable to read delta index") from exc
+    if list(state.get("fields", [])) != list(FIELD_NAMES):
+        # Hashes are positional; a schema change invalidates all of them.
+        logger.warning("Delta index %s uses a different schema; starting a fresh baseline.", path)
+        return {}
+    return state.get("guilds", {})
+
+class DeltaSink:
+    """
+    Sink that reports what changed since the previous run.
+
+    Keeps a persistent index of guild id to per-field content hashes.
+    Each guild written is compared against the previous index as it
+    arrives and one changeset line is streamed to ``changes_path``:
+
+    - ``{"op": "added", "id": ..., "guild": {...}}``
+    - ``{"op": "updated", "id": ..., "changes": {field: value}}`` where a
+      field that disappeared maps to ``null``
+    - ``{"op": "removed", "id": ...}`` for ids of the previous run that
+      were not seen again, emitted on :meth:`close`
+
+    Unchanged guilds produce no output. The updated index replaces the
+    old one atomically on a finalized :meth:`close`; an interrupted run
+    leaves the previous index untouched and reports no removals. With
+    ``partial`` the run is known to cover only some keywords, so unseen
+    guilds stay in the index instead of being reported as removed.
+    """
+
+    def __init__(
+        self,
+        index_path: Path,
+        changes_path: Path,
+        compression: Optional[str] = None,
+        append: bool = False,
+        partial: bool = False,
+        truncate: Optional[int] = None,
+    ) -> None:
+        self.index_path = Path(index_path)
+        self.partial = partial
+        self.previous = load_index(self.index_path)
+        self.current: Dict[str, List[int]] = {}
+        self.counts = {"added": 0, "updated": 0, "removed": 0, "unchanged": 0}
+        self._changes = NDJSONSink(
+            changes_path, compression=compression, append=append, truncate=truncate
+        )
+        self._lock = threading.Lock()
+
+    @property
+    def changes_path(self) -> Path:
+        return self._changes.path
+
+    def write(self, guild: Dict[str, Any]) -> None:
+        gid = guild.get("id")
+        if gid is None:
+            return
+        hashes = field_hashes(guild)
+        with self._lock:
+            self.current[gid] = hashes
+            old = self.previous.get(gid)
+            if old is None:
+                op = "added"
+                self._changes.write({"op": op, "id": gid, "guild": guild})
+            elif old != hashes:
+                op = "updated"
+                changes = {
+                    name: guild.get(name)
+                    for name, before, after in zip(FIELD_NAMES, old, hashes)
+                    if before != after
+                }
+                self._changes.write({"op": op, "id": gid, "changes": changes})
+            else:
+                op = "unchanged"
+            self.counts[op] += 1
+
+    def prime(self, ids: Iterable[str]) -> None:
+        """
+        Carry ids already reported by an interrupted run into the index.
+
+        Their changes are in the appended changeset already, so added and
+        updated guilds get their new hashes back from it; the rest keep
+        their previous hashes so they are not reported as removed.
+        """
+        replayed = self._replay_changes()
+        with self._lock:
+            for gid in ids:
+                if gid in self.current:
+                    continue
+                if gid in replayed:
+                    op, hashes = replayed[gid]
+                else:
+                    op, hashes = "unchanged", self.previous.get(gid)
+                    if hashes is None:
+                        continue
+                self.counts[op] += 1
+                self.current[gid] = hashes
+
+    def _replay_changes(self) -> Dict[str, Tuple[str, List[int]]]:
+        """
+        Op and new hashes of each guild in the changeset written so far.
+        """
+        replayed: Dict[str, Tuple[str, List[int]]] = {}
+        part_path = self._changes.part_path
+        if not part_path.exists():
+            return replayed
+        for record in read_ndjson(part_path):
+            gid, op = record.get("id"), record.get("op")
+            if op == "added":
+                replayed[gid] = (op, field_hashes(record.get("guild") or {}))
+            elif op == "updated":
+                hashes = list(self.previous.get(gid) or [_MISSING] * len(FIELD_NAMES))
+                changes = record.get("changes") or {}
+                for i, name in enumerate(FIELD_NAMES):
+                    if name in changes:
+                        hashes[i] = _value_hash(changes[name])
+                replayed[gid] = (op, hashes)
+        return replayed
+
+    def flush(self) -> int:
+        return self._changes.flush()
+
+    def close(self, finalize: bool = True) -> None:
+        if not finalize:
+            self._changes.close(finalize=False)
+            return
+
+        with self._lock:
+            for gid, hashes in self.previous.items():
+                if gid in self.current:
+                    continue
+                if self.partial:
+                    self.current[gid] = hashes
+                else:
+                    self._changes.write({"op": "removed", "id": gid})
+                    self.counts["removed"] += 1
+            self._changes.close()
+            self._write_index()
+        logger.info(
+            "Delta: %d added, %d updated, %d removed, %d unchanged -> %s",
+            self.counts["added"],
+            self.counts["updated"],
+            self.counts["removed"],
+            self.counts["unchanged"],
+            self.changes_path,
+        )
+
+    def _write_index(self) -> None:
+        state = {"fields": list(FIELD_NAMES), "guilds": self.current}
+        tmp_path = self.index_path.with_name(self.index_path.name + ".tmp")
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        with tmp_path.open("wb") as f:
+            f.write(CODEC.dumps(state))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.index_path)
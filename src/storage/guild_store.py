@@ -0,0 +1,195 @@
+import sys
+from array import array
+from types import MappingProxyType
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from processors.normalizer import FIELD_NAMES
+
+_INT_FIELDS = (
+    "approximate_presence_count",
+    "approximate_member_count",
+    "premium_subscription_count",
+    "primary_category_id",
+)
+_BOOL_FIELDS = ("auto_removed", "is_published")
+_STR_FIELDS = (
+    "name",
+    "description",
+    "icon",
+    "splash",
+    "banner",
+    "discovery_splash",
+    "vanity_url_code",
+)
+# Low-cardinality strings worth interning.
+_INTERNED_FIELDS = ("preferred_locale",)
+_TUPLE_FIELDS = ("keywords", "features")
+
+_INT_NONE = -(2**63)
+_INT_MAX = 2**63 - 1
+_BOOL_NONE = -1
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, list):
+        return ("__list__",) + tuple(_freeze(v) for v in value)
+    # Keep True, 1 and 1.0 apart; they hash equal.
+    return (type(value).__name__, value)
+
+def _thaw(value: Any) -> Any:
+    if isinstance(value, MappingProxyType):
+        return {k: _thaw(v) for k, v in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(v) for v in value]
+    return value
+
+class CompactGuildStore:
+    """
+    Memory-compact, id-keyed store of sanitized guilds.
+
+    Behaves like a ``dict`` of guild id to sanitized guild dict, but keeps
+    the data column-wise:
+
+    - integer counts and booleans live in ``array`` columns with a
+      sentinel for missing values; the rare integer that does not fit
+      (or equals the sentinel) is kept as is in a per-column overflow
+      dict;
+    - repeated strings (features, keywords, locales) are interned, and
+      identical keyword / feature lists share one tuple;
+    - category objects are stored once per distinct value and shared
+      read-only between guilds;
+    - ``objectID`` shares the id string when the two are equal.
+
+    Records are rebuilt as plain dicts, with the same keys and key order
+    as :func:`processors.sanitizer.sanitize_guild`, on lookup.
+    """
+
+    def __init__(self) -> None:
+        self._index: Dict[str, int] = {}
+        self._ids: List[str] = []
+        self._ints = {name: array("q") for name in _INT_FIELDS}
+        self._int_overflow: Dict[str, Dict[int, Any]] = {name: {} for name in _INT_FIELDS}
+        self._bools = {name: array("b") for name in _BOOL_FIELDS}
+        self._strs: Dict[str, List[Optional[str]]] = {
+            name: [] for name in _STR_FIELDS + _INTERNED_FIELDS + ("objectID",)
+        }
+        self._tuples: Dict[str, List[Optional[Tuple[str, ...]]]] = {name: [] for name in _TUPLE_FIELDS}
+        self._categories: List[Optional[Tuple[Any, ...]]] = []
+        self._primary: List[Any] = []
+        self._shared: Dict[Any, Any] = {}
+
+    def _share(self, value: Any) -> Any:
+        """
+        Return one canonical read-only object per distinct JSON value.
+        """
+        key = _freeze(value)
+        shared = self._shared.get(key)
+        if shared is None:
+            if isinstance(value, dict):
+                shared = MappingProxyType({k: self._share(v) for k, v in value.items()})
+            elif isinstance(value, list):
+                shared = tuple(self._share(v) for v in value)
+            elif isinstance(value, str):
+                shared = sys.intern(value)
+            else:
+                shared = value
+            self._shared[key] = shared
+        return shared
+
+    def _share_strings(self, values: Optional[List[Any]]) -> Optional[Tuple[str, ...]]:
+        if values is None:
+            return None
+        if all(isinstance(v, str) for v in values):
+            key = ("__strs__",) + tuple(values)
+            shared = self._shared.get(key)
+            if shared is None:
+                shared = self._shared[key] = tuple(sys.intern(v) for v in values)
+            return shared
+        return self._share(values)
+
+    def __setitem__(self, gid: str, guild: Dict[str, Any]) -> None:
+        gid = guild.get("id", gid)
+        row = self._index.get(gid)
+        if row is None:
+            row = len(self._ids)
+            self._index[gid] = row
+            self._ids.append(gid)
+            for column in self._ints.values():
+                column.append(_INT_NONE)
+            for column in self._bools.values():
+                column.append(_BOOL_NONE)
+            for column in self._strs.values():
+                column.append(None)
+            for column in self._tuples.values():
+                column.append(None)
+            self._categories.append(None)
+            self._primary.append(None)
+
+        for name, column in self._ints.items():
+            value = guild.get(name)
+            overflow = self._int_overflow[name]
+            if value is None or (type(value) is int and _INT_NONE < value <= _INT_MAX):
+                column[row] = _INT_NONE if value is None else value
+                overflow.pop(row, None)
+            else:
+                column[row] = _INT_NONE
+                overflow[row] = value
+        for name, column in self._bools.items():
+            value = guild.get(name)
+            column[row] = _BOOL_NONE if value is None else int(value)
+        for name in _STR_FIELDS:
+            self._strs[name][row] = guild.get(name)
+        for name in _INTERNED_FIELDS:
+            value = guild.get(name)
+            self._strs[name][row] = sys.intern(value) if value is not None else None
+        object_id = guild.get("objectID")
+        self._strs["objectID"][row] = self._ids[row] if object_id == self._ids[row] else object_id
+        for name, column in self._tuples.items():
+            column[row] = self._share_strings(guild.get(name))
+        categories = guild.get("categories")
+        self._categories[row] = self._share(categories) if categories is not None else None
+        primary = guild.get("primary_category")
+        self._primary[row] = self._share(primary) if primary is not None else None
+
+    def _record(self, row: int) -> Dict[str, Any]:
+        values: Dict[str, Any] = {"id": self._ids[row]}
+        for name, column in self._ints.items():
+            value = column[row]
+            values[name] = self._int_overflow[name].get(row) if value == _INT_NONE else value
+        for name, column in self._bools.items():
+            value = column[row]
+            values[name] = None if value == _BOOL_NONE else bool(value)
+        for name, column in self._strs.items():
+            values[name] = column[row]
+        for name, column in self._tuples.items():
+            value = column[row]
+            values[name] = None if value is None else _thaw(value)
+        categories = self._categories[row]
+        values["categories"] = None if categories is None else _thaw(categories)
+        primary = self._primary[row]
+        values["primary_category"] = _thaw(primary)
+
+        return {name: values[name] for name in FIELD_NAMES if values.get(name) is not None}
+
+    def __getitem__(self, gid: str) -> Dict[str, Any]:
+        return self._record(self._index[gid])
+
+    def get(self, gid: str, default: Any = None) -> Any:
+        row = self._index.get(gid)
+        return default if row is None else self._record(row)
+
+    def __contains__(self, gid: object) -> bool:
+        return gid in self._index
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._ids)
+
+    def keys(self) -> List[str]:
+        return list(self._ids)
+
+    def values(self) -> Iterator[Dict[str, Any]]:
+        return (self._record(row) for row in range(len(self._ids)))
@@ -0,0 +1,218 @@
+import gzip
+import io
+import os
+import queue
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterator, Optional
+
+from utils.codec import CODEC, DecodeError
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_SENTINEL = object()
+
+COMPRESSION_SUFFIXES = {None: "", "gzip": ".gz", "zstd": ".zst"}
+_GZIP_MAGIC = b"\x1f\x8b"
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+class SinkError(RuntimeError):
+    """Raised when the background writer fails."""
+
+class _Barrier:
+    """
+    Queue marker answered by the writer once everything before it is synced.
+    """
+
+    __slots__ = ("done", "size")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.size = 0
+
+def _open_compressed(raw: BinaryIO, compression: Optional[str]) -> BinaryIO:
+    if compression is None:
+        return raw
+    if compression == "gzip":
+        return gzip.GzipFile(fileobj=raw, mode="ab")  # type: ignore[return-value]
+    if compression == "zstd":
+        try:
+            import zstandard  # type: ignore[import-not-found]
+        except ImportError as exc:
+            raise SinkError("zstd compression requires the 'zstandard' package") from exc
+        return zstandard.ZstdCompressor().stream_writer(raw, closefd=False)
+    raise SinkError(f"Unsupported compression: {compression}")
+
+def read_ndjson(path: Path) -> Iterator[Dict[str, Any]]:
+    """
+    Stream the records of an NDJSON file, gzip or zstd compressed or not.
+    """
+    path = Path(path)
+    with open(path, "rb") as raw:
+        magic = raw.read(4)
+        raw.seek(0)
+        stream: BinaryIO = raw
+        if magic[:2] == _GZIP_MAGIC:
+            stream = gzip.GzipFile(fileobj=raw, mode="rb")  # type: ignore[assignment]
+        elif magic == _ZSTD_MAGIC:
+            try:
+                import zstandard  # type: ignore[import-not-found]
+            except ImportError as exc:
+                raise SinkError("zstd compression requires the 'zstandard' package") from exc
+            reader = zstandard.ZstdDecompressor().stream_reader(raw, read_across_frames=True)
+            stream = io.BufferedReader(reader)  # type: ignore[arg-type]
+        for lineno, line in enumerate(stream, 1):
+            if not line.strip():
+                continue
+            try:
+                yield CODEC.loads(line)
+            except DecodeError as exc:
+                raise SinkError(f"{path}:{lineno}: malformed record") from exc
+
+class NDJSONSink:
+    """
+    Streams guild records to disk as newline-delimited JSON.
+
+    Records are handed to a background writer thread through a bounded
+    queue, so the scrape loop only pays for a queue put. The writer
+    serializes, optionally compresses, and appends to ``<path>.part``,
+    fsyncing at most every ``fsync_interval`` seconds. :meth:`close`
+    drains the queue and atomically renames the partial file to
+    ``path``; after a crash the ``.part`` file holds everything written
+    up to the last sync.
+
+    :meth:`flush` also ends the current gzip member or zstd frame and
+    returns the size of the partial file, a clean cut point: reopening
+    with ``append`` and ``truncate`` set to that size drops whatever was
+    written after it and continues with a new member.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        compression: Optional[str] = None,
+        fsync_interval: float = 5.0,
+        buffer_size: int = 1024 * 1024,
+        queue_size: int = 10000,
+        append: bool = False,
+        truncate: Optional[int] = None,
+    ) -> None:
+        if compression not in COMPRESSION_SUFFIXES:
+            raise SinkError(f"Unsupported compression: {compression}")
+        self.path = Path(path)
+        self.part_path = self.path.with_name(self.path.name + ".part")
+        self.compression = compression
+        self.fsync_interval = max(0.0, fsync_interval)
+        self.count = 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if append and truncate is not None and self.part_path.exists():
+            size = self.part_path.stat().st_size
+            if size > truncate:
+                logger.info("Dropping %d unsynced bytes from %s", size - truncate, self.part_path)
+                os.truncate(self.part_path, truncate)
+        self._raw = open(self.part_path, "ab" if append else "wb", buffering=0)
+        self._buffered = io.BufferedWriter(self._raw, buffer_size=buffer_size)  # type: ignore[arg-type]
+        self._stream = _open_compressed(self._buffered, compression)
+
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max(1, queue_size))
+        self._error: Optional[BaseException] = None
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="ndjson-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, guild: Dict[str, Any]) -> None:
+        if self._error is not None:
+            raise SinkError(f"NDJSON writer failed: {self._error}") from self._error
+        self._queue.put(guild)
+
+    def flush(self) -> int:
+        """
+        Block until every record written so far is durably on disk.
+
+        Returns the size of the partial file, which ends on a complete
+        gzip member or zstd frame.
+        """
+        barrier = _Barrier()
+        self._queue.put(barrier)
+        barrier.done.wait()
+        if self._error is not None:
+            raise SinkError(f"NDJSON writer failed: {self._error}") from self._error
+        return barrier.size
+
+    def _sync(self, end_frame: bool = False) -> int:
+        if self.compression == "gzip":
+            if end_frame:
+                self._stream.close()
+            else:
+                self._stream.flush(zlib.Z_SYNC_FLUSH)  # type: ignore[call-arg]
+        elif self.compression == "zstd":
+            import zstandard  # type: ignore[import-not-found]
+
+            mode = zstandard.FLUSH_FRAME if end_frame else zstandard.FLUSH_BLOCK
+            self._stream.flush(mode)  # type: ignore[call-arg]
+        self._buffered.flush()
+        os.fsync(self._raw.fileno())
+        size = self._raw.tell()
+        if end_frame and self.compression == "gzip":
+            self._stream = _open_compressed(self._buffered, self.compression)
+        return size
+
+    def _run(self) -> None:
+        last_sync = time.monotonic()
+        try:
+            while True:
+                item = self._queue.get()
+                if item is _SENTINEL:
+                    break
+                if isinstance(item, _Barrier):
+                    item.size = self._sync(end_frame=True)
+                    last_sync = time.monotonic()
+                    item.done.set()
+                    continue
+                self._stream.write(CODEC.dumps(item) + b"\n")
+                # Counted by the writer thread, so concurrent producers need no lock.
+                self.count += 1
+
+                if time.monotonic() - last_sync >= self.fsync_interval:
+                    self._sync()
+                    last_sync = time.monotonic()
+        except BaseException as exc:  # noqa: BLE001
+            logger.error("NDJSON writer for %s failed: %s", self.part_path, exc)
+            self._error = exc
+            # Keep draining so producers never block on a dead writer.
+            while True:
+                item = self._queue.get()
+                if item is _SENTINEL:
+                    break
+                if isinstance(item, _Barrier):
+                    item.done.set()
+
+    def close(self, finalize: bool = True) -> None:
+        """
+        Flush everything and, if ``finalize``, publish the file at ``path``.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_SENTINEL)
+        self._thread.join()
+
+        try:
+            if self._stream is not self._buffered:
+                self._stream.close()
+            self._buffered.flush()
+            os.fsync(self._raw.fileno())
+            self._buffered.close()
+        except OSError as exc:
+            self._error = self._error or exc
+
+        if self._error is not None:
+            raise SinkError(f"NDJSON writer failed: {self._error}") from self._error
+
+        if finalize:
+            os.replace(self.part_path, self.path)
+            logger.info("Saved %d servers to %s", self.count, self.path)
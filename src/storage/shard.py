@@ -0,0 +1,211 @@
+import hashlib
+import heapq
+import os
+import threading
+import time
+from operator import itemgetter
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from storage.ndjson_sink import NDJSONSink
+from utils.codec import CODEC, DecodeError
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# (guild id, observed_at, guild)
+Observation = Tuple[str, float, Dict[str, Any]]
+
+class ShardError(ValueError):
+    """Raised for malformed shard specs or partial files."""
+
+def parse_shard(spec: str) -> Tuple[int, int]:
+    """
+    Parse ``"i/N"`` into ``(i, N)`` with ``0 <= i < N``.
+    """
+    try:
+        index_text, count_text = spec.split("/")
+        index, count = int(index_text), int(count_text)
+    except ValueError as exc:
+        raise ShardError(f"Invalid shard {spec!r}; expected INDEX/COUNT, e.g. 0/4") from exc
+    if count < 1 or not 0 <= index < count:
+        raise ShardError(f"Invalid shard {spec!r}; need 0 <= INDEX < COUNT")
+    return index, count
+
+def shard_for(keyword: str, count: int) -> int:
+    """
+    Stable shard number of ``keyword``; the same on every host and run.
+    """
+    digest = hashlib.blake2b(keyword.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % count
+
+def shard_path(path: Path, shard: Tuple[int, int]) -> Path:
+    """
+    Per-shard variant of a state file, so shards can share a directory.
+    """
+    path = Path(path)
+    index, count = shard
+    return path.with_name(f"{path.stem}.shard-{index}-of-{count}{path.suffix}")
+
+def partial_name(shard: Tuple[int, int]) -> str:
+    index, count = shard
+    return f"part-{index:03d}-of-{count:03d}.ndjson"
+
+def iter_partial(path: Path) -> Iterator[Observation]:
+    """
+    Stream the observations of a partial file, checking they are sorted.
+    """
+    previous: Optional[str] = None
+    with open(path, "rb") as f:
+        for lineno, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                record = CODEC.loads(line)
+                guild = record["guild"]
+                gid = guild["id"]
+                observed_at = float(record["observed_at"])
+            except (DecodeError, KeyError, TypeError, ValueError) as exc:
+                raise ShardError(f"{path}:{lineno}: malformed record") from exc
+            if previous is not None and gid < previous:
+                raise ShardError(f"{path}:{lineno}: ids are not sorted")
+            previous = gid
+            yield gid, observed_at, guild
+
+def merge_observations(sources: Sequence[Iterable[Observation]]) -> Iterator[Observation]:
+    """
+    K-way merge of id-sorted observation streams, one result per id.
+
+    The newest observation wins; on equal timestamps the earliest source
+    wins, so the result only depends on the order of ``sources``.
+    """
+    best: Optional[Observation] = None
+    for observation in heapq.merge(*sources, key=itemgetter(0)):
+        if best is None:
+            best = observation
+        elif observation[0] != best[0]:
+            yield best
+            best = observation
+        elif observation[1] > best[1]:
+            best = observation
+    if best is not None:
+        yield best
+
+def _write_observations(path: Path, observations: Iterable[Observation]) -> int:
+    count = 0
+    with open(path, "wb") as f:
+        for _, observed_at, guild in observations:
+            f.write(CODEC.dumps({"observed_at": observed_at, "guild": guild}))
+            f.write(b"\n")
+            count += 1
+        f.flush()
+        os.fsync(f.fileno())
+    return count
+
+class ShardWriter:
+    """
+    Sink writing one shard's partial output, sorted by guild id.
+
+    Each line is ``{"observed_at": <unix time>, "guild": {...}}``.
+    Records are buffered and spilled as sorted runs of at most
+    ``run_size`` records to ``<path>.run<n>`` files (also on
+    :meth:`flush`, so a checkpoint never references unwritten guilds).
+    Runs are written to a temp file and renamed into place.
+    :meth:`close` merges the runs into ``path``; an interrupted run keeps
+    its run files, and ``append`` picks them up again on resume.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        run_size: int = 100_000,
+        append: bool = False,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.path = Path(path)
+        self.run_size = max(1, run_size)
+        self.count = 0
+        self._clock = clock
+        self._buffer: List[Observation] = []
+        self._runs: List[Path] = []
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        for leftover in self.path.parent.glob(self.path.name + ".run*.tmp"):
+            logger.warning("Removing unfinished run file %s", leftover)
+            leftover.unlink()
+        for stale in self._existing_runs():
+            if append:
+                self._runs.append(stale)
+            else:
+                stale.unlink()
+
+    def _existing_runs(self) -> List[Path]:
+        prefix = self.path.name + ".run"
+        runs = [p for p in self.path.parent.glob(prefix + "*") if p.name[len(prefix):].isdigit()]
+        return sorted(runs, key=lambda p: int(p.name[len(prefix):]))
+
+    def write(self, guild: Dict[str, Any]) -> None:
+        gid = guild.get("id")
+        if gid is None:
+            return
+        with self._lock:
+            self._buffer.append((gid, self._clock(), guild))
+            self.count += 1
+            if len(self._buffer) >= self.run_size:
+                self._spill_locked()
+
+    def _spill_locked(self) -> None:
+        if not self._buffer:
+            return
+        self._buffer.sort(key=itemgetter(0))
+        index = int(self._runs[-1].name.rsplit(".run", 1)[1]) + 1 if self._runs else 0
+        run_path = self.path.with_name(f"{self.path.name}.run{index}")
+        # Publish whole runs only, so a crash mid-spill never leaves a
+        # truncated run for --resume to pick up.
+        tmp_path = run_path.with_name(run_path.name + ".tmp")
+        _write_observations(tmp_path, self._buffer)
+        os.replace(tmp_path, run_path)
+        self._runs.append(run_path)
+        self._buffer = []
+
+    def flush(self) -> None:
+        with self._lock:
+            self._spill_locked()
+
+    def close(self, finalize: bool = True) -> None:
+        with self._lock:
+            self._spill_locked()
+            if not finalize:
+                return
+            part_path = self.path.with_name(self.path.name + ".part")
+            written = _write_observations(
+                part_path, merge_observations([iter_partial(p) for p in self._runs])
+            )
+            os.replace(part_path, self.path)
+            for run in self._runs:
+                run.unlink()
+            self._runs = []
+        logger.info("Wrote %d guilds to shard file %s", written, self.path)
+
+def merge_partials(
+    paths: Sequence[Path],
+    output_path: Path,
+    compression: Optional[str] = None,
+) -> int:
+    """
+    Stream-merge partial shard files into one deduplicated NDJSON output.
+
+    Only one record per input is held in memory at a time. Returns the
+    number of unique guilds written.
+    """
+    sink = NDJSONSink(output_path, compression=compression)
+    try:
+        for _, _, guild in merge_observations([iter_partial(p) for p in paths]):
+            sink.write(guild)
+    except BaseException:
+        sink.close(finalize=False)
+        raise
+    sink.close()
+    logger.info("Merged %d partial files into %d guilds at %s", len(paths), sink.count, sink.path)
+    return sink.count
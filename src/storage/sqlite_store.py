@@ -0,0 +1,264 @@
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from processors.sanitizer import _coerce_bool, _coerce_int
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS guilds (
+    id TEXT PRIMARY KEY,
+    name TEXT,
+    description TEXT,
+    icon TEXT,
+    splash TEXT,
+    banner TEXT,
+    approximate_presence_count INTEGER,
+    approximate_member_count INTEGER,
+    premium_subscription_count INTEGER,
+    preferred_locale TEXT,
+    auto_removed INTEGER,
+    discovery_splash TEXT,
+    primary_category_id INTEGER,
+    vanity_url_code TEXT,
+    is_published INTEGER,
+    primary_category TEXT,
+    object_id TEXT,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS categories (
+    id INTEGER PRIMARY KEY,
+    name TEXT,
+    name_localizations TEXT
+);
+CREATE TABLE IF NOT EXISTS guild_categories (
+    guild_id TEXT NOT NULL REFERENCES guilds (id),
+    category_id INTEGER NOT NULL REFERENCES categories (id),
+    is_primary INTEGER,
+    PRIMARY KEY (guild_id, category_id)
+);
+CREATE TABLE IF NOT EXISTS guild_keywords (
+    guild_id TEXT NOT NULL REFERENCES guilds (id),
+    keyword TEXT NOT NULL,
+    PRIMARY KEY (guild_id, keyword)
+);
+CREATE TABLE IF NOT EXISTS guild_features (
+    guild_id TEXT NOT NULL REFERENCES guilds (id),
+    feature TEXT NOT NULL,
+    PRIMARY KEY (guild_id, feature)
+);
+CREATE INDEX IF NOT EXISTS idx_guilds_member_count ON guilds (approximate_member_count);
+CREATE INDEX IF NOT EXISTS idx_guilds_category_members
+    ON guilds (primary_category_id, approximate_member_count);
+CREATE INDEX IF NOT EXISTS idx_guilds_locale_members
+    ON guilds (preferred_locale, approximate_member_count);
+CREATE INDEX IF NOT EXISTS idx_guild_categories_category ON guild_categories (category_id);
+CREATE INDEX IF NOT EXISTS idx_guild_keywords_keyword ON guild_keywords (keyword);
+CREATE INDEX IF NOT EXISTS idx_guild_features_feature ON guild_features (feature);
+"""
+
+_GUILD_COLUMNS = (
+    "id",
+    "name",
+    "description",
+    "icon",
+    "splash",
+    "banner",
+    "approximate_presence_count",
+    "approximate_member_count",
+    "premium_subscription_count",
+    "preferred_locale",
+    "auto_removed",
+    "discovery_splash",
+    "primary_category_id",
+    "vanity_url_code",
+    "is_published",
+    "primary_category",
+    "object_id",
+)
+
+_UPSERT_GUILD = (
+    f"INSERT INTO guilds ({', '.join(_GUILD_COLUMNS)}, first_seen, last_seen) "
+    f"VALUES ({', '.join('?' for _ in _GUILD_COLUMNS)}, ?, ?) "
+    "ON CONFLICT (id) DO UPDATE SET "
+    + ", ".join(f"{c} = excluded.{c}" for c in _GUILD_COLUMNS[1:])
+    + ", last_seen = excluded.last_seen"
+)
+
+def _as_int(value: Optional[bool]) -> Optional[int]:
+    return None if value is None else int(value)
+
+def _category_id(value: Any) -> Optional[int]:
+    # Category objects are passed through unsanitized; the id must still
+    # fit the INTEGER PRIMARY KEY.
+    category_id = _coerce_int(value)
+    if category_id is None or not -(2**63) <= category_id < 2**63:
+        return None
+    return category_id
+
+class SQLiteGuildStore:
+    """
+    SQLite storage backend for sanitized guilds.
+
+    Guilds are buffered and upserted ``batch_size`` at a time with
+    ``executemany`` inside a single transaction per batch. Categories,
+    keywords and features go into normalized side tables that mirror the
+    latest observation of each guild. The database runs in WAL mode and
+    grows incrementally across runs; ``first_seen`` / ``last_seen`` keep
+    the history of when each guild was observed.
+    """
+
+    def __init__(self, path: Path, batch_size: int = 500) -> None:
+        self.path = Path(path)
+        self.batch_size = max(1, batch_size)
+        self._buffer: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def write(self, guild: Dict[str, Any]) -> None:
+        with self._lock:
+            self._buffer.append(guild)
+            if len(self._buffer) >= self.batch_size:
+                self._flush_locked()
+
+    def upsert_guilds(self, guilds: Iterable[Dict[str, Any]]) -> int:
+        count = 0
+        for guild in guilds:
+            self.write(guild)
+            count += 1
+        self.flush()
+        return count
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        batch = [g for g in self._buffer if g.get("id") is not None]
+        self._buffer = []
+        if not batch:
+            return
+
+        now = time.time()
+        guild_rows = []
+        category_rows = []
+        link_rows = []
+        keyword_rows = []
+        feature_rows = []
+        for g in batch:
+            gid = g["id"]
+            primary = g.get("primary_category")
+            guild_rows.append(
+                (
+                    gid,
+                    g.get("name"),
+                    g.get("description"),
+                    g.get("icon"),
+                    g.get("splash"),
+                    g.get("banner"),
+                    g.get("approximate_presence_count"),
+                    g.get("approximate_member_count"),
+                    g.get("premium_subscription_count"),
+                    g.get("preferred_locale"),
+                    _as_int(g.get("auto_removed")),
+                    g.get("discovery_splash"),
+                    _category_id(g.get("primary_category_id")),
+                    g.get("vanity_url_code"),
+                    _as_int(g.get("is_published")),
+                    json.dumps(primary, ensure_ascii=False) if primary is not None else None,
+                    g.get("objectID"),
+                    now,
+                    now,
+                )
+            )
+            for category in g.get("categories") or []:
+                if not isinstance(category, dict):
+                    continue
+                category_id = _category_id(category.get("id"))
+                if category_id is None:
+                    continue
+                category_rows.append(
+                    (
+                        category_id,
+                        category.get("name"),
+                        json.dumps(category.get("name_localizations") or {}, ensure_ascii=False),
+                    )
+                )
+                is_primary = _as_int(_coerce_bool(category.get("is_primary")))
+                link_rows.append((gid, category_id, is_primary))
+            keyword_rows.extend((gid, str(k)) for k in g.get("keywords") or [])
+            feature_rows.extend((gid, str(f)) for f in g.get("features") or [])
+
+        ids = [(row[0],) for row in guild_rows]
+        with self._conn:
+            self._conn.executemany(_UPSERT_GUILD, guild_rows)
+            self._conn.executemany(
+                "INSERT INTO categories (id, name, name_localizations) VALUES (?, ?, ?) "
+                "ON CONFLICT (id) DO UPDATE SET name = excluded.name, "
+                "name_localizations = excluded.name_localizations",
+                category_rows,
+            )
+            for table in ("guild_categories", "guild_keywords", "guild_features"):
+                self._conn.executemany(f"DELETE FROM {table} WHERE guild_id = ?", ids)
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO guild_categories (guild_id, category_id, is_primary) "
+                "VALUES (?, ?, ?)",
+                link_rows,
+            )
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO guild_keywords (guild_id, keyword) VALUES (?, ?)",
+                keyword_rows,
+            )
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO guild_features (guild_id, feature) VALUES (?, ?)",
+                feature_rows,
+            )
+        logger.debug("Upserted %d guilds into %s", len(guild_rows), self.path)
+
+    def top_guilds(
+        self,
+        category_id: Optional[int] = None,
+        locale: Optional[str] = None,
+        limit: int = 10,
+    ) -> List[Dict[str, Any]]:
+        """
+        Largest guilds by member count, optionally filtered by primary
+        category and preferred locale.
+        """
+        clauses = []
+        params: List[Any] = []
+        if category_id is not None:
+            clauses.append("primary_category_id = ?")
+            params.append(int(category_id))
+        if locale is not None:
+            clauses.append("preferred_locale = ?")
+            params.append(locale)
+        where = f"WHERE {' AND '.join(clauses)} " if clauses else ""
+        params.append(int(limit))
+
+        with self._lock:
+            cursor = self._conn.execute(
+                "SELECT id, name, approximate_member_count, approximate_presence_count, "
+                "primary_category_id, preferred_locale FROM guilds "
+                f"{where}ORDER BY approximate_member_count DESC LIMIT ?",
+                params,
+            )
+            columns = [d[0] for d in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush_locked()
+            self._conn.close()
+        logger.info("Stored guilds in %s", self.path)
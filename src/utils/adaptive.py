@@ -0,0 +1,112 @@
+import threading
+import time
+from typing import Callable, Optional
+
+from .logger import get_logger
+from .metrics import METRICS
+
+logger = get_logger(__name__)
+
+_LIMIT = METRICS.gauge("adaptive_concurrency_limit", "Current in-flight request limit.")
+_IN_FLIGHT = METRICS.gauge("adaptive_in_flight", "Requests currently in flight.")
+_WAIT_SECONDS = METRICS.histogram(
+    "adaptive_wait_seconds", "Time spent waiting for an in-flight slot."
+)
+
+class AdaptiveLimiter:
+    """
+    AIMD controller for the number of in-flight requests.
+
+    Every healthy response grows the limit by ``increase / limit`` (about
+    ``increase`` per round of ``limit`` requests). A 429, a 5xx, a
+    transport error or a latency above ``latency_tolerance`` times the
+    long-run baseline multiplies it by ``decrease``. At most one decrease
+    happens per ``cooldown`` seconds (by default one smoothed round
+    trip), so a burst of failures from a single overload counts once.
+
+    Latency is tracked as two exponential moving averages: a fast one
+    for the current level and a slow one as the baseline it is compared
+    against.
+    """
+
+    def __init__(
+        self,
+        initial: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        increase: float = 1.0,
+        decrease: float = 0.5,
+        latency_tolerance: float = 2.0,
+        cooldown: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.increase = max(0.0, increase)
+        self.decrease = min(max(decrease, 0.0), 1.0)
+        self.latency_tolerance = max(1.0, latency_tolerance)
+        self.cooldown = cooldown
+        self.limit = float(min(max(initial, self.min_limit), self.max_limit))
+        self.in_flight = 0
+        self.fast_latency: Optional[float] = None
+        self.baseline_latency: Optional[float] = None
+        self._clock = clock
+        self._last_decrease = float("-inf")
+        self._cond = threading.Condition()
+        _LIMIT.set(int(self.limit))
+
+    def acquire(self) -> None:
+        with self._cond:
+            if self.in_flight >= int(self.limit):
+                start = time.perf_counter()
+                while self.in_flight >= int(self.limit):
+                    self._cond.wait()
+                _WAIT_SECONDS.record(time.perf_counter() - start)
+            self.in_flight += 1
+            _IN_FLIGHT.set(self.in_flight)
+
+    def release(self, latency: Optional[float] = None, overloaded: bool = False) -> None:
+        """
+        Return a slot and feed the outcome of the request to the controller.
+
+        ``latency`` is ``None`` for outcomes that say nothing about server
+        load (e.g. a 404); the slot is returned without adjusting the limit.
+        """
+        with self._cond:
+            self.in_flight -= 1
+            _IN_FLIGHT.set(self.in_flight)
+            if overloaded:
+                self._decrease("overload")
+            elif latency is not None:
+                self._observe(latency)
+            self._cond.notify_all()
+
+    def _observe(self, latency: float) -> None:
+        if self.fast_latency is None or self.baseline_latency is None:
+            self.fast_latency = self.baseline_latency = latency
+        else:
+            self.fast_latency += 0.2 * (latency - self.fast_latency)
+            self.baseline_latency += 0.01 * (latency - self.baseline_latency)
+        if self.fast_latency > self.latency_tolerance * self.baseline_latency:
+            self._decrease("latency")
+            return
+
+        before = int(self.limit)
+        self.limit = min(self.max_limit, self.limit + self.increase / self.limit)
+        if int(self.limit) != before:
+            logger.debug("Concurrency limit %d -> %d", before, int(self.limit))
+            _LIMIT.set(int(self.limit))
+
+    def _decrease(self, reason: str) -> None:
+        now = self._clock()
+        cooldown = self.cooldown if self.cooldown is not None else (self.fast_latency or 0.0)
+        if now - self._last_decrease < cooldown:
+            return
+        self._last_decrease = now
+        before = int(self.limit)
+        self.limit = max(float(self.min_limit), self.limit * self.decrease)
+        METRICS.counter(
+            "adaptive_decreases_total", "Multiplicative decreases by cause.", reason=reason
+        ).inc()
+        _LIMIT.set(int(self.limit))
+        logger.info("Concurrency limit %d -> %d (%s)", before, int(self.limit), reason)
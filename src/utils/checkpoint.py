@@ -0,0 +1,121 @@
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Set, Tuple
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+# Returns (guild ids emitted so far, output name -> durable file size).
+Snapshot = Callable[[], Tuple[Iterable[str], Dict[str, int]]]
+
+class Checkpoint:
+    """
+    Crash-recovery state for a keyword crawl.
+
+    Tracks the keywords that finished, the next offset to fetch for
+    keywords still in progress, the guild ids already emitted and the
+    size of each output file holding exactly those guilds, so a resumed
+    run can cut off records written after the last save. The state is
+    written atomically (temp file + rename) at most every ``interval``
+    seconds.
+    """
+
+    def __init__(self, path: Path, interval: float = 30.0) -> None:
+        self.path = Path(path)
+        self.interval = max(0.0, interval)
+        self.completed: Set[str] = set()
+        self.offsets: Dict[str, int] = {}
+        self.seen_ids: List[str] = []
+        self.sizes: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._last_save = time.monotonic()
+
+    @classmethod
+    def load(cls, path: Path, interval: float = 30.0) -> "Checkpoint":
+        checkpoint = cls(path, interval=interval)
+        if not checkpoint.path.exists():
+            logger.warning("No checkpoint found at %s; starting from scratch.", path)
+            return checkpoint
+        try:
+            with checkpoint.path.open("r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, json.JSONDecodeError) as exc:
+            logger.error("Failed to read checkpoint %s: %s", path, exc)
+            raise SystemExit("Unable to read checkpoint file") from exc
+
+        checkpoint.completed = set(state.get("completed", []))
+        checkpoint.offsets = {k: int(v) for k, v in state.get("offsets", {}).items()}
+        checkpoint.seen_ids = list(state.get("seen_ids", []))
+        checkpoint.sizes = {k: int(v) for k, v in state.get("sizes", {}).items()}
+        logger.info(
+            "Loaded checkpoint: %d keywords completed, %d in progress, %d guilds seen",
+            len(checkpoint.completed),
+            len(checkpoint.offsets),
+            len(checkpoint.seen_ids),
+        )
+        return checkpoint
+
+    def is_completed(self, keyword: str) -> bool:
+        return keyword in self.completed
+
+    def resume_offset(self, keyword: str) -> int:
+        return self.offsets.get(keyword, 0)
+
+    def record_page(self, keyword: str, next_offset: int) -> None:
+        with self._lock:
+            self.offsets[keyword] = next_offset
+
+    def mark_completed(self, keyword: str) -> None:
+        with self._lock:
+            self.offsets.pop(keyword, None)
+            self.completed.add(keyword)
+
+    def save(self, snapshot: Snapshot) -> None:
+        """
+        Persist the current state.
+
+        ``snapshot`` returns the ids handed to the outputs so far and the
+        durable size of each output file, taken together so the files
+        hold exactly those ids. Offsets are read before it runs, so every
+        page they skip on resume has its guilds in the snapshot.
+        """
+        with self._save_lock:
+            with self._lock:
+                state: Dict[str, Any] = {
+                    "completed": sorted(self.completed),
+                    "offsets": dict(self.offsets),
+                }
+            seen_ids, sizes = snapshot()
+            state["seen_ids"] = list(seen_ids)
+            state["sizes"] = dict(sizes)
+
+            tmp_path = self.path.with_name(self.path.name + ".tmp")
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with tmp_path.open("w", encoding="utf-8") as f:
+                json.dump(state, f, separators=(",", ":"))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+            self._last_save = time.monotonic()
+        logger.debug("Checkpoint saved to %s", self.path)
+
+    def maybe_save(self, snapshot: Snapshot) -> None:
+        """
+        Save if ``interval`` has elapsed and no other thread is saving.
+        """
+        if time.monotonic() - self._last_save < self.interval:
+            return
+        if self._save_lock.locked():
+            return
+        self.save(snapshot)
+
+    def remove(self) -> None:
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,116 @@
+"""
+Pluggable JSON codec.
+
+Uses ``orjson`` or ``msgspec`` when installed and falls back to the
+standard library otherwise; ``DISCORD_SCRAPER_JSON_CODEC`` forces a
+specific backend. Every backend exposes the same two calls:
+``loads(bytes) -> object`` and ``dumps(obj, indent=None) -> bytes``
+(UTF-8, non-ASCII characters left unescaped).
+"""
+import json
+import os
+from typing import Any, Callable, Dict, Optional, Union
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+class DecodeError(ValueError):
+    """Raised when a payload is not valid JSON, whatever the backend."""
+
+def _std_loads(data: Union[bytes, str]) -> Any:
+    return json.loads(data)
+
+def _std_dumps(obj: Any, indent: Optional[int] = None) -> bytes:
+    separators = None if indent else (",", ":")
+    return json.dumps(obj, ensure_ascii=False, indent=indent, separators=separators).encode("utf-8")
+
+def _load_orjson() -> Optional["Codec"]:
+    try:
+        import orjson  # type: ignore[import-not-found]
+    except ImportError:
+        return None
+
+    def dumps(obj: Any, indent: Optional[int] = None) -> bytes:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+        except TypeError:
+            # e.g. integers beyond 64 bits; the stdlib handles anything JSON-able.
+            return _std_dumps(obj, indent)
+
+    return Codec("orjson", orjson.loads, dumps, (orjson.JSONDecodeError,))
+
+def _load_msgspec() -> Optional["Codec"]:
+    try:
+        import msgspec  # type: ignore[import-not-found]
+    except ImportError:
+        return None
+
+    encoder = msgspec.json.Encoder()
+    decoder = msgspec.json.Decoder()
+
+    def dumps(obj: Any, indent: Optional[int] = None) -> bytes:
+        try:
+            data = encoder.encode(obj)
+        except (TypeError, OverflowError):
+            return _std_dumps(obj, indent)
+        return msgspec.json.format(data, indent=indent) if indent else data
+
+    return Codec("msgspec", decoder.decode, dumps, (msgspec.DecodeError,))
+
+class Codec:
+    def __init__(
+        self,
+        name: str,
+        loads: Callable[[Union[bytes, str]], Any],
+        dumps: Callable[..., bytes],
+        decode_errors: tuple = (ValueError,),
+    ) -> None:
+        self.name = name
+        self._loads = loads
+        self._dumps = dumps
+        self._decode_errors = decode_errors
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        try:
+            return self._loads(data)
+        except self._decode_errors as exc:
+            raise DecodeError(str(exc)) from exc
+
+    def dumps(self, obj: Any, indent: Optional[int] = None) -> bytes:
+        return self._dumps(obj, indent)
+
+    def __repr__(self) -> str:
+        return f"Codec({self.name!r})"
+
+_LOADERS: Dict[str, Callable[[], Optional[Codec]]] = {
+    "orjson": _load_orjson,
+    "msgspec": _load_msgspec,
+    "json": lambda: Codec("json", _std_loads, _std_dumps, (ValueError,)),
+}
+
+def available_codecs() -> Dict[str, Codec]:
+    codecs = {}
+    for name, loader in _LOADERS.items():
+        codec = loader()
+        if codec is not None:
+            codecs[name] = codec
+    return codecs
+
+def get_codec(name: Optional[str] = None) -> Codec:
+    """
+    Return the named codec, or the fastest installed one for ``None``.
+    """
+    if name is not None:
+        codec = _LOADERS[name]() if name in _LOADERS else None
+        if codec is None:
+            raise ValueError(f"JSON codec '{name}' is not available")
+        return codec
+    for loader in _LOADERS.values():
+        codec = loader()
+        if codec is not None:
+            return codec
+    raise RuntimeError("No JSON codec available")  # unreachable: stdlib always loads
+
+CODEC = get_codec(os.getenv("DISCORD_SCRAPER_JSON_CODEC") or None)
+logger.debug("Using JSON codec %s", CODEC.name)
@@ -0,0 +1,46 @@
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Iterable, Iterator, Set, TypeVar
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+def run_bounded(
+    func: Callable[[T], R],
+    items: Iterable[T],
+    workers: int,
+    max_pending: int = 0,
+) -> Iterator[Future]:
+    """
+    Run ``func`` over ``items`` on a thread pool and yield finished futures.
+
+    At most ``max_pending`` items (default: ``2 * workers``) are submitted
+    at any time, so ``items`` may be a lazy iterator of arbitrary length.
+    Futures are yielded in completion order; callers decide how to handle
+    exceptions via ``future.result()``.
+    """
+    workers = max(1, workers)
+    max_pending = max(workers, max_pending or workers * 2)
+    iterator = iter(items)
+    pending: Set[Future] = set()
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scraper") as executor:
+        exhausted = False
+        while True:
+            while not exhausted and len(pending) < max_pending:
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    exhausted = True
+                    break
+                pending.add(executor.submit(func, item))
+
+            if not pending:
+                break
+
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future
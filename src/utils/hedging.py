@@ -0,0 +1,74 @@
+import threading
+from typing import Optional
+
+from .logger import get_logger
+from .metrics import METRICS, Histogram
+
+logger = get_logger(__name__)
+
+_HEDGE_DELAY = METRICS.gauge("http_hedge_delay_seconds", "Current latency threshold before hedging.")
+
+class HedgePolicy:
+    """
+    Decides when a slow request gets one duplicate ("hedge").
+
+    The hedge delay is the ``quantile`` of recently observed request
+    latencies, never below ``min_delay``. Latencies are kept in two
+    rotating histograms of ``window`` samples so the threshold follows
+    the server as it speeds up or slows down. No hedges are sent until
+    ``min_samples`` latencies have been seen, and at most ``max_ratio``
+    hedges per request overall keep the extra load bounded.
+    """
+
+    def __init__(
+        self,
+        quantile: float = 0.95,
+        max_ratio: float = 0.05,
+        min_delay: float = 0.05,
+        min_samples: int = 50,
+        window: int = 1000,
+    ) -> None:
+        self.quantile = min(max(quantile, 0.0), 1.0)
+        self.max_ratio = max(0.0, max_ratio)
+        self.min_delay = max(0.0, min_delay)
+        self.min_samples = max(1, min_samples)
+        self.window = max(self.min_samples, window)
+        self.requests = 0
+        self.hedges = 0
+        self._current = Histogram()
+        self._previous: Optional[Histogram] = None
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._current.record(seconds)
+            if self._current.count >= self.window:
+                self._previous, self._current = self._current, Histogram()
+
+    def delay(self) -> Optional[float]:
+        """
+        Seconds to wait before hedging, or ``None`` while still warming up.
+        """
+        with self._lock:
+            histogram = self._current
+            if histogram.count < self.min_samples:
+                histogram = self._previous
+            if histogram is None:
+                return None
+            delay = max(self.min_delay, histogram.percentile(self.quantile))
+        _HEDGE_DELAY.set(delay)
+        return delay
+
+    def note_request(self) -> None:
+        with self._lock:
+            self.requests += 1
+
+    def try_acquire(self) -> bool:
+        """
+        Reserve one hedge if that keeps hedges within ``max_ratio``.
+        """
+        with self._lock:
+            if self.hedges + 1 > self.max_ratio * self.requests:
+                return False
+            self.hedges += 1
+            return True
@@ -0,0 +1,179 @@
+import hashlib
+import os
+import re
+import threading
+import unicodedata
+from array import array
+from itertools import chain
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from .codec import CODEC, DecodeError
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+
+def normalize_keyword(text: str) -> str:
+    """
+    Canonical form of a search term: NFKC, case-folded, single-spaced.
+
+    ``"AI"``, ``"ai "`` and ``"Ａｉ"`` all normalize to ``"ai"``.
+    """
+    text = unicodedata.normalize("NFKC", text).casefold()
+    return _WHITESPACE.sub(" ", text).strip()
+
+def keyword_hash(keyword: str) -> int:
+    """
+    Stable non-zero 64-bit hash of an already normalized keyword.
+    """
+    digest = hashlib.blake2b(keyword.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") or 1
+
+class SeenSet:
+    """
+    Set of 64-bit keyword hashes in a flat open-addressing table.
+
+    Each entry costs 8-16 bytes, against well over 100 for a Python
+    ``set`` of strings, so deduplicating millions of keywords stays cheap.
+    Membership is by hash only; at 64 bits a collision among a few
+    million keywords is vanishingly unlikely.
+    """
+
+    def __init__(self, capacity: int = 1024) -> None:
+        size = 16
+        while size < capacity * 2:
+            size *= 2
+        self._table = array("Q", bytes(8 * size))
+        self._mask = size - 1
+        self._len = 0
+
+    def __len__(self) -> int:
+        return self._len
+
+    def _slot(self, value: int) -> int:
+        table, mask = self._table, self._mask
+        i = value & mask
+        while table[i] and table[i] != value:
+            i = (i + 1) & mask
+        return i
+
+    def __contains__(self, value: object) -> bool:
+        return isinstance(value, int) and self._table[self._slot(value)] == value
+
+    def add(self, value: int) -> bool:
+        """
+        Insert ``value``; return ``False`` if it was already present.
+        """
+        i = self._slot(value)
+        if self._table[i] == value:
+            return False
+        self._table[i] = value
+        self._len += 1
+        if self._len * 2 > len(self._table):
+            self._grow()
+        return True
+
+    def _grow(self) -> None:
+        old = self._table
+        self._table = array("Q", bytes(16 * len(old)))
+        self._mask = len(self._table) - 1
+        for value in old:
+            if value:
+                self._table[self._slot(value)] = value
+
+def unique_keywords(keywords: Iterable[str]) -> Iterator[str]:
+    """
+    Lazily normalize ``keywords`` and drop blanks and repeats.
+    """
+    seen = SeenSet()
+    for keyword in keywords:
+        keyword = normalize_keyword(keyword)
+        if keyword and seen.add(keyword_hash(keyword)):
+            yield keyword
+
+class KeywordYields:
+    """
+    New guilds contributed by each keyword, persisted between runs.
+
+    Used to schedule productive keywords first. Values from earlier runs
+    are kept for keywords the current run did not scrape.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.yields: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        if self.path.exists():
+            try:
+                with self.path.open("rb") as f:
+                    self.yields = {k: int(v) for k, v in CODEC.loads(f.read()).items()}
+            except (OSError, DecodeError, AttributeError, TypeError, ValueError) as exc:
+                logger.warning("Ignoring unreadable keyword yield file %s: %s", self.path, exc)
+
+    def get(self, keyword: str) -> Optional[int]:
+        return self.yields.get(keyword)
+
+    def record(self, keyword: str, new_guilds: int) -> None:
+        with self._lock:
+            self.yields[keyword] = new_guilds
+
+    def save(self) -> None:
+        with self._lock:
+            data = CODEC.dumps(self.yields)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with tmp_path.open("wb") as f:
+            f.write(data)
+        os.replace(tmp_path, self.path)
+
+class KeywordSource:
+    """
+    Streams normalized, deduplicated keywords from a one-per-line file.
+
+    Lines are read lazily, so the file can be far larger than memory;
+    only the 64-bit hashes of emitted keywords are retained. With
+    ``yields``, keywords that produced guilds in a previous run come
+    first, best yield first, followed by every other keyword in file
+    order. That takes two passes over the file and memory for the
+    prioritized keywords only.
+    """
+
+    def __init__(self, path: Path, yields: Optional[KeywordYields] = None) -> None:
+        self.path = Path(path)
+        self.yields = yields
+        self.emitted = 0
+        self.duplicates = 0
+        self._lines_read = 0
+
+    def _lines(self) -> Iterator[str]:
+        with self.path.open("r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    self._lines_read += 1
+                    yield line
+
+    def _prioritized(self) -> List[str]:
+        if self.yields is None or not self.yields.yields:
+            return []
+        known = {k for k in map(normalize_keyword, self._lines()) if self.yields.get(k)}
+        return sorted(known, key=lambda k: (-(self.yields.get(k) or 0), k))
+
+    def __iter__(self) -> Iterator[str]:
+        self.emitted = self._lines_read = 0
+        first = self._prioritized()
+        if first:
+            logger.info("Scheduling %d keywords by previous yield", len(first))
+        self._lines_read = 0
+        for keyword in unique_keywords(chain(first, self._lines())):
+            self.emitted += 1
+            yield keyword
+        # Prioritized keywords were emitted early but still occur in the file.
+        self.duplicates = self._lines_read - self.emitted
+        logger.info(
+            "Read %d unique keywords from %s (%d duplicates dropped)",
+            self.emitted,
+            self.path,
+            self.duplicates,
+        )
@@ -1,23 +1,215 @@
+import atexit
+import json
 import logging
 import os
-from typing import Optional
+import queue
+import sys
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, List, Optional, Tuple
 
 _LOGGER_CONFIGURED = False
+_INSTALLED: List[logging.Handler] = []
+_LISTENER: Optional[QueueListener] = None
+_TEXT_FORMAT = "%(asctime)s [%(levelname)s] %(name)s - %(message)s"
+
+# Attributes every LogRecord has; anything else came in through ``extra``.
+_RECORD_ATTRS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+class JSONFormatter(logging.Formatter):
+    """
+    One JSON object per line: time, level, logger, message and extras.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "ts": round(record.created, 6),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+class DebugSampler:
+    """
+    Keep one in ``every`` DEBUG calls per call site.
+
+    Aimed at per-guild and per-page diagnostics: every call site still
+    shows up, at a fraction of the volume. Counters are updated without
+    a lock; a lost increment only shifts which call is kept.
+    """
+
+    def __init__(self, every: int) -> None:
+        self.every = max(1, every)
+        self._counts: Dict[Tuple[Any, int], int] = {}
+
+    def keep(self, frame: Any) -> bool:
+        key = (frame.f_code, frame.f_lineno)
+        seen = self._counts.get(key, 0)
+        self._counts[key] = seen + 1
+        return seen % self.every == 0
+
+_SAMPLER: Optional[DebugSampler] = None
+
+class SamplingAdapter(logging.LoggerAdapter):
+    """
+    Logger adapter whose ``debug`` consults the active :class:`DebugSampler`.
+
+    Sampling happens before the ``LogRecord`` is built, so a dropped call
+    costs a dictionary update rather than a record and a caller lookup.
+    Everything else is passed through to the wrapped logger unchanged.
+    """
+
+    def __init__(self, logger: logging.Logger) -> None:
+        super().__init__(logger, None)
+
+    def process(self, msg: Any, kwargs: Any) -> Tuple[Any, Any]:
+        # Keep the caller's ``extra``; the base class would replace it.
+        return msg, kwargs
+
+    def debug(self, msg: object, *args: Any, **kwargs: Any) -> None:
+        if not self.isEnabledFor(logging.DEBUG):
+            return
+        if _SAMPLER is not None and not _SAMPLER.keep(sys._getframe(1)):
+            return
+        # Attribute the record to our caller, not to this method.
+        kwargs["stacklevel"] = kwargs.get("stacklevel", 1) + 1
+        self.logger.debug(msg, *args, **kwargs)
+
+class RateLimitFilter(logging.Filter):
+    """
+    Allow at most ``per_second`` records per call site below WARNING.
+
+    Each call site has a token bucket holding one second's worth of
+    records. The next record let through after a burst carries the
+    number suppressed in the meantime.
+    """
+
+    def __init__(self, per_second: float) -> None:
+        super().__init__()
+        self.per_second = per_second
+        self._buckets: Dict[Tuple[str, int], List[float]] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or self.per_second <= 0:
+            return True
+        key = (record.pathname, record.lineno)
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                # [tokens, last refill, suppressed since last pass]
+                bucket = self._buckets[key] = [self.per_second, now, 0]
+            bucket[0] = min(self.per_second, bucket[0] + (now - bucket[1]) * self.per_second)
+            bucket[1] = now
+            if bucket[0] < 1:
+                bucket[2] += 1
+                return False
+            bucket[0] -= 1
+            suppressed, bucket[2] = int(bucket[2]), 0
+        if suppressed:
+            record.suppressed = suppressed
+        return True
+
+class _DeferredQueueHandler(QueueHandler):
+    """
+    Queue the record untouched; the listener thread does all formatting.
+
+    The stock ``QueueHandler.prepare`` formats the message on the calling
+    thread, which is exactly the cost the queue is meant to move off the
+    hot path. Log arguments must therefore not be mutated after the call.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+class _SuppressedFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        text = super().format(record)
+        suppressed = getattr(record, "suppressed", 0)
+        return f"{text} ({suppressed} similar suppressed)" if suppressed else text
+
+def _stop_listener() -> None:
+    global _LISTENER
+    if _LISTENER is not None:
+        _LISTENER.stop()
+        _LISTENER = None
+
+def configure_logging(
+    level: Optional[str] = None,
+    use_async: bool = False,
+    fmt: str = "text",
+    sample_debug: int = 1,
+    rate_limit: float = 0.0,
+) -> None:
+    """
+    (Re)configure the root logger.
+
+    - ``use_async`` sends records through a ``QueueHandler`` to a
+      background ``QueueListener``, so callers pay only for a queue put;
+    - ``fmt="json"`` writes one JSON object per line;
+    - ``sample_debug`` keeps one in N DEBUG calls per call site (for
+      loggers from :func:`get_logger`);
+    - ``rate_limit`` caps INFO and DEBUG records per call site and second.
+
+    Warnings and errors are never sampled or rate limited.
+    """
+    global _LOGGER_CONFIGURED, _LISTENER, _SAMPLER
+    root = logging.getLogger()
+    _stop_listener()
+    for handler in _INSTALLED:
+        root.removeHandler(handler)
+        handler.close()
+    _INSTALLED.clear()
+
+    log_level_name = level or os.getenv("DISCORD_SCRAPER_LOG_LEVEL", "INFO")
+    root.setLevel(getattr(logging, log_level_name.upper(), logging.INFO))
+
+    output = logging.StreamHandler(sys.stderr)
+    output.setFormatter(JSONFormatter() if fmt == "json" else _SuppressedFormatter(_TEXT_FORMAT))
+    front: logging.Handler = output
+    if use_async:
+        front = _DeferredQueueHandler(queue.SimpleQueue())  # type: ignore[arg-type]
+        _LISTENER = QueueListener(front.queue, output, respect_handler_level=True)  # type: ignore[attr-defined]
+        _LISTENER.start()
+    _SAMPLER = DebugSampler(sample_debug) if sample_debug > 1 else None
+    if rate_limit > 0:
+        front.addFilter(RateLimitFilter(rate_limit))
+    root.addHandler(front)
+    _INSTALLED.append(front)
+    _LOGGER_CONFIGURED = True
 
 def _configure_root_logger(level: Optional[str] = None) -> None:
     global _LOGGER_CONFIGURED
     if _LOGGER_CONFIGURED:
         return
+    if logging.getLogger().handlers:
+        # Someone (e.g. a test runner) configured logging already; like
+        # logging.basicConfig, leave it alone.
+        _LOGGER_CONFIGURED = True
+        return
 
-    log_level_name = level or os.getenv("DISCORD_SCRAPER_LOG_LEVEL", "INFO")
-    numeric_level = getattr(logging, log_level_name.upper(), logging.INFO)
-
-    logging.basicConfig(
-        level=numeric_level,
-        format="%(asctime)s [%(levelname)s] %(name)s - %(message)s",
+    configure_logging(
+        level=level,
+        use_async=os.getenv("DISCORD_SCRAPER_LOG_ASYNC", "").lower() in {"1", "true", "yes"},
+        fmt=os.getenv("DISCORD_SCRAPER_LOG_FORMAT", "text"),
+        sample_debug=int(os.getenv("DISCORD_SCRAPER_LOG_SAMPLE", "1")),
+        rate_limit=float(os.getenv("DISCORD_SCRAPER_LOG_RATE", "0")),
     )
-    _LOGGER_CONFIGURED = True
 
-def get_logger(name: str) -> logging.Logger:
+atexit.register(_stop_listener)
+
+def get_logger(name: str) -> SamplingAdapter:
+    """
+    Project logger for ``name``: the standard logger behind a
+    :class:`SamplingAdapter`, leaving the global logger class alone.
+    """
     _configure_root_logger()
-    return logging.getLogger(name)
\ No newline at end of file
+    return SamplingAdapter(logging.getLogger(name))
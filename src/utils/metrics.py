@@ -0,0 +1,293 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+def _format_labels(labels: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    items = list(labels) + ([extra] if extra else [])
+    if not items:
+        return ""
+    inner = ",".join(f'{k}="{v}"' for k, v in items)
+    return "{" + inner + "}"
+
+class Counter:
+    """
+    Monotonic counter. Also used for gauges via :meth:`set`.
+    """
+
+    __slots__ = ("value", "_lock")
+
+    def __init__(self) -> None:
+        self.value: float = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1) -> None:
+        with self._lock:
+            self.value += amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def reset(self) -> None:
+        with self._lock:
+            self.value = 0
+
+class Histogram:
+    """
+    Log-linear (HDR-style) latency histogram.
+
+    Values are recorded in microseconds. Below 64us every value has its
+    own bucket; above that each power of two is split into 32 linear
+    sub-buckets, bounding the relative error of reported percentiles to
+    about 3% while keeping the bucket count small and sparse.
+    """
+
+    __slots__ = ("counts", "count", "total", "min", "max", "_lock")
+
+    _SUB_BITS = 5
+    _SUB = 1 << _SUB_BITS
+    _LINEAR = _SUB * 2
+
+    def __init__(self) -> None:
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def _index(cls, micros: int) -> int:
+        if micros < cls._LINEAR:
+            return micros
+        shift = micros.bit_length() - (cls._SUB_BITS + 1)
+        return cls._LINEAR + (shift - 1) * cls._SUB + ((micros >> shift) - cls._SUB)
+
+    @classmethod
+    def _bounds(cls, index: int) -> Tuple[int, int]:
+        if index < cls._LINEAR:
+            return index, index
+        k = index - cls._LINEAR
+        shift = k // cls._SUB + 1
+        mantissa = k % cls._SUB + cls._SUB
+        return mantissa << shift, ((mantissa + 1) << shift) - 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self.counts = {}
+            self.count = 0
+            self.total = 0.0
+            self.min = float("inf")
+            self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        index = self._index(max(0, int(seconds * 1_000_000)))
+        with self._lock:
+            self.counts[index] = self.counts.get(index, 0) + 1
+            self.count += 1
+            self.total += seconds
+            if seconds < self.min:
+                self.min = seconds
+            if seconds > self.max:
+                self.max = seconds
+
+    def percentile(self, q: float) -> float:
+        """
+        Approximate value (seconds) at quantile ``q`` in ``[0, 1]``.
+        """
+        with self._lock:
+            if not self.count:
+                return 0.0
+            rank = max(1, int(round(q * self.count)))
+            seen = 0
+            for index in sorted(self.counts):
+                seen += self.counts[index]
+                if seen >= rank:
+                    low, high = self._bounds(index)
+                    value = (low + high) / 2 / 1_000_000
+                    return min(max(value, self.min), self.max)
+            return self.max
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "min": self.min if self.count else 0.0,
+            "max": self.max,
+            "p50": self.percentile(0.50),
+            "p90": self.percentile(0.90),
+            "p99": self.percentile(0.99),
+            "p999": self.percentile(0.999),
+        }
+
+class MetricsRegistry:
+    """
+    Process-wide store of counters, gauges and histograms.
+
+    Metric handles are cheap to look up and are meant to be cached by
+    the instrumented module, so the hot path only pays for a lock and an
+    addition.
+    """
+
+    _QUANTILES = (("0.5", 0.50), ("0.9", 0.90), ("0.99", 0.99), ("0.999", 0.999))
+
+    def __init__(self, namespace: str = "discord_scraper") -> None:
+        self.namespace = namespace
+        self._lock = threading.Lock()
+        self._help: Dict[str, Tuple[str, str]] = {}
+        self._counters: Dict[Tuple[str, LabelKey], Counter] = {}
+        self._histograms: Dict[Tuple[str, LabelKey], Histogram] = {}
+
+    def _get(self, store: Dict, cls: type, kind: str, name: str, help_text: str, labels: Dict[str, Any]) -> Any:
+        key = (name, _label_key(labels))
+        metric = store.get(key)
+        if metric is None:
+            with self._lock:
+                metric = store.get(key)
+                if metric is None:
+                    metric = store[key] = cls()
+                    self._help.setdefault(name, (kind, help_text))
+        return metric
+
+    def counter(self, name: str, help_text: str = "", **labels: Any) -> Counter:
+        return self._get(self._counters, Counter, "counter", name, help_text, labels)
+
+    def gauge(self, name: str, help_text: str = "", **labels: Any) -> Counter:
+        return self._get(self._counters, Counter, "gauge", name, help_text, labels)
+
+    def histogram(self, name: str, help_text: str = "", **labels: Any) -> Histogram:
+        return self._get(self._histograms, Histogram, "summary", name, help_text, labels)
+
+    @contextmanager
+    def timer(self, histogram: Histogram) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            histogram.record(time.perf_counter() - start)
+
+    def reset(self) -> None:
+        """
+        Zero every metric. Handles cached by instrumented modules stay valid.
+        """
+        with self._lock:
+            metrics = list(self._counters.values()) + list(self._histograms.values())
+        for metric in metrics:
+            metric.reset()
+
+    def snapshot(self) -> Dict[str, Any]:
+        def _entries(store: Dict, render) -> Dict[str, List[Dict[str, Any]]]:
+            out: Dict[str, List[Dict[str, Any]]] = {}
+            for (name, labels), metric in sorted(store.items(), key=lambda kv: kv[0]):
+                out.setdefault(name, []).append({"labels": dict(labels), **render(metric)})
+            return out
+
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = dict(self._histograms)
+        return {
+            "timestamp": time.time(),
+            "counters": _entries(counters, lambda m: {"value": m.value}),
+            "histograms": _entries(histograms, lambda m: m.summary()),
+        }
+
+    def to_prometheus(self) -> str:
+        with self._lock:
+            counters = sorted(self._counters.items(), key=lambda kv: kv[0])
+            histograms = sorted(self._histograms.items(), key=lambda kv: kv[0])
+            help_map = dict(self._help)
+
+        lines: List[str] = []
+        described = set()
+
+        def _describe(name: str) -> str:
+            full = f"{self.namespace}_{name}"
+            if name not in described:
+                kind, help_text = help_map.get(name, ("untyped", ""))
+                if help_text:
+                    lines.append(f"# HELP {full} {help_text}")
+                lines.append(f"# TYPE {full} {kind}")
+                described.add(name)
+            return full
+
+        for (name, labels), counter in counters:
+            full = _describe(name)
+            lines.append(f"{full}{_format_labels(labels)} {counter.value}")
+        for (name, labels), hist in histograms:
+            full = _describe(name)
+            for label, q in self._QUANTILES:
+                lines.append(
+                    f"{full}{_format_labels(labels, ('quantile', label))} {hist.percentile(q):.6f}"
+                )
+            lines.append(f"{full}_sum{_format_labels(labels)} {hist.total:.6f}")
+            lines.append(f"{full}_count{_format_labels(labels)} {hist.count}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: Path, fmt: str = "prometheus") -> None:
+        """
+        Atomically write a snapshot as Prometheus text or JSON.
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = (
+            json.dumps(self.snapshot(), indent=2) if fmt == "json" else self.to_prometheus()
+        )
+        tmp_path = path.with_name(path.name + ".tmp")
+        tmp_path.write_text(payload, encoding="utf-8")
+        os.replace(tmp_path, path)
+
+class PeriodicExporter:
+    """
+    Background thread writing registry snapshots every ``interval`` seconds.
+    """
+
+    def __init__(
+        self,
+        registry: MetricsRegistry,
+        path: Path,
+        fmt: str = "prometheus",
+        interval: float = 60.0,
+    ) -> None:
+        self.registry = registry
+        self.path = Path(path)
+        self.fmt = fmt
+        self.interval = max(0.1, interval)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="metrics-exporter", daemon=True)
+
+    def start(self) -> "PeriodicExporter":
+        self._thread.start()
+        return self
+
+    def _export(self) -> None:
+        try:
+            self.registry.write(self.path, self.fmt)
+        except OSError as exc:
+            logger.warning("Failed to write metrics to %s: %s", self.path, exc)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._export()
+
+    def stop(self) -> None:
+        """
+        Stop the thread and write a final snapshot.
+        """
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+        self._export()
+
+METRICS = MetricsRegistry()
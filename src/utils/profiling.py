@@ -0,0 +1,280 @@
+"""
+Opt-in per-stage profiling (``main.py --profile``).
+
+Code marks its stages with ``with PROFILER.stage("fetch"): ...``; while
+profiling is off that is a shared no-op context manager. Once started,
+each stage gets:
+
+- wall and CPU time per call;
+- a ``cProfile`` profile of the code run inside it on the main thread,
+  written as one ``.prof`` file per stage. Python 3.12+ allows only one
+  active profiler per process, so stages on worker threads get timing,
+  allocation and stack samples but no ``cProfile`` data (and a main
+  thread profile there also sees calls made by other threads);
+- ``tracemalloc`` net allocation and peak memory above the level at
+  entry, plus top allocation sites from snapshot diffs of every
+  ``alloc_every``-th call. Snapshots cost time proportional to the
+  live heap, so they are skipped once they have taken more than
+  ``alloc_budget`` of the profiled wall time.
+
+A sampling thread additionally records the Python stacks of the main
+thread and of every thread inside a stage, prefixed with its innermost
+stage, in collapsed-stack format for flamegraph tools. Stage figures
+include nested stages (``decode`` runs inside ``fetch``).
+``tracemalloc`` is process-wide, so with several workers the
+allocation numbers of concurrent stages overlap; profile with one
+worker, and without prefetch, fanout or hedging, for clean attribution
+and complete ``.prof`` files.
+"""
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+_NULL = nullcontext()
+_NOISE = (tracemalloc.__file__, __file__)
+
+class StageStats:
+    __slots__ = ("calls", "wall", "cpu", "allocated", "peak", "sites", "site_samples")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.allocated = 0
+        self.peak = 0
+        self.sites: Counter = Counter()
+        self.site_samples = 0
+
+class _Frame:
+    __slots__ = ("name", "profile", "start_memory", "peak", "sites")
+
+    def __init__(self, name: str, profile: Optional[cProfile.Profile], start_memory: int) -> None:
+        self.name = name
+        self.profile = profile
+        self.start_memory = start_memory
+        self.peak = start_memory
+        self.sites: Optional[Dict[str, int]] = None
+
+def _site_sizes() -> Dict[str, int]:
+    """
+    Live traced bytes per allocating source line.
+    """
+    return {
+        str(stat.traceback[0]): stat.size
+        for stat in tracemalloc.take_snapshot().statistics("lineno")
+        if stat.traceback[0].filename not in _NOISE
+    }
+
+class Profiler:
+    """
+    Collects the per-stage figures; see the module docstring.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.sample_interval = 0.005
+        self.alloc_every = 20
+        self.alloc_budget = 0.1
+        self.stages: Dict[str, StageStats] = {}
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.peak_memory = 0
+        self._profiles: Dict[str, cProfile.Profile] = {}
+        self._active: Dict[int, List[_Frame]] = {}
+        self._lock = threading.Lock()
+        self._started_at = 0.0
+        self._wall = 0.0
+        self._alloc_seconds = 0.0
+        self._stop = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+
+    def start(
+        self,
+        sample_interval: float = 0.005,
+        alloc_every: int = 20,
+        alloc_budget: float = 0.1,
+    ) -> None:
+        self.sample_interval = max(0.001, sample_interval)
+        self.alloc_every = max(1, alloc_every)
+        self.alloc_budget = max(0.0, alloc_budget)
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self._started_at = time.perf_counter()
+        self._stop.clear()
+        self._sampler = threading.Thread(target=self._sample, name="profile-sampler", daemon=True)
+        self.enabled = True
+        self._sampler.start()
+        logger.info("Profiling enabled")
+
+    def stop(self) -> None:
+        if not self.enabled:
+            return
+        self.enabled = False
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join()
+        self._wall = time.perf_counter() - self._started_at
+        self.peak_memory = max(self.peak_memory, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+
+    def stage(self, name: str) -> Any:
+        """
+        Context manager timing the enclosed code as stage ``name``.
+        """
+        if not self.enabled:
+            return _NULL
+        return self._scope(name)
+
+    def _profile_for(self, name: str) -> Optional[cProfile.Profile]:
+        if threading.current_thread() is not threading.main_thread():
+            return None
+        profile = self._profiles.get(name)
+        if profile is None:
+            profile = self._profiles[name] = cProfile.Profile()
+        return profile
+
+    def _note_peak(self, stack: List[_Frame]) -> None:
+        # tracemalloc has a single peak; fold it into every open stage
+        # before anything resets it.
+        peak = tracemalloc.get_traced_memory()[1]
+        for frame in stack:
+            frame.peak = max(frame.peak, peak)
+        self.peak_memory = max(self.peak_memory, peak)
+
+    @contextmanager
+    def _scope(self, name: str) -> Iterator[None]:
+        tid = threading.get_ident()
+        stack = self._active.setdefault(tid, [])
+        with self._lock:
+            stats = self.stages.get(name)
+            if stats is None:
+                stats = self.stages[name] = StageStats()
+            stats.calls += 1
+            # Every stage gets at least its first call sampled.
+            sample_allocations = stats.calls == 1 or (
+                (stats.calls - 1) % self.alloc_every == 0
+                and self._alloc_seconds <= self.alloc_budget * (time.perf_counter() - self._started_at)
+            )
+
+        if stack and stack[-1].profile is not None:
+            stack[-1].profile.disable()
+        self._note_peak(stack)
+        tracemalloc.reset_peak()
+        frame = _Frame(name, self._profile_for(name), tracemalloc.get_traced_memory()[0])
+        if sample_allocations:
+            frame.sites = self._timed_sites()
+        stack.append(frame)
+        wall, cpu = time.perf_counter(), time.thread_time()
+        if frame.profile is not None:
+            frame.profile.enable()
+        try:
+            yield
+        finally:
+            if frame.profile is not None:
+                frame.profile.disable()
+            wall, cpu = time.perf_counter() - wall, time.thread_time() - cpu
+            stack.pop()
+            self._note_peak(stack + [frame])
+            allocated = tracemalloc.get_traced_memory()[0] - frame.start_memory
+            sites: Optional[Dict[str, int]] = None
+            if frame.sites is not None and tracemalloc.is_tracing():
+                sites = self._timed_sites()
+            with self._lock:
+                stats.wall += wall
+                stats.cpu += cpu
+                stats.allocated += max(0, allocated)
+                stats.peak = max(stats.peak, frame.peak - frame.start_memory)
+                if sites is not None and frame.sites is not None:
+                    stats.site_samples += 1
+                    for site, size in sites.items():
+                        grown = size - frame.sites.get(site, 0)
+                        if grown > 0:
+                            stats.sites[site] += grown
+            if stack and stack[-1].profile is not None and self.enabled:
+                stack[-1].profile.enable()
+
+    def _timed_sites(self) -> Dict[str, int]:
+        started = time.perf_counter()
+        sites = _site_sizes()
+        with self._lock:
+            self._alloc_seconds += time.perf_counter() - started
+        return sites
+
+    def _sample(self) -> None:
+        me = threading.get_ident()
+        main = threading.main_thread().ident
+        while not self._stop.wait(self.sample_interval):
+            for tid, frame in sys._current_frames().items():
+                active = list(self._active.get(tid) or ())
+                if tid == me or not (active or tid == main):
+                    # Skip idle helper threads (metrics exporter, pools).
+                    continue
+                names = []
+                while frame is not None:
+                    code = frame.f_code
+                    names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                names.append(f"stage:{active[-1].name}" if active else "stage:-")
+                self.stacks[";".join(reversed(names))] += 1
+            self.samples += 1
+
+    def write_report(self, directory: Path, top: int = 15) -> Path:
+        """
+        Write ``report.txt``, ``stacks.collapsed`` and one ``<stage>.prof``
+        per stage to ``directory``; return the report path.
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        collapsed_path = directory / "stacks.collapsed"
+        with collapsed_path.open("w", encoding="utf-8") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+        out = io.StringIO()
+        out.write(
+            f"Profiled {self._wall:.2f}s wall; peak traced memory {self.peak_memory / 2**20:.1f} MiB; "
+            f"{self.samples} stack samples every {self.sample_interval * 1000:.0f}ms; "
+            f"{self._alloc_seconds:.2f}s spent on allocation snapshots\n\n"
+        )
+        out.write(f"{'stage':<12} {'calls':>8} {'wall s':>10} {'cpu s':>10} {'net alloc MiB':>14} {'peak MiB':>10}\n")
+        ordered = sorted(self.stages.items(), key=lambda item: -item[1].wall)
+        for name, stats in ordered:
+            out.write(
+                f"{name:<12} {stats.calls:>8} {stats.wall:>10.3f} {stats.cpu:>10.3f} "
+                f"{stats.allocated / 2**20:>14.2f} {stats.peak / 2**20:>10.2f}\n"
+            )
+
+        for name, stats in ordered:
+            profile = self._profiles.get(name)
+            if profile is not None:
+                profile_stats = pstats.Stats(profile, stream=out)
+                profile_stats.dump_stats(str(directory / f"{name}.prof"))
+                out.write(f"\n== {name}: top functions by cumulative time ({name}.prof) ==\n")
+                profile_stats.sort_stats("cumulative").print_stats(top)
+            if stats.sites:
+                out.write(
+                    f"\n== {name}: top allocation sites, "
+                    f"net KiB per call over {stats.site_samples} sampled calls ==\n"
+                )
+                for site, size in stats.sites.most_common(top):
+                    out.write(f"  {size / stats.site_samples / 1024:10.1f}  {site}\n")
+
+        out.write(f"\nCollapsed stacks for flamegraph tools: {collapsed_path}\n")
+        report_path = directory / "report.txt"
+        report_path.write_text(out.getvalue(), encoding="utf-8")
+        return report_path
+
+PROFILER = Profiler()
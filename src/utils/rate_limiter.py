@@ -0,0 +1,146 @@
+import threading
+import time
+from typing import Dict, Mapping, Optional
+from urllib.parse import urlsplit
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+def _parse_float(value: Optional[str]) -> Optional[float]:
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+def route_for(url: str) -> str:
+    """
+    Rate-limit route key for a URL: its path, without the query string.
+    """
+    return urlsplit(url).path or "/"
+
+class _Bucket:
+    """
+    Token bucket mirroring one Discord rate-limit bucket.
+
+    Discord exposes fixed windows: ``limit`` tokens that all come back
+    once ``reset_at`` passes. Until the first response is seen the
+    bucket is unknown and does not block.
+    """
+
+    __slots__ = ("limit", "remaining", "reset_at")
+
+    def __init__(self) -> None:
+        self.limit: Optional[int] = None
+        self.remaining: Optional[int] = None
+        self.reset_at = 0.0
+
+    def wait_time(self, now: float) -> float:
+        if self.remaining is None:
+            return 0.0
+        if now >= self.reset_at:
+            self.remaining = self.limit
+            return 0.0
+        if self.remaining > 0:
+            return 0.0
+        return self.reset_at - now
+
+class RateLimiter:
+    """
+    Shared request budget that learns its limits from Discord headers.
+
+    Every request calls :meth:`acquire` with its route before going on
+    the wire and :meth:`update` with the response headers afterwards.
+    Routes are mapped to the bucket id reported in ``X-RateLimit-Bucket``
+    so routes sharing a bucket also share tokens. A 429 pauses the
+    bucket (or every bucket, for global limits) for exactly the
+    ``Retry-After`` the server asked for.
+    """
+
+    def __init__(self, clock=time.monotonic, sleep=time.sleep) -> None:
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._routes: Dict[str, str] = {}
+        self._buckets: Dict[str, _Bucket] = {}
+        self._global_reset_at = 0.0
+
+    def _bucket_for(self, route: str) -> _Bucket:
+        key = self._routes.get(route, route)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = _Bucket()
+        return bucket
+
+    def acquire(self, route: str) -> float:
+        """
+        Block until a request on ``route`` fits in the budget.
+
+        Returns the total time spent waiting, in seconds.
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = self._clock()
+                bucket = self._bucket_for(route)
+                delay = max(self._global_reset_at - now, bucket.wait_time(now))
+                if delay <= 0:
+                    if bucket.remaining is not None:
+                        bucket.remaining -= 1
+                    return waited
+            logger.debug("Rate limit reached for %s; waiting %.3fs", route, delay)
+            self._sleep(delay)
+            waited += delay
+
+    def update(self, route: str, headers: Mapping[str, str], status_code: int = 200) -> None:
+        """
+        Learn bucket state from response headers.
+        """
+        now = self._clock()
+        bucket_id = headers.get("X-RateLimit-Bucket")
+        limit = _parse_float(headers.get("X-RateLimit-Limit"))
+        remaining = _parse_float(headers.get("X-RateLimit-Remaining"))
+        reset_after = _parse_float(headers.get("X-RateLimit-Reset-After"))
+        retry_after = _parse_float(headers.get("Retry-After"))
+        is_global = (
+            headers.get("X-RateLimit-Global", "").lower() == "true"
+            or headers.get("X-RateLimit-Scope") == "global"
+        )
+
+        with self._lock:
+            if bucket_id and self._routes.get(route) != bucket_id:
+                # Carry over what we already learned under the old key.
+                previous = self._buckets.pop(self._routes.get(route, route), None)
+                self._routes[route] = bucket_id
+                if previous is not None and bucket_id not in self._buckets:
+                    self._buckets[bucket_id] = previous
+            bucket = self._bucket_for(route)
+
+            if limit is not None:
+                bucket.limit = int(limit)
+            if reset_after is not None:
+                reset_at = now + reset_after
+                new_window = reset_at > bucket.reset_at + 0.001 and now >= bucket.reset_at
+                bucket.reset_at = reset_at
+                if remaining is not None:
+                    # Within a window, requests still in flight have already
+                    # taken tokens locally, so keep the smaller count.
+                    if bucket.remaining is None or new_window:
+                        bucket.remaining = int(remaining)
+                    else:
+                        bucket.remaining = min(bucket.remaining, int(remaining))
+            if bucket.limit is None and bucket.remaining is not None:
+                bucket.limit = bucket.remaining + 1
+
+            if status_code == 429 and retry_after is not None:
+                if is_global:
+                    logger.warning("Global rate limit hit; pausing all requests for %.3fs", retry_after)
+                    self._global_reset_at = max(self._global_reset_at, now + retry_after)
+                else:
+                    logger.warning("Rate limited on %s; pausing bucket for %.3fs", route, retry_after)
+                    bucket.remaining = 0
+                    bucket.reset_at = max(bucket.reset_at, now + retry_after)
+                    if bucket.limit is None:
+                        bucket.limit = 1
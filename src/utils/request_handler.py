@@ -1,12 +1,45 @@
 import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FutureTimeout
+from functools import partial
 from typing import Any, Dict, Optional
 
 import requests
+from requests.adapters import HTTPAdapter
 
+from .adaptive import AdaptiveLimiter
+from .codec import CODEC, Codec
+from .hedging import HedgePolicy
 from .logger import get_logger
+from .metrics import METRICS
+from .profiling import PROFILER
+from .rate_limiter import RateLimiter, route_for
+from .response_cache import CachedResponse, ResponseCache
 
 logger = get_logger(__name__)
 
+_REQUEST_SECONDS = METRICS.histogram(
+    "http_request_seconds", "Wall time of a single HTTP attempt."
+)
+_GET_SECONDS = METRICS.histogram(
+    "http_get_seconds", "Wall time of RequestHandler.get including retries."
+)
+_RATE_LIMIT_WAIT_SECONDS = METRICS.histogram(
+    "rate_limit_wait_seconds", "Time spent waiting on the shared rate limiter."
+)
+_RETRIES = METRICS.counter("http_retries_total", "HTTP attempts that were retried.")
+_RATE_LIMITED = METRICS.counter("http_rate_limited_total", "Responses with status 429.")
+_TRANSPORT_ERRORS = METRICS.counter(
+    "http_transport_errors_total", "Timeouts and connection errors."
+)
+_RESPONSE_BYTES = METRICS.counter("http_response_bytes_total", "Response body bytes received.")
+_CACHE_HITS = METRICS.counter("http_cache_hits_total", "Requests served fresh from the cache.")
+_CACHE_REVALIDATED = METRICS.counter(
+    "http_cache_revalidated_total", "Cached responses revalidated with a 304."
+)
+_HEDGES_SENT = METRICS.counter("http_hedges_sent_total", "Duplicate requests sent for slow attempts.")
+_HEDGES_WON = METRICS.counter("http_hedges_won_total", "Hedged requests that answered first.")
+
 class RequestError(RuntimeError):
     """Raised when an HTTP request fails after retries."""
 
@@ -20,23 +53,221 @@ class RequestHandler:
         timeout: float = 10.0,
         retries: int = 3,
         backoff_factor: float = 0.5,
+        pool_size: int = 10,
+        rate_limiter: Optional[RateLimiter] = None,
+        rate_limit_retries: int = 5,
+        cache: Optional[ResponseCache] = None,
+        codec: Optional[Codec] = None,
+        hedge: Optional[HedgePolicy] = None,
+        concurrency: Optional[AdaptiveLimiter] = None,
     ) -> None:
         self.timeout = timeout
         self.retries = max(0, retries)
         self.backoff_factor = max(0.0, backoff_factor)
+        self.rate_limiter = rate_limiter
+        self.rate_limit_retries = max(0, rate_limit_retries)
+        self.cache = cache
+        self.codec = codec or CODEC
+        self.hedge = hedge
+        self.concurrency = concurrency
         self.session = requests.Session()
 
+        # Size the connection pool so concurrent workers sharing this
+        # handler reuse keep-alive connections instead of discarding them.
+        pool_size = max(10, pool_size)
+        self._hedge_pool: Optional[ThreadPoolExecutor] = None
+        if hedge is not None:
+            # Every caller may have a primary and a hedge in flight.
+            pool_size *= 2
+            self._hedge_pool = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="http-hedge")
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def close(self) -> None:
+        if self._hedge_pool is not None:
+            # Losing hedges finish in the background; don't wait for them.
+            self._hedge_pool.shutdown(wait=False)
+        self.session.close()
+
+    @staticmethod
+    def _retry_after(response: requests.Response) -> Optional[float]:
+        header = response.headers.get("Retry-After")
+        if header is not None:
+            try:
+                return max(0.0, float(header))
+            except ValueError:
+                pass
+        try:
+            body = response.json()
+        except ValueError:
+            return None
+        if isinstance(body, dict) and body.get("retry_after") is not None:
+            try:
+                return max(0.0, float(body["retry_after"]))
+            except (TypeError, ValueError):
+                return None
+        return None
+
     def get(
         self,
         url: str,
         params: Optional[Dict[str, Any]] = None,
         headers: Optional[Dict[str, str]] = None,
     ) -> Dict[str, Any]:
+        start = time.perf_counter()
+        try:
+            with PROFILER.stage("fetch"):
+                return self._get(url, params, headers)
+        finally:
+            _GET_SECONDS.record(time.perf_counter() - start)
+
+    def _decode(self, body: bytes) -> Any:
+        with PROFILER.stage("decode"):
+            return self.codec.loads(body)
+
+    def _timed_get(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]],
+        headers: Optional[Dict[str, str]],
+    ) -> requests.Response:
+        sent_at = time.perf_counter()
+        try:
+            return self.session.get(
+                url,
+                params=params,
+                headers=headers,
+                timeout=self.timeout,
+            )
+        finally:
+            elapsed = time.perf_counter() - sent_at
+            _REQUEST_SECONDS.record(elapsed)
+            if self.hedge is not None:
+                self.hedge.record(elapsed)
+
+    def _send(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]],
+        headers: Optional[Dict[str, str]],
+        route: str,
+    ) -> requests.Response:
+        """
+        Send one attempt, hedging it if it outlives the policy's delay.
+
+        The hedge goes through the rate limiter like any other request
+        and whichever copy answers first wins; the loser is left to
+        finish in the background and only feeds the rate limiter.
+        """
+        if self.hedge is None or self._hedge_pool is None:
+            return self._timed_get(url, params, headers)
+        self.hedge.note_request()
+        delay = self.hedge.delay()
+        if delay is None:
+            return self._timed_get(url, params, headers)
+
+        primary = self._hedge_pool.submit(self._timed_get, url, params, headers)
+        try:
+            return primary.result(timeout=delay)
+        except FutureTimeout:
+            pass
+        if not self.hedge.try_acquire():
+            return primary.result()
+        if self.rate_limiter is not None:
+            waited = self.rate_limiter.acquire(route)
+            if waited:
+                _RATE_LIMIT_WAIT_SECONDS.record(waited)
+        if primary.done():
+            return primary.result()
+
+        logger.debug("Hedging GET %s params=%s after %.3fs", url, params, delay)
+        _HEDGES_SENT.inc()
+        hedge = self._hedge_pool.submit(self._timed_get, url, params, headers)
+        pending = {primary, hedge}
+        while True:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            winner = next((f for f in done if f.exception() is None), None)
+            if winner is not None or not pending:
+                break
+        for loser in (primary, hedge):
+            if loser is not winner:
+                loser.add_done_callback(partial(self._discard, route))
+        if winner is None:
+            # Both copies failed; surface the primary's error.
+            return primary.result()
+        if winner is hedge:
+            _HEDGES_WON.inc()
+        return winner.result()
+
+    def _limited_send(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]],
+        headers: Optional[Dict[str, str]],
+        route: str,
+    ) -> requests.Response:
+        """
+        Send one attempt inside an adaptive concurrency slot, if configured.
+
+        429s, 5xx responses and transport errors signal overload; other
+        successful exchanges report their latency.
+        """
+        if self.concurrency is None:
+            return self._send(url, params, headers, route)
+        self.concurrency.acquire()
+        sent_at = time.perf_counter()
+        latency: Optional[float] = None
+        overloaded = False
+        try:
+            response = self._send(url, params, headers, route)
+            status = response.status_code
+            overloaded = status == 429 or status >= 500
+            if status < 400:
+                latency = time.perf_counter() - sent_at
+            return response
+        except (requests.Timeout, requests.ConnectionError):
+            overloaded = True
+            raise
+        finally:
+            self.concurrency.release(latency, overloaded=overloaded)
+
+    def _discard(self, route: str, future: "Future[requests.Response]") -> None:
+        if future.cancelled() or future.exception() is not None:
+            return
+        response = future.result()
+        if self.rate_limiter is not None:
+            self.rate_limiter.update(route, response.headers, response.status_code)
+        response.close()
+
+    def _get(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]],
+        headers: Optional[Dict[str, str]],
+    ) -> Dict[str, Any]:
+        cache_key: Optional[str] = None
+        cached: Optional[CachedResponse] = None
+        if self.cache is not None:
+            cache_key = self.cache.key_for(url, params)
+            cached = self.cache.lookup(cache_key)
+            if cached is not None:
+                if self.cache.is_fresh(cached):
+                    logger.debug("Cache hit for %s params=%s", url, params)
+                    _CACHE_HITS.inc()
+                    return self._decode(cached.body)
+                validators = self.cache.conditional_headers(cached)
+                if validators:
+                    headers = {**(headers or {}), **validators}
+
         attempt = 0
+        rate_limited = 0
         last_exc: Optional[Exception] = None
+        route = route_for(url)
 
         while attempt <= self.retries:
             attempt += 1
+            sleep_time = self.backoff_factor * (2 ** (attempt - 1))
             try:
                 logger.debug(
                     "HTTP GET %s attempt=%d params=%s headers=%s",
@@ -45,12 +276,27 @@ class RequestHandler:
                     params,
                     headers,
                 )
-                response = self.session.get(
-                    url,
-                    params=params,
-                    headers=headers,
-                    timeout=self.timeout,
-                )
+                if self.rate_limiter is not None:
+                    waited = self.rate_limiter.acquire(route)
+                    if waited:
+                        _RATE_LIMIT_WAIT_SECONDS.record(waited)
+                response = self._limited_send(url, params, headers, route)
+                METRICS.counter(
+                    "http_responses_total", "HTTP responses by status code.",
+                    status=response.status_code,
+                ).inc()
+                _RESPONSE_BYTES.inc(len(response.content))
+                if response.status_code == 429:
+                    _RATE_LIMITED.inc()
+                if self.rate_limiter is not None:
+                    self.rate_limiter.update(route, response.headers, response.status_code)
+
+                if response.status_code == 304 and cached is not None:
+                    logger.debug("Cached response for %s revalidated", response.url)
+                    _CACHE_REVALIDATED.inc()
+                    self.cache.refresh(cache_key)
+                    return self._decode(cached.body)
+
                 if 200 <= response.status_code < 300:
                     logger.debug(
                         "HTTP %s %s succeeded status=%d",
@@ -59,30 +305,63 @@ class RequestHandler:
                         response.status_code,
                     )
                     try:
-                        return response.json()
+                        data = self._decode(response.content)
                     except ValueError as exc:
                         logger.error("Failed to decode JSON response: %s", exc)
                         raise RequestError("Invalid JSON response") from exc
+                    if self.cache is not None:
+                        self.cache.store(
+                            cache_key,
+                            url,
+                            response.content,
+                            etag=response.headers.get("ETag"),
+                            last_modified=response.headers.get("Last-Modified"),
+                        )
+                    return data
 
-                logger.warning(
-                    "HTTP GET %s failed status=%d body=%s",
-                    response.url,
-                    response.status_code,
-                    response.text[:200],
-                )
                 last_exc = RequestError(
                     f"Unexpected status code: {response.status_code}"
                 )
+                if response.status_code == 429 and rate_limited < self.rate_limit_retries:
+                    # Rate limits are the server asking us to wait, not a
+                    # failure: retry after exactly the advertised delay
+                    # without spending the regular retry budget.
+                    rate_limited += 1
+                    attempt -= 1
+                    retry_after = self._retry_after(response)
+                    logger.warning(
+                        "HTTP GET %s rate limited; retry after %.3fs",
+                        response.url,
+                        retry_after if retry_after is not None else sleep_time,
+                    )
+                    if self.rate_limiter is not None and retry_after is not None:
+                        # The limiter already blocks this bucket until reset.
+                        if "Retry-After" not in response.headers:
+                            self.rate_limiter.update(
+                                route, {"Retry-After": str(retry_after)}, 429
+                            )
+                        sleep_time = 0.0
+                    elif retry_after is not None:
+                        sleep_time = retry_after
+                else:
+                    logger.warning(
+                        "HTTP GET %s failed status=%d body=%s",
+                        response.url,
+                        response.status_code,
+                        response.text[:200],
+                    )
             except (requests.Timeout, requests.ConnectionError) as exc:
                 logger.warning("Request to %s failed: %s", url, exc)
+                _TRANSPORT_ERRORS.inc()
                 last_exc = exc
 
             if attempt <= self.retries:
-                sleep_time = self.backoff_factor * (2 ** (attempt - 1))
+                _RETRIES.inc()
+            if attempt <= self.retries and sleep_time > 0:
                 logger.debug("Retrying in %.2f seconds", sleep_time)
                 time.sleep(sleep_time)
 
         logger.error("All retries failed for URL %s", url)
         if isinstance(last_exc, RequestError):
             raise last_exc
-        raise RequestError(str(last_exc) if last_exc else "Request failed")
\ No newline at end of file
+        raise RequestError(str(last_exc) if last_exc else "Request failed")
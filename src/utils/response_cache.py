@@ -0,0 +1,156 @@
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, NamedTuple, Optional
+from urllib.parse import urlencode
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    body BLOB NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    stored_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_responses_accessed_at ON responses (accessed_at);
+"""
+
+class CachedResponse(NamedTuple):
+    body: bytes
+    etag: Optional[str]
+    last_modified: Optional[str]
+    stored_at: float
+
+class ResponseCache:
+    """
+    Persistent SQLite cache for successful GET responses.
+
+    Entries are keyed by URL plus normalized query parameters. Entries
+    younger than ``ttl_seconds`` are served without touching the network;
+    older ones are revalidated with ``If-None-Match`` /
+    ``If-Modified-Since`` when the server supplied validators. The total
+    body size is capped at ``max_bytes`` with least-recently-used
+    eviction.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        ttl_seconds: float = 3600.0,
+        max_bytes: int = 256 * 1024 * 1024,
+        clock=time.time,
+    ) -> None:
+        self.path = Path(path)
+        self.ttl_seconds = max(0.0, ttl_seconds)
+        self.max_bytes = max(0, max_bytes)
+        self._clock = clock
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        row = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()
+        self._total_bytes = int(row[0])
+
+    @staticmethod
+    def key_for(url: str, params: Optional[Dict[str, Any]] = None) -> str:
+        normalized = sorted(
+            (str(k), str(v)) for k, v in (params or {}).items() if v is not None
+        )
+        raw = f"{url}?{urlencode(normalized)}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def lookup(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, etag, last_modified, stored_at FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE responses SET accessed_at = ? WHERE key = ?", (self._clock(), key)
+            )
+            self._conn.commit()
+        return CachedResponse(bytes(row[0]), row[1], row[2], row[3])
+
+    def is_fresh(self, entry: CachedResponse) -> bool:
+        return self._clock() - entry.stored_at < self.ttl_seconds
+
+    def conditional_headers(self, entry: CachedResponse) -> Dict[str, str]:
+        headers: Dict[str, str] = {}
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def store(
+        self,
+        key: str,
+        url: str,
+        body: bytes,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> None:
+        size = len(body)
+        if self.max_bytes and size > self.max_bytes:
+            logger.debug("Response for %s larger than cache; not storing", url)
+            return
+
+        now = self._clock()
+        with self._lock:
+            previous = self._conn.execute(
+                "SELECT size FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, url, body, etag, last_modified, stored_at, accessed_at, size) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, url, sqlite3.Binary(body), etag, last_modified, now, now, size),
+            )
+            self._total_bytes += size - (previous[0] if previous else 0)
+            self._evict_locked()
+            self._conn.commit()
+
+    def refresh(self, key: str) -> None:
+        """
+        Mark an entry as fresh again after a ``304 Not Modified``.
+        """
+        now = self._clock()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE responses SET stored_at = ?, accessed_at = ? WHERE key = ?",
+                (now, now, key),
+            )
+            self._conn.commit()
+
+    def _evict_locked(self) -> None:
+        if not self.max_bytes or self._total_bytes <= self.max_bytes:
+            return
+        cursor = self._conn.execute(
+            "SELECT key, size FROM responses ORDER BY accessed_at ASC"
+        )
+        evicted = []
+        for key, size in cursor:
+            if self._total_bytes <= self.max_bytes:
+                break
+            evicted.append((key,))
+            self._total_bytes -= size
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", evicted)
+        logger.debug("Evicted %d cached responses", len(evicted))
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,53 @@
+"""
+Test doubles shared by the HTTP, rate-limit and scheduling tests.
+"""
+import json
+
+class FakeClock:
+    """Manually advanced clock; ``sleep`` records the wait and advances it."""
+
+    def __init__(self, now: float = 0.0) -> None:
+        self.now = now
+        self.sleeps = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+class FakeResponse:
+    """Canned ``requests`` response; ``body=None`` means an empty body."""
+
+    def __init__(self, status_code=200, body=None, headers=None):
+        self.status_code = status_code
+        self._body = body
+        self.headers = headers or {}
+        self.url = "https://example.com/api/search"
+        self.content = json.dumps(body).encode("utf-8") if body is not None else b""
+        self.text = self.content.decode("utf-8")
+
+    def json(self):
+        if self._body is None:
+            raise ValueError("no body")
+        return self._body
+
+    def close(self):
+        pass
+
+class FakeSession:
+    """Answers ``get`` with ``responses`` in order, recording each call."""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.calls = 0
+        self.sent_headers = []
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        self.calls += 1
+        self.sent_headers.append(dict(headers or {}))
+        return self.responses.pop(0)
+
+    def close(self):
+        pass
@@ -0,0 +1,66 @@
+import sys
+import threading
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from utils.adaptive import AdaptiveLimiter  # noqa: E402
+from utils.request_handler import RequestHandler  # noqa: E402
+
+from fakes import FakeClock, FakeResponse, FakeSession  # noqa: E402
+
+def _cycle(limiter, latency=0.01, overloaded=False):
+    limiter.acquire()
+    limiter.release(latency, overloaded=overloaded)
+
+def test_limiter_increases_additively_and_decreases_multiplicatively():
+    clock = FakeClock()
+    limiter = AdaptiveLimiter(initial=4, max_limit=10, cooldown=1.0, clock=clock)
+    for _ in range(10):
+        _cycle(limiter)
+    assert int(limiter.limit) == 6  # roughly +1 per round of `limit` requests
+
+    clock.now = 10.0
+    _cycle(limiter, overloaded=True)
+    _cycle(limiter, overloaded=True)  # same overload, inside the cooldown
+    assert int(limiter.limit) == 3
+
+    clock.now = 12.0
+    for _ in range(200):
+        _cycle(limiter)
+    assert limiter.limit == 10
+
+def test_limiter_backs_off_when_latency_rises():
+    clock = FakeClock()
+    limiter = AdaptiveLimiter(initial=8, latency_tolerance=2.0, cooldown=0.0, clock=clock)
+    for _ in range(50):
+        _cycle(limiter, latency=0.010)
+    before = limiter.limit
+    for _ in range(10):
+        _cycle(limiter, latency=0.100)
+    assert limiter.limit < before / 2
+
+def test_limiter_blocks_at_the_limit():
+    limiter = AdaptiveLimiter(initial=1, max_limit=1)
+    limiter.acquire()
+    acquired = threading.Event()
+    waiter = threading.Thread(target=lambda: (limiter.acquire(), acquired.set()))
+    waiter.start()
+    assert not acquired.wait(0.05)
+    limiter.release(None)
+    assert acquired.wait(1)
+    waiter.join()
+
+def test_request_handler_reports_overload_to_limiter(monkeypatch):
+    monkeypatch.setattr("utils.request_handler.time.sleep", lambda s: None)
+    limiter = AdaptiveLimiter(initial=8, cooldown=0.0)
+    handler = RequestHandler(retries=1, concurrency=limiter)
+    handler.session = FakeSession(
+        FakeResponse(status, {}, {"Retry-After": "0"}) for status in (429, 503, 200)
+    )
+    assert handler.get("https://example.com/api/search") == {}
+    assert int(limiter.limit) == 2 and limiter.in_flight == 0
@@ -9,6 +9,7 @@ if str(SRC) not in sys.path:
     sys.path.insert(0, str(SRC))
 
 from client.discord_api import DiscordDiscoveryClient  # noqa: E402
+from client.novelty import NoveltyTracker  # noqa: E402
 from client.paginator import DiscoveryPaginator  # noqa: E402
 
 class DummyHandler:
@@ -59,4 +60,71 @@ def test_discovery_paginator_respects_max_results():
     results = paginator.paginate_search("test", limit_per_page=5, max_results=7)
     assert len(results) == 7
     assert results[0]["id"] == "0"
-    assert results[-1]["id"] == "6"
\ No newline at end of file
+    assert results[-1]["id"] == "6"
+
+class OffsetHandler:
+    """Thread-safe handler serving ``total`` guilds by offset."""
+
+    def __init__(self, total: int) -> None:
+        self.total = total
+        self.offsets: List[int] = []
+
+    def get(self, url: str, params=None, headers=None) -> Dict[str, Any]:
+        offset, limit = params["offset"], params["limit"]
+        self.offsets.append(offset)
+        end = min(offset + limit, self.total)
+        return {"guilds": [{"id": str(i)} for i in range(offset, end)]}
+
+def test_discovery_paginator_prefetch_returns_pages_in_order():
+    handler = OffsetHandler(total=23)
+    client = DiscordDiscoveryClient(handler, base_url="https://example.com/api")
+    paginator = DiscoveryPaginator(client, prefetch=3)
+    try:
+        results = paginator.paginate_search("test", limit_per_page=5, max_results=100)
+    finally:
+        paginator.close()
+
+    assert [g["id"] for g in results] == [str(i) for i in range(23)]
+    # Never speculates past the configured window beyond the last page.
+    assert max(handler.offsets) <= 20 + 3 * 5
+
+def test_discovery_paginator_prefetch_respects_max_results():
+    handler = OffsetHandler(total=1000)
+    client = DiscordDiscoveryClient(handler, base_url="https://example.com/api")
+    paginator = DiscoveryPaginator(client, prefetch=4)
+    try:
+        results = paginator.paginate_search("test", limit_per_page=10, max_results=35)
+    finally:
+        paginator.close()
+
+    assert len(results) == 35
+    assert max(handler.offsets) == 30
+
+def test_discovery_paginator_iter_guilds_is_lazy():
+    handler = OffsetHandler(total=50)
+    client = DiscordDiscoveryClient(handler, base_url="https://example.com/api")
+    paginator = DiscoveryPaginator(client)
+
+    guilds = paginator.iter_guilds("test", limit_per_page=10, max_results=50)
+    first = [next(guilds) for _ in range(10)]
+    assert [g["id"] for g in first] == [str(i) for i in range(10)]
+    assert handler.offsets == [0]
+
+    rest = list(guilds)
+    assert len(rest) == 40
+    assert handler.offsets == [0, 10, 20, 30, 40]
+
+def test_discovery_paginator_stops_when_pages_bring_nothing_new():
+    handler = OffsetHandler(total=1000)
+    client = DiscordDiscoveryClient(handler, base_url="https://example.com/api")
+    paginator = DiscoveryPaginator(client)
+    novelty = NoveltyTracker(threshold=0.5, patience=2)
+
+    seen = {str(i) for i in range(10, 1000)}  # everything past the first page is known
+    for _, page in paginator.iter_pages("test", limit_per_page=10, max_results=100, novelty=novelty):
+        new = [g for g in page if g["id"] not in seen]
+        seen.update(g["id"] for g in page)
+        novelty.record(len(new), len(page))
+
+    assert handler.offsets == [0, 10, 20]
+    assert novelty.requests_saved == 7
@@ -0,0 +1,75 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+import main  # noqa: E402
+from client.discord_api import DiscordDiscoveryClient  # noqa: E402
+from storage.archive import PageArchive, iter_records, list_chunks  # noqa: E402
+
+def test_archive_rotates_chunks_and_never_overwrites(tmp_path):
+    archive = PageArchive(tmp_path, chunk_pages=2)
+    for offset in range(0, 50, 10):
+        archive.write("ai", None, offset, [{"id": str(offset)}])
+    archive.close()
+    PageArchive(tmp_path, chunk_pages=2).write("ai", 5, 0, [])
+
+    chunks = list_chunks(tmp_path)
+    assert [p.name for p in chunks] == [
+        "chunk-000001.ndjson.gz",
+        "chunk-000002.ndjson.gz",
+        "chunk-000003.ndjson.gz",
+    ]
+    records = [r for chunk in chunks for r in iter_records(chunk)]
+    assert [r["offset"] for r in records] == [0, 10, 20, 30, 40]
+    assert records[0]["keyword"] == "ai" and records[0]["body"] == [{"id": "0"}]
+    # The unclosed second archive left a partial chunk with the next number.
+    assert (tmp_path / "chunk-000004.ndjson.gz.part").exists()
+
+def test_replay_rebuilds_live_output_without_network(tmp_path, monkeypatch):
+    def search_guilds(self, keyword, limit=100, offset=0, category_id=None):
+        return [
+            {"id": str(offset + i), "name": f" {keyword} ", "approximate_member_count": str(i)}
+            for i in range(limit)
+        ]
+
+    monkeypatch.setattr(DiscordDiscoveryClient, "search_guilds", search_guilds)
+    settings = {
+        "max_results_per_keyword": 30,
+        "results_per_page": 10,
+        "output_path": "live.json",
+        "checkpoint": {"enabled": False},
+        "metrics": {"enabled": False},
+        "archive": {"enabled": True, "dir": "archive", "chunk_pages": 2},
+    }
+    live = main.run_scraper(["a", "b"], settings, root_dir=tmp_path)
+    assert len(list_chunks(tmp_path / "archive")) == 3
+
+    def offline(*args, **kwargs):
+        raise AssertionError("replay must not hit the network")
+
+    monkeypatch.setattr(DiscordDiscoveryClient, "search_guilds", offline)
+    replayed = main.run_replay([], {**settings, "output_path": "replayed.json"}, tmp_path, processes=2)
+
+    assert replayed == live
+    assert main.json.loads((tmp_path / "replayed.json").read_text()) == replayed
+    assert live[0]["name"] == "a" and live[0]["approximate_member_count"] == 0
+
+def test_replay_keeps_latest_observation_in_every_format(tmp_path):
+    for members in (100, 999):
+        archive = PageArchive(tmp_path / "archive")
+        archive.write("ai", None, 0, [{"id": "1", "name": "g", "approximate_member_count": members}])
+        archive.close()
+
+    settings = {"output_path": "out.json", "archive": {"dir": "archive"}}
+    as_json = main.run_replay([], settings, tmp_path, processes=2)
+    settings = {**settings, "output_format": "ndjson", "ndjson": {"path": "out.ndjson"}}
+    main.run_replay([], settings, tmp_path, processes=1)
+    as_ndjson = [main.json.loads(line) for line in (tmp_path / "out.ndjson").read_text().splitlines()]
+
+    assert [g["approximate_member_count"] for g in as_json] == [999]
+    assert [g["approximate_member_count"] for g in as_ndjson] == [999]
@@ -0,0 +1,107 @@
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+import main  # noqa: E402
+from client.discord_api import DiscordDiscoveryClient  # noqa: E402
+from storage.ndjson_sink import read_ndjson  # noqa: E402
+from utils.checkpoint import Checkpoint  # noqa: E402
+
+SETTINGS = {
+    "max_results_per_keyword": 30,
+    "results_per_page": 10,
+    "output_format": "ndjson",
+    "ndjson": {"path": "out.ndjson"},
+    "checkpoint": {"path": "checkpoint.json", "interval": 0},
+}
+
+def fake_search(calls, fail_at=None):
+    def search_guilds(self, keyword, limit=100, offset=0, category_id=None):
+        if (keyword, offset) == fail_at:
+            raise KeyboardInterrupt
+        calls.append((keyword, offset))
+        return [{"id": f"{keyword}-{offset + i}"} for i in range(limit)]
+
+    return search_guilds
+
+def test_checkpoint_round_trip(tmp_path):
+    checkpoint = Checkpoint(tmp_path / "cp.json")
+    checkpoint.mark_completed("a")
+    checkpoint.record_page("b", 200)
+    checkpoint.save(lambda: (["1", "2"], {"output": 42}))
+
+    loaded = Checkpoint.load(tmp_path / "cp.json")
+    assert loaded.is_completed("a")
+    assert loaded.resume_offset("b") == 200
+    assert loaded.seen_ids == ["1", "2"]
+    assert loaded.sizes == {"output": 42}
+
+def test_resume_skips_finished_work(tmp_path, monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        DiscordDiscoveryClient, "search_guilds", fake_search(calls, fail_at=("b", 20))
+    )
+    with pytest.raises(KeyboardInterrupt):
+        main.run_scraper(["a", "b", "c"], SETTINGS, root_dir=tmp_path)
+    assert (tmp_path / "checkpoint.json").exists()
+
+    calls.clear()
+    monkeypatch.setattr(DiscordDiscoveryClient, "search_guilds", fake_search(calls))
+    main.run_scraper(["a", "b", "c"], SETTINGS, root_dir=tmp_path, resume=True)
+
+    assert calls == [("b", 20), ("c", 0), ("c", 10), ("c", 20)]
+    lines = (tmp_path / "out.ndjson").read_text(encoding="utf-8").splitlines()
+    ids = [json.loads(line)["id"] for line in lines]
+    assert len(ids) == len(set(ids)) == 90
+    assert not (tmp_path / "checkpoint.json").exists()
+
+@pytest.mark.parametrize("compression", [None, "gzip"])
+def test_resume_after_hard_crash_has_no_duplicates(tmp_path, monkeypatch, compression):
+    settings = {**SETTINGS, "ndjson": {"path": "out.ndjson", "compression": compression}}
+    checkpoint_path = tmp_path / "checkpoint.json"
+    crashed = {}
+    search = fake_search([])
+
+    def crashing_search(self, keyword, limit=100, offset=0, category_id=None):
+        if (keyword, offset) == ("b", 10):
+            # A SIGKILL here would leave the checkpoint saved after page
+            # ("b", 0), while the partial file goes on to get more records.
+            crashed["checkpoint"] = checkpoint_path.read_bytes()
+        if (keyword, offset) == ("b", 20):
+            raise KeyboardInterrupt
+        return search(self, keyword, limit, offset, category_id)
+
+    monkeypatch.setattr(DiscordDiscoveryClient, "search_guilds", crashing_search)
+    with pytest.raises(KeyboardInterrupt):
+        main.run_scraper(["a", "b", "c"], settings, root_dir=tmp_path)
+    checkpoint_path.write_bytes(crashed["checkpoint"])
+    assert Checkpoint.load(checkpoint_path).resume_offset("b") == 10
+
+    calls = []
+    monkeypatch.setattr(DiscordDiscoveryClient, "search_guilds", fake_search(calls))
+    main.run_scraper(["a", "b", "c"], settings, root_dir=tmp_path, resume=True)
+
+    assert calls[0] == ("b", 10)
+    output = tmp_path / ("out.ndjson.gz" if compression else "out.ndjson")
+    ids = [record["id"] for record in read_ndjson(output)]
+    assert len(ids) == len(set(ids)) == 90
+
+def test_resume_refuses_json_output(tmp_path):
+    settings = {**SETTINGS, "output_format": "json"}
+    with pytest.raises(SystemExit):
+        main.run_scraper(["a"], settings, root_dir=tmp_path, resume=True)
+
+def test_json_output_does_not_checkpoint(tmp_path, monkeypatch):
+    monkeypatch.setattr(DiscordDiscoveryClient, "search_guilds", fake_search([], fail_at=("a", 10)))
+    settings = {**SETTINGS, "output_format": "json", "output_path": "out.json"}
+    with pytest.raises(KeyboardInterrupt):
+        main.run_scraper(["a"], settings, root_dir=tmp_path)
+    assert not (tmp_path / "checkpoint.json").exists()
@@ -0,0 +1,40 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from utils.codec import DecodeError, available_codecs, get_codec  # noqa: E402
+
+CODECS = sorted(available_codecs())
+
+@pytest.mark.parametrize("name", CODECS)
+def test_codec_round_trip_is_compact_utf8(name):
+    codec = get_codec(name)
+    payload = {"id": "1", "name": "Café ☕", "features": ["COMMUNITY"], "count": 2**40}
+
+    encoded = codec.dumps(payload)
+    assert isinstance(encoded, bytes)
+    assert b"\n" not in encoded
+    assert "Café ☕".encode("utf-8") in encoded
+    assert codec.loads(encoded) == payload
+
+    indented = codec.dumps([payload], indent=2)
+    assert b"\n  " in indented
+    assert codec.loads(indented) == [payload]
+
+@pytest.mark.parametrize("name", CODECS)
+def test_codec_decode_error_is_value_error(name):
+    with pytest.raises(DecodeError):
+        get_codec(name).loads(b"{not json")
+    assert issubclass(DecodeError, ValueError)
+
+def test_stdlib_codec_is_always_available():
+    assert "json" in CODECS
+    with pytest.raises(ValueError):
+        get_codec("no-such-codec")
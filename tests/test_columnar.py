@@ -0,0 +1,91 @@
+import gzip
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from storage.columnar import ColumnarSnapshot, write_snapshot  # noqa: E402
+from storage.ndjson_sink import read_ndjson  # noqa: E402
+
+np = pytest.importorskip("numpy")
+
+def _guild(gid, members, presence, category_id, locale="en-US", features=("COMMUNITY",)):
+    category = {"id": category_id, "is_primary": True, "name": f"cat {category_id}", "name_localizations": {}}
+    return {
+        "id": gid,
+        "name": f"guild {gid}",
+        "approximate_member_count": members,
+        "approximate_presence_count": presence,
+        "premium_subscription_count": 2,
+        "preferred_locale": locale,
+        "primary_category_id": category_id,
+        "primary_category": category,
+        "is_published": True,
+        "features": list(features),
+        "keywords": ["ai"],
+    }
+
+@pytest.fixture
+def snapshot(tmp_path):
+    guilds = [
+        _guild("1", 1000, 100, 5),
+        _guild("2", 5000, 2500, 5, locale="de", features=()),
+        _guild("3", 200, 150, 7, features=("COMMUNITY", "VERIFIED")),
+        _guild("4", None, None, None, locale=None),
+        _guild("5", 5000, 10, 7),
+    ]
+    write_snapshot(tmp_path / "snap", guilds)
+    return ColumnarSnapshot(tmp_path / "snap")
+
+def test_columns_are_plain_npy_files(snapshot):
+    members = np.load(snapshot.path / "approximate_member_count.npy")
+    assert members.dtype == np.int64
+    assert members[:3].tolist() == [1000, 5000, 200]
+    assert isinstance(snapshot.column("approximate_member_count"), np.memmap)
+
+def test_where_filters_and_skips_missing_values(snapshot):
+    mask = snapshot.where(approximate_member_count=(500, None), preferred_locale="en-US")
+    assert np.flatnonzero(mask).tolist() == [0, 4]
+    assert np.flatnonzero(snapshot.where(features="VERIFIED")).tolist() == [2]
+    assert np.flatnonzero(snapshot.where(primary_category_id=[7])).tolist() == [2, 4]
+    assert not snapshot.where(preferred_locale="fr").any()
+
+def test_top_k_ranks_by_value_then_row(snapshot):
+    assert snapshot.top_k("approximate_member_count", k=2).tolist() == [1, 4]
+    top_ratio = snapshot.top_k("presence_ratio", k=1, mask=snapshot.where(primary_category_id=7))
+    assert snapshot.rows(top_ratio, ["id", "presence_ratio"]) == [{"id": "3", "presence_ratio": 0.75}]
+
+def test_group_by_category_aggregates(snapshot):
+    groups = snapshot.group_by_category()
+    assert [(g["category_id"], g["name"], g["guilds"], g["total"]) for g in groups] == [
+        (5, "cat 5", 2, 6000.0),
+        (7, "cat 7", 2, 5200.0),
+    ]
+    assert groups[0]["mean"] == 3000.0
+
+def test_rows_round_trip(snapshot):
+    row = snapshot.rows([3])[0]
+    assert row["id"] == "4"
+    assert row["approximate_member_count"] is None
+    assert row["preferred_locale"] is None
+    assert row["features"] == ["COMMUNITY"]
+    assert row["is_published"] is True
+
+def test_rewrite_replaces_snapshot_and_reads_gzip_ndjson(tmp_path):
+    path = tmp_path / "out.ndjson.gz"
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        f.write(json.dumps(_guild("9", 10, 1, 3)) + "\n")
+    write_snapshot(tmp_path / "snap", [_guild("1", 1, 1, 1), _guild("2", 2, 2, 2)])
+    write_snapshot(tmp_path / "snap", read_ndjson(path))
+
+    snapshot = ColumnarSnapshot(tmp_path / "snap")
+    assert len(snapshot) == 1
+    assert snapshot.rows([0], ["id"]) == [{"id": "9"}]
+    assert not (tmp_path / "snap.tmp").exists()
@@ -0,0 +1,83 @@
+import sys
+import threading
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from processors.collector import GuildCollector  # noqa: E402
+from utils.concurrency import run_bounded  # noqa: E402
+
+def test_run_bounded_processes_every_item():
+    results = [f.result() for f in run_bounded(lambda x: x * 2, range(50), workers=4)]
+    assert sorted(results) == [x * 2 for x in range(50)]
+
+def test_run_bounded_limits_in_flight_items():
+    lock = threading.Lock()
+    state = {"active": 0, "peak": 0}
+    release = threading.Event()
+
+    def work(_):
+        with lock:
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+        release.wait(0.01)
+        with lock:
+            state["active"] -= 1
+
+    for future in run_bounded(work, range(40), workers=3):
+        future.result()
+    assert state["peak"] <= 3
+
+def test_guild_collector_deduplicates_across_threads():
+    collector = GuildCollector()
+
+    def work(offset):
+        return collector.add({"id": str(i)} for i in range(offset, offset + 100))
+
+    new_counts = [f.result() for f in run_bounded(work, range(0, 500, 50), workers=8)]
+    assert len(collector) == 550
+    assert sum(new_counts) == 550
+
+def test_guild_collector_skips_guilds_without_id():
+    collector = GuildCollector()
+    assert collector.add([{"name": "no id"}, {"id": "1"}]) == 1
+    assert [g["id"] for g in collector.values()] == ["1"]
+
+class BlockingSink:
+    """Holds the write of guild ``slow`` until released."""
+
+    def __init__(self):
+        self.entered = threading.Event()
+        self.release = threading.Event()
+        self.written = []
+
+    def write(self, guild):
+        if guild["id"] == "slow":
+            self.entered.set()
+            self.release.wait(5)
+        self.written.append(guild["id"])
+
+def test_guild_collector_writes_sinks_outside_its_lock():
+    sink = BlockingSink()
+    collector = GuildCollector(sinks=[sink], keep_records=False)
+    slow = threading.Thread(target=collector.add, args=([{"id": "slow"}],))
+    slow.start()
+    assert sink.entered.wait(5)
+
+    # Another worker's merge is not stuck behind the slow write...
+    assert collector.add([{"id": "fast"}]) == 1
+    # ...but a checkpoint sync waits until every decided guild is written.
+    synced = []
+    syncer = threading.Thread(target=lambda: synced.append(collector.sync()))
+    syncer.start()
+    syncer.join(0.05)
+    assert syncer.is_alive()
+
+    sink.release.set()
+    slow.join()
+    syncer.join()
+    assert sorted(synced[0][0]) == sorted(sink.written) == ["fast", "slow"]
@@ -0,0 +1,75 @@
+import sys
+import threading
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from utils.hedging import HedgePolicy  # noqa: E402
+from utils.metrics import METRICS  # noqa: E402
+from utils.request_handler import RequestHandler  # noqa: E402
+
+from fakes import FakeResponse  # noqa: E402
+
+class SlowFirstSession:
+    """The first request hangs until released; later ones answer at once."""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        with self._lock:
+            self.calls += 1
+            call = self.calls
+        if call == 1:
+            self.release.wait(5)
+        return FakeResponse(200, {"call": call})
+
+    def close(self):
+        self.release.set()
+
+def test_hedge_policy_warms_up_and_caps_ratio():
+    policy = HedgePolicy(quantile=0.95, max_ratio=0.5, min_delay=0.001, min_samples=10)
+    assert policy.delay() is None
+    for i in range(20):
+        policy.record(0.010 if i < 19 else 1.0)
+    assert 0.009 < policy.delay() < 0.011
+
+    assert not policy.try_acquire()
+    for _ in range(4):
+        policy.note_request()
+    assert policy.try_acquire() and policy.try_acquire()
+    assert not policy.try_acquire()
+
+def _hedging_handler(max_ratio):
+    policy = HedgePolicy(max_ratio=max_ratio, min_delay=0.01, min_samples=1)
+    policy.record(0.001)
+    handler = RequestHandler(retries=0, hedge=policy)
+    handler.session = SlowFirstSession()
+    return handler
+
+def test_request_handler_hedge_answers_first():
+    METRICS.reset()
+    handler = _hedging_handler(max_ratio=1.0)
+    try:
+        assert handler.get("https://example.com/api/search") == {"call": 2}
+    finally:
+        handler.close()
+    assert METRICS.counter("http_hedges_sent_total").value == 1
+    assert METRICS.counter("http_hedges_won_total").value == 1
+
+def test_request_handler_respects_hedge_ratio():
+    METRICS.reset()
+    handler = _hedging_handler(max_ratio=0.0)
+    threading.Timer(0.05, handler.session.release.set).start()
+    try:
+        assert handler.get("https://example.com/api/search") == {"call": 1}
+    finally:
+        handler.close()
+    assert handler.session.calls == 1
+    assert METRICS.counter("http_hedges_sent_total").value == 0
@@ -0,0 +1,56 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from main import load_keywords  # noqa: E402
+from utils.keyword_source import (  # noqa: E402
+    KeywordSource,
+    KeywordYields,
+    SeenSet,
+    keyword_hash,
+    normalize_keyword,
+    unique_keywords,
+)
+
+def test_normalize_keyword_folds_case_width_and_whitespace():
+    assert normalize_keyword("AI") == normalize_keyword(" ai ") == normalize_keyword("Ａｉ") == "ai"
+    assert normalize_keyword("Machine \t  LEARNING\n") == "machine learning"
+    assert normalize_keyword("Straße") == normalize_keyword("STRASSE")
+    assert list(unique_keywords(["AI", "ai ", "Ai", "", "art"])) == ["ai", "art"]
+
+def test_seen_set_grows_and_deduplicates():
+    seen = SeenSet(capacity=4)
+    values = [keyword_hash(f"keyword {i}") for i in range(5000)]
+    assert all(seen.add(v) for v in values)
+    assert not any(seen.add(v) for v in values)
+    assert len(seen) == 5000 and values[1234] in seen and keyword_hash("other") not in seen
+
+def test_keyword_source_streams_and_orders_by_previous_yield(tmp_path):
+    path = tmp_path / "keywords.txt"
+    path.write_text("Gaming\nart\n\nAI\ngaming \nmusic\nai\n", encoding="utf-8")
+
+    source = KeywordSource(path)
+    assert list(source) == ["gaming", "art", "ai", "music"]
+    assert source.duplicates == 2
+
+    yields = KeywordYields(tmp_path / "yield.json")
+    yields.record("music", 50)
+    yields.record("ai", 10)
+    yields.record("art", 0)
+    yields.record("removed", 99)
+    yields.save()
+
+    ordered = KeywordSource(path, yields=KeywordYields(tmp_path / "yield.json"))
+    assert list(ordered) == ["music", "ai", "gaming", "art"]
+    assert ordered.duplicates == 2
+
+def test_load_keywords_falls_back_to_default(tmp_path):
+    assert list(load_keywords(tmp_path / "missing.txt")) == ["discord"]
+    empty = tmp_path / "empty.txt"
+    empty.write_text("\n  \n", encoding="utf-8")
+    assert list(load_keywords(empty)) == ["discord"]
@@ -0,0 +1,80 @@
+import json
+import logging
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from utils import logger as log_config  # noqa: E402
+
+@pytest.fixture
+def configured():
+    root = logging.getLogger()
+    level, handlers = root.level, list(root.handlers)
+    yield log_config.configure_logging
+    log_config._stop_listener()
+    for handler in log_config._INSTALLED:
+        root.removeHandler(handler)
+    log_config._INSTALLED.clear()
+    log_config._SAMPLER = None
+    root.setLevel(level)
+    assert root.handlers == handlers
+
+def test_async_json_logging_writes_structured_lines(configured, capsys):
+    configured(level="DEBUG", use_async=True, fmt="json")
+    log = log_config.get_logger("tests.async")
+    log.info("Fetched page offset=%d", 100, extra={"keyword": "ai"})
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        log.exception("Failed")
+    log_config._stop_listener()
+
+    lines = [json.loads(line) for line in capsys.readouterr().err.splitlines()]
+    assert lines[0]["msg"] == "Fetched page offset=100"
+    assert lines[0]["level"] == "INFO" and lines[0]["keyword"] == "ai"
+    assert lines[1]["level"] == "ERROR" and "ValueError: boom" in lines[1]["exc"]
+
+def test_debug_sampling_keeps_one_in_n_per_call_site(configured, capsys):
+    configured(level="DEBUG", sample_debug=10)
+    log = log_config.get_logger("tests.sampled")
+    for i in range(25):
+        log.debug("per guild %d", i)
+        log.info("per page %d", i)
+    err = capsys.readouterr().err
+    assert [line.rsplit(" ", 1)[1] for line in err.splitlines() if "per guild" in line] == ["0", "10", "20"]
+    assert err.count("per page") == 25
+
+def test_rate_limit_suppresses_bursts_but_not_warnings(configured, capsys):
+    configured(level="INFO", rate_limit=5)
+    log = log_config.get_logger("tests.limited")
+    for i in range(20):
+        log.info("Fetching page %d", i)
+        log.warning("warn %d", i)
+    err = capsys.readouterr().err
+    assert err.count("Fetching page") == 5
+    assert err.count("warn") == 20
+
+    limiter = log_config.RateLimitFilter(1)
+    records = [logging.LogRecord("x", logging.INFO, "f.py", 1, "m", (), None) for _ in range(5)]
+    assert [limiter.filter(r) for r in records[:4]] == [True, False, False, False]
+    limiter._buckets[("f.py", 1)][0] = 1.0  # a second later
+    assert limiter.filter(records[4]) and records[4].suppressed == 3
+
+def test_get_logger_leaves_global_logging_alone(configured, caplog):
+    configured(level="DEBUG")
+    assert logging.getLoggerClass() is logging.Logger
+
+    log = log_config.get_logger("tests.adapter")
+    assert log.logger is logging.getLogger("tests.adapter")
+    with caplog.at_level(logging.DEBUG, logger="tests.adapter"):
+        log.debug("per guild", extra={"keyword": "ai"})
+    (record,) = caplog.records
+    assert record.pathname == __file__ and record.funcName == "test_get_logger_leaves_global_logging_alone"
+    assert record.keyword == "ai"
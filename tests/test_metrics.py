@@ -0,0 +1,66 @@
+import json
+import logging
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+import main  # noqa: E402
+from client.discord_api import DiscordDiscoveryClient  # noqa: E402
+from utils.metrics import METRICS, Histogram, MetricsRegistry  # noqa: E402
+
+def test_histogram_percentiles_are_within_a_few_percent():
+    hist = Histogram()
+    for ms in range(1, 1001):
+        hist.record(ms / 1000)
+
+    assert hist.count == 1000
+    assert abs(hist.percentile(0.50) - 0.500) / 0.500 < 0.04
+    assert abs(hist.percentile(0.99) - 0.990) / 0.990 < 0.04
+    assert hist.percentile(1.0) <= hist.max
+
+def test_registry_exports_prometheus_and_json(tmp_path):
+    registry = MetricsRegistry(namespace="test")
+    registry.counter("requests_total", "Requests.", status=200).inc(3)
+    registry.histogram("latency_seconds", "Latency.").record(0.25)
+
+    text = registry.to_prometheus()
+    assert '# TYPE test_requests_total counter' in text
+    assert 'test_requests_total{status="200"} 3' in text
+    assert 'test_latency_seconds_count 1' in text
+
+    registry.write(tmp_path / "metrics.json", fmt="json")
+    snapshot = json.loads((tmp_path / "metrics.json").read_text(encoding="utf-8"))
+    assert snapshot["counters"]["requests_total"][0]["value"] == 3
+
+def test_registry_reset_keeps_cached_handles_live():
+    registry = MetricsRegistry()
+    counter = registry.counter("things_total")
+    counter.inc(5)
+    registry.reset()
+    counter.inc()
+    assert registry.counter("things_total").value == 1
+
+def test_run_summary_reports_only_this_runs_counts(tmp_path, monkeypatch, caplog):
+    def search_guilds(self, keyword, limit=100, offset=0, category_id=None):
+        return [{"id": str(i)} for i in range(limit)]
+
+    monkeypatch.setattr(DiscordDiscoveryClient, "search_guilds", search_guilds)
+    settings = {
+        "max_results_per_keyword": 100,
+        "results_per_page": 10,
+        "output_path": "out.json",
+        "metrics": {"enabled": False},
+        "early_stop": {"enabled": True, "patience": 1},
+    }
+    # Left over from an earlier daemon cycle.
+    METRICS.counter("early_stop_requests_saved_total").inc(1000)
+    with caplog.at_level(logging.INFO):
+        main.run_scraper(["ai"], settings, root_dir=tmp_path)
+
+    (summary,) = [r.getMessage() for r in caplog.records if r.getMessage().startswith("Early stopping")]
+    assert summary == "Early stopping saved 8 page requests"
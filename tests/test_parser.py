@@ -1,4 +1,5 @@
 import json
+import random
 import sys
 from pathlib import Path
 
@@ -10,8 +11,13 @@ SRC = ROOT / "src"
 if str(SRC) not in sys.path:
     sys.path.insert(0, str(SRC))
 
-from processors.parser import parse_guild, parse_guilds  # noqa: E402
-from processors.sanitizer import sanitize_guild, sanitize_guilds  # noqa: E402
+from processors.normalizer import FIELD_NAMES, Guild, normalize_guild  # noqa: E402
+from processors.parser import iter_parse_guilds, parse_guild, parse_guilds  # noqa: E402
+from processors.sanitizer import (  # noqa: E402
+    iter_sanitize_guilds,
+    sanitize_guild,
+    sanitize_guilds,
+)
 
 def load_sample() -> dict:
     data_path = ROOT / "data" / "sample.json"
@@ -61,4 +67,28 @@ def test_int_coercion_failure_drops_field(bad_value):
     raw = load_sample()
     raw["approximate_member_count"] = bad_value
     sanitized = sanitize_guild(raw)
-    assert "approximate_member_count" not in sanitized
\ No newline at end of file
+    assert "approximate_member_count" not in sanitized
+
+def test_iter_pipeline_matches_list_functions():
+    raw = [load_sample(), "not a guild", load_sample()]
+    lazy = iter_sanitize_guilds(iter_parse_guilds(raw))
+    assert not isinstance(lazy, list)
+    assert list(lazy) == sanitize_guilds(parse_guilds(raw))
+
+NOISY_VALUES = [None, "", "  text  ", "12", "abc", 7, 0, 1.9, True, "false", "yes", [], ["a"], ("b",), {"x"}, {}]
+
+def test_normalize_guild_matches_parse_then_sanitize():
+    rng = random.Random(1234)
+    field_names = list(FIELD_NAMES) + ["guild_id", "discovery_keywords", "_highlightResult"]
+    for _ in range(2000):
+        raw = {
+            name: rng.choice(NOISY_VALUES)
+            for name in rng.sample(field_names, rng.randint(0, len(field_names)))
+        }
+        assert normalize_guild(raw).to_dict() == sanitize_guild(parse_guild(raw)), raw
+
+def test_normalize_guild_produces_slotted_record():
+    guild = normalize_guild(load_sample())
+    assert isinstance(guild, Guild)
+    assert not hasattr(guild, "__dict__")
+    assert guild.to_dict() == sanitize_guild(parse_guild(load_sample()))
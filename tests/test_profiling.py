@@ -0,0 +1,70 @@
+import pstats
+import sys
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from utils.profiling import PROFILER, Profiler  # noqa: E402
+
+def _busy(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+def _worker_stage(profiler):
+    with profiler.stage("worker"):
+        _busy(0.01)
+
+def test_stage_is_a_no_op_when_disabled():
+    assert not PROFILER.enabled
+    with PROFILER.stage("fetch"):
+        pass
+    assert PROFILER.stages == {}
+
+def test_profiler_reports_nested_stages(tmp_path):
+    profiler = Profiler()
+    profiler.start(sample_interval=0.001, alloc_every=1, alloc_budget=1.0)
+    kept = []
+    try:
+        for _ in range(3):
+            with profiler.stage("outer"):
+                kept.append([object() for _ in range(1000)])
+                with profiler.stage("inner"):
+                    _busy(0.02)
+    finally:
+        profiler.stop()
+
+    outer, inner = profiler.stages["outer"], profiler.stages["inner"]
+    assert outer.calls == inner.calls == 3
+    assert outer.wall >= inner.wall >= 0.06
+    assert outer.allocated > 0 and outer.site_samples == 3
+    assert any("test_profiling.py" in site for site in outer.sites)
+
+    report = profiler.write_report(tmp_path).read_text(encoding="utf-8")
+    assert "outer" in report and "top allocation sites" in report
+    assert pstats.Stats(str(tmp_path / "inner.prof")).total_calls > 0
+    stacks = (tmp_path / "stacks.collapsed").read_text(encoding="utf-8").splitlines()
+    assert any(line.startswith("stage:inner;") and "_busy" in line for line in stacks)
+
+def test_worker_thread_stages_are_timed_without_cprofile(tmp_path):
+    profiler = Profiler()
+    profiler.start(sample_interval=0.001)
+    try:
+        with profiler.stage("main"):
+            worker = threading.Thread(target=_worker_stage, args=(profiler,))
+            worker.start()
+            worker.join()
+    finally:
+        profiler.stop()
+
+    assert profiler.stages["worker"].calls == 1
+    assert profiler.stages["worker"].wall >= 0.01
+    profiler.write_report(tmp_path)
+    assert (tmp_path / "main.prof").exists()
+    assert not (tmp_path / "worker.prof").exists()
@@ -0,0 +1,63 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from utils.rate_limiter import RateLimiter  # noqa: E402
+from utils.request_handler import RequestHandler  # noqa: E402
+
+from fakes import FakeClock, FakeResponse, FakeSession  # noqa: E402
+
+def make_limiter():
+    clock = FakeClock(100.0)
+    return RateLimiter(clock=clock, sleep=clock.sleep), clock
+
+def test_rate_limiter_does_not_block_unknown_routes():
+    limiter, clock = make_limiter()
+    for _ in range(10):
+        limiter.acquire("/api/v9/discovery/search")
+    assert clock.sleeps == []
+
+def test_rate_limiter_waits_for_bucket_reset():
+    limiter, clock = make_limiter()
+    route = "/api/v9/discovery/search"
+    limiter.update(
+        route,
+        {
+            "X-RateLimit-Bucket": "abc",
+            "X-RateLimit-Limit": "2",
+            "X-RateLimit-Remaining": "1",
+            "X-RateLimit-Reset-After": "1.5",
+        },
+    )
+    limiter.acquire(route)
+    assert clock.sleeps == []
+    limiter.acquire(route)
+    assert clock.sleeps == [1.5]
+
+def test_rate_limiter_honors_retry_after_and_global_scope():
+    limiter, clock = make_limiter()
+    limiter.update("/a", {"Retry-After": "2.25"}, status_code=429)
+    limiter.acquire("/a")
+    assert clock.sleeps == [2.25]
+
+    limiter.update("/a", {"Retry-After": "3", "X-RateLimit-Global": "true"}, status_code=429)
+    limiter.acquire("/b")
+    assert clock.sleeps == [2.25, 3.0]
+
+def test_request_handler_retries_429_without_spending_retries(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr("utils.request_handler.time.sleep", sleeps.append)
+    handler = RequestHandler(retries=0)
+    handler.session = FakeSession(
+        [
+            FakeResponse(429, {"retry_after": 0.75}, {"Retry-After": "0.75"}),
+            FakeResponse(200, {"guilds": []}),
+        ]
+    )
+    assert handler.get("https://example.com/api/search") == {"guilds": []}
+    assert sleeps == [0.75]
@@ -0,0 +1,57 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from utils.request_handler import RequestHandler  # noqa: E402
+from utils.response_cache import ResponseCache  # noqa: E402
+
+from fakes import FakeClock, FakeResponse, FakeSession  # noqa: E402
+
+def test_cache_key_normalizes_param_order():
+    a = ResponseCache.key_for("https://x/search", {"term": "ai", "offset": 0})
+    b = ResponseCache.key_for("https://x/search", {"offset": "0", "term": "ai"})
+    assert a == b
+
+def test_cached_response_served_then_revalidated(tmp_path):
+    clock = FakeClock(1000.0)
+    cache = ResponseCache(tmp_path / "cache.sqlite", ttl_seconds=60, clock=clock)
+    handler = RequestHandler(cache=cache)
+    handler.session = FakeSession(
+        [
+            FakeResponse(200, {"guilds": [{"id": "1"}]}, {"ETag": '"v1"'}),
+            FakeResponse(304),
+        ]
+    )
+    params = {"term": "ai", "offset": 0}
+
+    first = handler.get("https://example.com/api/search", params=params)
+    second = handler.get("https://example.com/api/search", params=params)
+    assert first == second == {"guilds": [{"id": "1"}]}
+    assert len(handler.session.sent_headers) == 1
+
+    clock.now += 120
+    third = handler.get("https://example.com/api/search", params=params)
+    assert third == first
+    assert handler.session.sent_headers[-1]["If-None-Match"] == '"v1"'
+    cache.close()
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    clock = FakeClock(1000.0)
+    cache = ResponseCache(tmp_path / "cache.sqlite", max_bytes=25, clock=clock)
+    cache.store("a", "u", b"x" * 10)
+    clock.now += 1
+    cache.store("b", "u", b"x" * 10)
+    clock.now += 1
+    assert cache.lookup("a") is not None  # "a" is now more recent than "b"
+    clock.now += 1
+    cache.store("c", "u", b"x" * 10)
+
+    assert cache.lookup("b") is None
+    assert cache.lookup("a") is not None
+    assert cache.lookup("c") is not None
+    cache.close()
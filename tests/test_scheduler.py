@@ -0,0 +1,107 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+import main  # noqa: E402
+from client.discord_api import DiscordDiscoveryClient  # noqa: E402
+from scheduler import ChurnScheduler, measure_churn  # noqa: E402
+
+from fakes import FakeClock  # noqa: E402
+
+def test_measure_churn_combines_new_ids_and_member_drift():
+    before = {"1": 100, "2": 100}
+    assert measure_churn(before, dict(before)) == 0.0
+    assert measure_churn(before, {"3": 5, "4": 5}) == 1.0
+    assert measure_churn(before, {"1": 100, "3": 5}) == 0.5
+    assert abs(measure_churn(before, {"1": 102, "2": 98}) - 0.2) < 1e-9
+    assert measure_churn({}, {}) == 0.0
+
+def _pass(scheduler, keyword, ids, pages=1):
+    for _ in range(pages):
+        scheduler.observe(keyword, [{"id": gid, "approximate_member_count": 10} for gid in ids])
+    scheduler.finish([keyword])
+
+def test_scheduler_spaces_out_stable_keywords_and_respects_budget():
+    clock = FakeClock(1000.0)
+    scheduler = ChurnScheduler(
+        ["stable", "churny"], min_interval=60, max_interval=3600,
+        requests_per_hour=10, default_cost=3, clock=clock,
+    )
+    assert scheduler.plan() == ["stable", "churny"]
+    _pass(scheduler, "stable", ["a", "b"], pages=2)
+    _pass(scheduler, "churny", ["c", "d"], pages=2)
+
+    for round_ in range(3):
+        clock.now += 3600
+        assert set(scheduler.plan()) == {"stable", "churny"}
+        _pass(scheduler, "stable", ["a", "b"], pages=2)
+        _pass(scheduler, "churny", [f"x{round_}", f"y{round_}"], pages=2)
+
+    assert scheduler.states["stable"].interval > 3000
+    assert scheduler.states["churny"].interval < 600
+    assert scheduler.states["churny"].next_due < scheduler.states["stable"].next_due
+
+    # With room for one 2-page refresh, the churnier keyword wins.
+    clock.now += 3600
+    scheduler.plan(limit=0)
+    scheduler.tokens = 3
+    assert scheduler.plan() == ["churny"]
+    assert scheduler.tokens == 1
+
+def test_failed_pass_keeps_churn_and_snapshot():
+    clock = FakeClock(1000.0)
+    scheduler = ChurnScheduler(["kw"], min_interval=60, max_interval=3600, clock=clock)
+    scheduler.plan()
+    _pass(scheduler, "kw", ["a", "b"])
+    clock.now += 3600
+    scheduler.plan()
+    _pass(scheduler, "kw", ["a", "b"])
+    state = scheduler.states["kw"]
+    assert state.churn == 0.0
+
+    clock.now += 3600
+    scheduler.plan()
+    scheduler.finish(["kw"])
+    assert state.churn == 0.0 and state.interval == 3600
+    assert state.snapshot == {"a": 10, "b": 10}
+    assert state.next_due == clock.now + 3600
+
+def test_run_daemon_refreshes_due_keywords(tmp_path, monkeypatch):
+    calls = []
+
+    def search_guilds(self, keyword, limit=100, offset=0, category_id=None):
+        calls.append(keyword)
+        return [{"id": f"{keyword}-{offset + i}", "approximate_member_count": 5} for i in range(limit)]
+
+    monkeypatch.setattr(DiscordDiscoveryClient, "search_guilds", search_guilds)
+    clock = FakeClock(1000.0)
+    settings = {
+        "max_results_per_keyword": 20,
+        "results_per_page": 10,
+        "output_format": "ndjson",
+        "ndjson": {"path": "out.ndjson"},
+        "sqlite": {"enabled": True, "path": "guilds.sqlite"},
+        "checkpoint": {"enabled": False},
+        "metrics": {"enabled": False},
+        "daemon": {"min_interval": 60, "max_interval": 600, "requests_per_hour": 100, "state_path": "s.json"},
+    }
+    main.run_daemon(["A", "a ", "b"], settings, tmp_path, max_cycles=3, sleep=clock.sleep, clock=clock)
+
+    # First pass, wait out the initial min_interval, second pass.
+    assert calls == ["a", "a", "b", "b"] * 2
+    assert clock.sleeps == [60.0]
+    state = main.json.loads((tmp_path / "s.json").read_text())
+    assert sorted(state) == ["a", "b"]
+    assert state["a"]["churn"] == 0.0 and state["a"]["interval"] == 600.0
+
+@pytest.mark.parametrize("output_format", ["json", "ndjson"])
+def test_run_daemon_refuses_non_accumulating_output(tmp_path, output_format):
+    with pytest.raises(SystemExit):
+        main.run_daemon(["a"], {"output_format": output_format}, tmp_path, max_cycles=1)
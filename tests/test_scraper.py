@@ -0,0 +1,75 @@
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Dict, List
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from client.discord_api import DiscordDiscoveryClient  # noqa: E402
+from client.fanout import FanoutPlanner  # noqa: E402
+from client.paginator import DiscoveryPaginator  # noqa: E402
+from processors.collector import GuildCollector  # noqa: E402
+from scraper import _KEYWORDS_FAILED, KeywordScraper  # noqa: E402
+from utils.request_handler import RequestError  # noqa: E402
+
+class CategoryHandler:
+    """Every query has 1000 results; category queries return their own guild ids."""
+
+    def __init__(self) -> None:
+        self.queries: List[Dict[str, Any]] = []
+        self.lock = threading.Lock()
+
+    def get(self, url: str, params=None, headers=None) -> Dict[str, Any]:
+        with self.lock:
+            self.queries.append(dict(params))
+        category = params.get("category_id")
+        prefix = f"c{category}-" if category is not None else ""
+        offset, limit = params["offset"], params["limit"]
+        return {
+            "guilds": [
+                {"id": f"{prefix}{i}", "primary_category_id": category if category is not None else i % 3}
+                for i in range(offset, offset + limit)
+            ]
+        }
+
+def make_scraper(handler, **kwargs):
+    client = DiscordDiscoveryClient(handler, base_url="https://example.com/api")
+    collector = GuildCollector()
+    scraper = KeywordScraper(
+        DiscoveryPaginator(client), collector, results_per_page=10, max_results=30, **kwargs
+    )
+    return scraper, collector
+
+def test_keyword_scraper_merges_pages():
+    handler = CategoryHandler()
+    scraper, collector = make_scraper(handler)
+    scraper.scrape("ai")
+    assert len(collector) == 30
+    assert [q["offset"] for q in handler.queries] == [0, 10, 20]
+
+def test_failed_keyword_keeps_pages_fetched_before_the_error():
+    class FailingHandler(CategoryHandler):
+        def get(self, url, params=None, headers=None):
+            if params["offset"] == 20:
+                raise RequestError("boom")
+            return super().get(url, params, headers)
+
+    failed = _KEYWORDS_FAILED.value
+    scraper, collector = make_scraper(FailingHandler())
+    scraper.scrape("ai")
+
+    assert len(collector) == 20
+    assert _KEYWORDS_FAILED.value == failed + 1
+
+def test_saturated_keyword_fans_out_over_seen_categories():
+    handler = CategoryHandler()
+    scraper, collector = make_scraper(handler, fanout=FanoutPlanner(max_categories=2, workers=2))
+    scraper.scrape("ai")
+
+    categories = {q.get("category_id") for q in handler.queries}
+    assert categories == {None, 0, 1}  # top two of the three categories seen
+    assert len(collector) == 30 + 2 * 30
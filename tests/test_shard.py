@@ -0,0 +1,84 @@
+import json
+import sys
+from itertools import count
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from main import parse_args  # noqa: E402
+from storage.shard import (  # noqa: E402
+    ShardError,
+    ShardWriter,
+    iter_partial,
+    merge_partials,
+    parse_shard,
+    shard_for,
+)
+
+def test_parse_shard_and_stable_assignment():
+    assert parse_shard("2/4") == (2, 4)
+    for bad in ("4/4", "-1/4", "1", "a/b", "0/0"):
+        with pytest.raises(ShardError):
+            parse_shard(bad)
+
+    keywords = [f"keyword {i}" for i in range(200)]
+    shards = [shard_for(k, 4) for k in keywords]
+    assert shards == [shard_for(k, 4) for k in keywords]
+    assert set(shards) == {0, 1, 2, 3}
+
+    args = parse_args(["--shard", "1/3"])
+    assert args.shard == (1, 3) and args.command is None
+    assert parse_args(["merge", "a.ndjson"]).partials == [Path("a.ndjson")]
+
+def test_shard_writer_spills_sorted_runs_and_merges(tmp_path):
+    path = tmp_path / "part-000-of-001.ndjson"
+    clock = count(1)
+    writer = ShardWriter(path, run_size=3, clock=lambda: float(next(clock)))
+    for gid in ["5", "1", "4", "2", "9", "3", "7"]:
+        writer.write({"id": gid})
+    writer.flush()
+    assert len(list(tmp_path.glob("*.run*"))) == 3
+    writer.close()
+
+    assert not list(tmp_path.glob("*.run*"))
+    assert [gid for gid, _, _ in iter_partial(path)] == ["1", "2", "3", "4", "5", "7", "9"]
+
+def test_shard_writer_resume_drops_unfinished_spill(tmp_path):
+    path = tmp_path / "part-000-of-001.ndjson"
+    writer = ShardWriter(path, run_size=10)
+    writer.write({"id": "1"})
+    writer.flush()
+    # A crash mid-spill leaves a truncated temp file behind.
+    (tmp_path / "part-000-of-001.ndjson.run1.tmp").write_text('{"observed_at": 1, "gu')
+
+    resumed = ShardWriter(path, run_size=10, append=True)
+    resumed.write({"id": "2"})
+    resumed.close()
+    assert not list(tmp_path.glob("*.tmp"))
+    assert [gid for gid, _, _ in iter_partial(path)] == ["1", "2"]
+
+def _write_partial(path, records):
+    path.write_text("".join(json.dumps({"observed_at": t, "guild": g}) + "\n" for t, g in records))
+
+def test_merge_partials_keeps_newest_observation(tmp_path):
+    a, b = tmp_path / "a.ndjson", tmp_path / "b.ndjson"
+    _write_partial(a, [(10, {"id": "1", "name": "old"}), (10, {"id": "3", "name": "a"})])
+    _write_partial(b, [(20, {"id": "1", "name": "new"}), (10, {"id": "2"}), (10, {"id": "3", "name": "b"})])
+
+    out = tmp_path / "merged.ndjson"
+    assert merge_partials([a, b], out) == 3
+    merged = [json.loads(line) for line in out.read_text().splitlines()]
+    assert merged == [{"id": "1", "name": "new"}, {"id": "2"}, {"id": "3", "name": "a"}]
+
+def test_merge_rejects_unsorted_partial(tmp_path):
+    bad = tmp_path / "bad.ndjson"
+    _write_partial(bad, [(1, {"id": "2"}), (1, {"id": "1"})])
+    with pytest.raises(ShardError):
+        merge_partials([bad], tmp_path / "out.ndjson")
+    assert not (tmp_path / "out.ndjson").exists()
@@ -0,0 +1,265 @@
+import gzip
+import json
+import sys
+import threading
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from processors.collector import GuildCollector  # noqa: E402
+from storage import ndjson_sink  # noqa: E402
+from storage.delta import DeltaSink  # noqa: E402
+from storage.guild_store import CompactGuildStore  # noqa: E402
+from storage.ndjson_sink import NDJSONSink  # noqa: E402
+from storage.sqlite_store import SQLiteGuildStore  # noqa: E402
+
+def test_ndjson_sink_streams_and_finalizes(tmp_path):
+    path = tmp_path / "out.ndjson"
+    sink = NDJSONSink(path, fsync_interval=0)
+    for i in range(3):
+        sink.write({"id": str(i), "name": f"guild {i}"})
+    sink.close()
+
+    assert not sink.part_path.exists()
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["id"] for line in lines] == ["0", "1", "2"]
+
+def test_ndjson_sink_syncs_on_interval_while_queue_is_busy(tmp_path, monkeypatch):
+    release = threading.Event()
+    dumps = ndjson_sink.CODEC.dumps
+    syncs = []
+
+    class SlowCodec:
+        @staticmethod
+        def dumps(record):
+            release.wait()
+            return dumps(record)
+
+    monkeypatch.setattr(ndjson_sink, "CODEC", SlowCodec)
+    monkeypatch.setattr(ndjson_sink.os, "fsync", syncs.append)
+    sink = NDJSONSink(tmp_path / "out.ndjson", fsync_interval=0)
+    for i in range(5):
+        sink.write({"id": str(i)})
+    release.set()
+    sink.flush()
+    sink.close()
+
+    # One sync per record although the queue never ran empty, plus flush and close.
+    assert len(syncs) == 7
+
+def test_ndjson_sink_gzip_keeps_partial_file_when_not_finalized(tmp_path):
+    path = tmp_path / "out.ndjson.gz"
+    sink = NDJSONSink(path, compression="gzip")
+    sink.write({"id": "1"})
+    sink.close(finalize=False)
+
+    assert not path.exists()
+    with gzip.open(sink.part_path, "rt", encoding="utf-8") as f:
+        assert json.loads(f.readline()) == {"id": "1"}
+
+def test_collector_writes_only_first_sighting_to_sink(tmp_path):
+    sink = NDJSONSink(tmp_path / "out.ndjson")
+    collector = GuildCollector(sinks=[sink], keep_records=False)
+    collector.add([{"id": "1"}, {"id": "2"}])
+    collector.add([{"id": "2"}, {"id": "3"}])
+    sink.close()
+
+    assert len(collector) == 3
+    assert collector.values() == []
+    assert sink.count == 3
+
+def test_collector_keeps_first_sighting_like_its_sinks(tmp_path):
+    sink = NDJSONSink(tmp_path / "out.ndjson")
+    collector = GuildCollector(sinks=[sink])
+    collector.add([{"id": "1", "name": "first"}])
+    collector.add([{"id": "1", "name": "second"}])
+    sink.close()
+
+    assert collector.values() == [{"id": "1", "name": "first"}]
+    assert json.loads((tmp_path / "out.ndjson").read_text()) == {"id": "1", "name": "first"}
+
+def _guild(gid, members, category_id, locale="en-US", keywords=("ai",)):
+    category = {"id": category_id, "is_primary": True, "name": f"c{category_id}", "name_localizations": {}}
+    return {
+        "id": gid,
+        "name": f"guild {gid}",
+        "approximate_member_count": members,
+        "preferred_locale": locale,
+        "primary_category_id": category_id,
+        "categories": [category],
+        "primary_category": category,
+        "keywords": list(keywords),
+        "features": ["COMMUNITY"],
+        "is_published": True,
+    }
+
+def test_sqlite_store_upserts_and_queries(tmp_path):
+    store = SQLiteGuildStore(tmp_path / "guilds.sqlite", batch_size=2)
+    store.upsert_guilds(
+        [
+            _guild("1", 100, 5),
+            _guild("2", 300, 5, locale="de"),
+            _guild("3", 200, 5),
+            _guild("4", 900, 7),
+        ]
+    )
+    top = store.top_guilds(category_id=5, locale="en-US", limit=5)
+    assert [g["id"] for g in top] == ["3", "1"]
+
+    # A later observation updates the row and replaces side-table rows.
+    store.upsert_guilds([_guild("1", 1000, 5, keywords=("art",))])
+    assert store.top_guilds(category_id=5, limit=1)[0]["id"] == "1"
+    keywords = store._conn.execute(
+        "SELECT keyword FROM guild_keywords WHERE guild_id = '1'"
+    ).fetchall()
+    assert keywords == [("art",)]
+    store.close()
+
+def test_sqlite_store_coerces_or_skips_bad_category_ids(tmp_path):
+    store = SQLiteGuildStore(tmp_path / "guilds.sqlite")
+    categories = [{"id": "12", "name": "Gaming"}, {"id": "not-a-number"}, {"id": 2**64}]
+    store.upsert_guilds([{"id": "1", "primary_category_id": 2**64, "categories": categories}])
+    store.upsert_guilds([_guild("2", 100, 5)])
+    assert store._conn.execute(
+        "SELECT category_id FROM guild_categories WHERE guild_id = '1'"
+    ).fetchall() == [(12,)]
+    assert store._conn.execute("SELECT COUNT(*) FROM guilds").fetchone() == (2,)
+    store.close()
+
+def _decoded_guild(i, category_id, is_primary=True):
+    category = {"id": category_id, "is_primary": is_primary, "name": f"Category {category_id}", "name_localizations": {}}
+    return json.loads(json.dumps({
+        "id": str(i),
+        "name": f"guild {i}",
+        "approximate_member_count": 10 * i,
+        "preferred_locale": "en-US",
+        "auto_removed": False,
+        "primary_category_id": category_id,
+        "keywords": ["ai", "art"],
+        "features": ["COMMUNITY"],
+        "categories": [category],
+        "primary_category": category,
+        "objectID": str(i),
+    }))
+
+def test_compact_store_round_trips_and_shares_objects():
+    store = CompactGuildStore()
+    guilds = [_decoded_guild(1, 5), _decoded_guild(2, 5), _decoded_guild(3, 5, is_primary=False)]
+    for g in guilds:
+        store[g["id"]] = g
+
+    assert len(store) == 3 and "2" in store and "9" not in store
+    assert [store[g["id"]] for g in guilds] == guilds
+    assert list(store.values()) == guilds
+    assert list(store.keys()) == ["1", "2", "3"]
+    assert list(store[g["id"]]) == list(g) == list(store[g["id"]].keys())
+
+    assert store._categories[0] is store._categories[1]
+    assert store._categories[0] is not store._categories[2]
+    assert store._tuples["keywords"][0] is store._tuples["keywords"][2]
+    assert store._strs["objectID"][1] is store._ids[1]
+
+    updated = dict(guilds[0], approximate_member_count=None, name="renamed")
+    del updated["approximate_member_count"]
+    store["1"] = updated
+    assert store["1"] == updated and len(store) == 3
+
+def test_compact_store_keeps_integers_outside_the_int64_column():
+    store = CompactGuildStore()
+    store["1"] = {"id": "1", "approximate_member_count": 2**63}
+    store["2"] = {"id": "2", "approximate_member_count": -(2**63)}
+    store["3"] = {"id": "3", "approximate_member_count": 2**63 - 1}
+    assert store["1"]["approximate_member_count"] == 2**63
+    assert store["2"]["approximate_member_count"] == -(2**63)
+    assert store["3"]["approximate_member_count"] == 2**63 - 1
+
+    store["1"] = {"id": "1", "approximate_member_count": 5}
+    store["2"] = {"id": "2"}
+    assert store["1"]["approximate_member_count"] == 5
+    assert "approximate_member_count" not in store["2"]
+
+def test_collector_with_compact_store_keeps_records():
+    collector = GuildCollector(records=CompactGuildStore())
+    assert collector.add([_decoded_guild(1, 5), _decoded_guild(1, 5), _decoded_guild(2, 7)]) == 2
+    assert collector.ids() == ["1", "2"]
+    assert [g["primary_category_id"] for g in collector.values()] == [5, 7]
+
+def _read_changes(path):
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+def test_delta_sink_reports_added_updated_and_removed(tmp_path):
+    index, changes = tmp_path / "index.json", tmp_path / "changes.ndjson"
+    first = DeltaSink(index, changes)
+    for g in ({"id": "1", "name": "a"}, {"id": "2", "name": "b", "icon": "x"}, {"id": "3", "name": "c"}):
+        first.write(g)
+    first.close()
+    assert [c["op"] for c in _read_changes(changes)] == ["added"] * 3
+
+    second = DeltaSink(index, changes)
+    for g in ({"id": "1", "name": "a"}, {"id": "2", "name": "b2"}, {"id": "4", "name": "d"}):
+        second.write(g)
+    second.close()
+    assert _read_changes(changes) == [
+        {"op": "updated", "id": "2", "changes": {"name": "b2", "icon": None}},
+        {"op": "added", "id": "4", "guild": {"id": "4", "name": "d"}},
+        {"op": "removed", "id": "3"},
+    ]
+    assert second.counts == {"added": 1, "updated": 1, "removed": 1, "unchanged": 1}
+    assert sorted(json.loads(index.read_text())["guilds"]) == ["1", "2", "4"]
+
+def test_delta_sink_interrupted_run_keeps_previous_index(tmp_path):
+    index, changes = tmp_path / "index.json", tmp_path / "changes.ndjson"
+    first = DeltaSink(index, changes)
+    first.write({"id": "1", "name": "a"})
+    first.close()
+    before = index.read_bytes()
+
+    interrupted = DeltaSink(index, changes)
+    interrupted.write({"id": "1", "name": "changed"})
+    interrupted.close(finalize=False)
+    assert index.read_bytes() == before
+
+    resumed = DeltaSink(index, changes, append=True)
+    resumed.prime(["1"])
+    resumed.close()
+    assert [c["op"] for c in _read_changes(changes)] == ["updated"]
+
+def test_delta_sink_resume_keeps_guilds_added_before_the_crash(tmp_path):
+    index, changes = tmp_path / "index.json", tmp_path / "changes.ndjson"
+    first = DeltaSink(index, changes)
+    first.write({"id": "A", "name": "a"})
+    first.write({"id": "C", "name": "c"})
+    first.close()
+
+    interrupted = DeltaSink(index, changes)
+    interrupted.write({"id": "A", "name": "a2"})
+    interrupted.write({"id": "B", "name": "b"})
+    interrupted.close(finalize=False)
+
+    resumed = DeltaSink(index, changes, append=True, partial=True)
+    resumed.prime(["A", "B"])
+    resumed.close()
+    assert resumed.counts == {"added": 1, "updated": 1, "removed": 0, "unchanged": 0}
+
+    rerun = DeltaSink(index, changes)
+    for g in ({"id": "A", "name": "a2"}, {"id": "B", "name": "b"}, {"id": "C", "name": "c"}):
+        rerun.write(g)
+    rerun.close()
+    assert rerun.counts == {"added": 0, "updated": 0, "removed": 0, "unchanged": 3}
+
+def test_delta_sink_partial_run_keeps_unseen_guilds(tmp_path):
+    index, changes = tmp_path / "index.json", tmp_path / "changes.ndjson"
+    first = DeltaSink(index, changes)
+    first.write({"id": "1"})
+    first.write({"id": "2"})
+    first.close()
+
+    partial = DeltaSink(index, changes, partial=True)
+    partial.write({"id": "1", "name": "new"})
+    partial.close()
+    assert [c["op"] for c in _read_changes(changes)] == ["updated"]
+    assert sorted(json.loads(index.read_text())["guilds"]) == ["1", "2"]